@@ -0,0 +1,32 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# blender --background --factory-startup --python benchmarks/bvh_import.py -- take.bvh
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import Variant, report, run, script_args
+
+for path in script_args():
+    variants = [
+        Variant("import_anim.bvh", "import_anim.bvh", {"filepath": path}),
+        Variant("fast", "object.import_bvh_fast_with_defaults", {"filename": path}),
+        Variant(
+            "fast (quaternion)",
+            "object.import_bvh_fast_with_custom_settings",
+            {"filename": path, "rotate_mode": "QUATERNION"},
+        ),
+        Variant(
+            "fast (30 fps)",
+            "object.import_bvh_fast_with_custom_settings",
+            {"filename": path, "decimation": "FPS", "target_fps": 30.0},
+        ),
+    ]
+
+    print(f"\n{path} ({os.path.getsize(path) / (1024 * 1024):.0f} MB)")
+    report(run(variants))
@@ -0,0 +1,244 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# Shared runner for the import benchmarks. Benchmarks are run by Blender itself, e.g.
+#
+#   blender --background --factory-startup --python benchmarks/stl_import.py -- model.stl
+#
+# every variant is imported in a fresh Blender process, so the peak RSS of one importer
+# does not leak into the measurement of the next one.
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+import typing
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PREFIX = "BENCHMARK "
+
+# extension -> format name used by the import operators
+FORMATS = {
+    ".abc": "abc",
+    ".bvh": "bvh",
+    ".dae": "dae",
+    ".fbx": "fbx",
+    ".glb": "glb",
+    ".gltf": "glb",
+    ".obj": "obj",
+    ".ply": "ply",
+    ".pmd": "pmx",
+    ".pmx": "pmx",
+    ".stl": "stl",
+    ".usd": "usd",
+    ".usda": "usd",
+    ".usdc": "usd",
+    ".usdz": "usd",
+    ".vrm": "vrm",
+}
+
+
+class Variant(typing.NamedTuple):
+    name: str
+    operator: str  # e.g. "wm.stl_import" or "object.import_stl_fast_with_defaults"
+    kwargs: dict[str, typing.Any]
+    scene_objects: int = 0  # objects in the scene the file is dropped into
+    staging: bool = True
+    windowed: bool = False  # timed until the viewport has drawn the import
+
+
+def script_args() -> list[str]:
+    return sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+
+
+def peak_rss_mb() -> float:
+    if sys.platform == "win32":
+        import ctypes
+        import ctypes.wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", ctypes.wintypes.DWORD),
+                ("PageFaultCount", ctypes.wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            process, ctypes.byref(counters), counters.cb
+        )
+        return counters.PeakWorkingSetSize / (1024 * 1024)
+
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes everywhere else
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def populate(count: int):
+    import bpy
+
+    # linked copies of a subdivided cube, every one of them is evaluated on its own
+    bpy.ops.mesh.primitive_cube_add()
+    source = bpy.context.object
+    source.modifiers.new("Subdivision", "SUBSURF").levels = 2
+
+    for i in range(count - 1):
+        obj = source.copy()
+        obj.location = (i % 100 * 3, i // 100 * 3, 0)
+        bpy.context.collection.objects.link(obj)
+
+    bpy.context.view_layer.update()
+
+
+def prepare(variant: Variant) -> typing.Callable[..., typing.Any]:
+    import bpy
+
+    sys.path.insert(0, os.path.join(ROOT, "src"))
+
+    import addon  # pyright: ignore[reportMissingImports]
+
+    from addon.utils import staging  # pyright: ignore[reportMissingImports]
+
+    addon.register()
+    staging.enabled = variant.staging
+
+    if variant.scene_objects > 0:
+        populate(variant.scene_objects)
+
+    module, name = variant.operator.split(".")
+    return getattr(getattr(bpy.ops, module), name)
+
+
+def result(
+    variant: Variant, elapsed: float, objects: set[typing.Any], rss: float
+) -> dict[str, typing.Any]:
+    import bpy
+
+    created = [o for o in bpy.data.objects if o not in objects]
+
+    return {
+        "name": variant.name,
+        "seconds": elapsed,
+        "peak_rss_mb": peak_rss_mb(),
+        "startup_rss_mb": rss,
+        "objects": len(created),
+        "vertices": sum(
+            len(o.data.vertices)
+            for o in created
+            if o.type == "MESH" and o.data is not None
+        ),
+    }
+
+
+def measure(variant: Variant) -> dict[str, typing.Any]:
+    import bpy
+
+    operator = prepare(variant)
+
+    objects = set(bpy.data.objects)
+    rss = peak_rss_mb()
+    started = time.perf_counter()
+    operator(**variant.kwargs)
+    # the import is visible once the scene is evaluated again
+    bpy.context.view_layer.update()
+    elapsed = time.perf_counter() - started
+
+    return result(variant, elapsed, objects, rss)
+
+
+def measure_windowed(variant: Variant):
+    # without --background the import runs from the window like a drop, and the clock
+    # stops in the first viewport redraw after it, which includes evaluating the scene
+    import bpy
+
+    operator = prepare(variant)
+    window = bpy.context.window_manager.windows[0]
+    area = next(a for a in window.screen.areas if a.type == "VIEW_3D")
+    region = next(r for r in area.regions if r.type == "WINDOW")
+
+    objects = set(bpy.data.objects)
+    rss = peak_rss_mb()
+    started = time.perf_counter()
+
+    with bpy.context.temp_override(window=window, area=area, region=region):
+        operator(**variant.kwargs)
+
+    def quit():
+        with bpy.context.temp_override(window=window):
+            bpy.ops.wm.quit_blender()
+
+    def drawn():
+        elapsed = time.perf_counter() - started
+        bpy.types.SpaceView3D.draw_handler_remove(handle, "WINDOW")
+        print(PREFIX + json.dumps(result(variant, elapsed, objects, rss)), flush=True)
+        bpy.app.timers.register(quit)
+
+    handle = bpy.types.SpaceView3D.draw_handler_add(drawn, (), "WINDOW", "POST_VIEW")
+    region.tag_redraw()
+
+
+def run(variants: list[Variant]) -> list[dict[str, typing.Any]]:
+    import bpy
+
+    results: list[dict[str, typing.Any]] = []
+
+    for variant in variants:
+        command = [
+            bpy.app.binary_path,
+            *([] if variant.windowed else ["--background"]),
+            "--factory-startup",
+            "--python",
+            os.path.abspath(__file__),
+            "--",
+            json.dumps(variant._asdict()),
+        ]
+        process = subprocess.run(command, capture_output=True, text=True)
+        lines = [l for l in process.stdout.splitlines() if l.startswith(PREFIX)]
+
+        if not lines:
+            print(f"{variant.name}: failed\n{process.stderr}")
+            continue
+
+        results.append(json.loads(lines[-1][len(PREFIX) :]))
+
+    return results
+
+
+def report(results: list[dict[str, typing.Any]]):
+    print(
+        f"{'variant':<32} {'seconds':>10} {'peak RSS (MB)':>14} {'import RSS (MB)':>16} {'objects':>8} {'vertices':>12}"
+    )
+
+    for r in results:
+        print(
+            f"{r['name']:<32} {r['seconds']:>10.2f} {r['peak_rss_mb']:>14.0f} {r['peak_rss_mb'] - r['startup_rss_mb']:>16.0f} {r['objects']:>8} {r['vertices']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    # child process: import a single variant and print the measurement
+    variant = Variant(**json.loads(script_args()[0]))
+
+    if variant.windowed:
+        # the window is only drawn once this script has returned
+        import bpy
+
+        bpy.app.timers.register(lambda: measure_windowed(variant), first_interval=1.0)
+    else:
+        print(PREFIX + json.dumps(measure(variant)), flush=True)
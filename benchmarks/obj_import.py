@@ -0,0 +1,34 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# blender --background --factory-startup --python benchmarks/obj_import.py -- model.obj
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bpy
+
+from common import Variant, report, run, script_args
+
+for path in script_args():
+    variants = [
+        Variant("wm.obj_import", "wm.obj_import", {"filepath": path}),
+        Variant("fast", "object.import_obj_fast_with_defaults", {"filename": path}),
+        Variant(
+            "fast (no normals)",
+            "object.import_obj_fast_with_custom_settings",
+            {"filename": path, "import_normals": False},
+        ),
+    ]
+
+    if hasattr(bpy.ops.import_scene, "obj"):
+        variants.append(
+            Variant("import_scene.obj", "import_scene.obj", {"filepath": path})
+        )
+
+    print(f"\n{path} ({os.path.getsize(path) / (1024 * 1024):.0f} MB)")
+    report(run(variants))
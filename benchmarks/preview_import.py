@@ -0,0 +1,32 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# blender --background --factory-startup --python benchmarks/preview_import.py -- model.fbx scene.usdc
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import FORMATS, Variant, report, run, script_args
+
+for path in script_args():
+    format = FORMATS.get(os.path.splitext(path)[1].lower())
+
+    if format is None:
+        print(f"\n{path}: no preview for this format")
+        continue
+
+    variants = [
+        Variant(
+            "defaults", f"object.import_{format}_with_defaults", {"filename": path}
+        ),
+        Variant(
+            "preview", "object.import_preview", {"filename": path, "format": format}
+        ),
+    ]
+
+    print(f"\n{path} ({os.path.getsize(path) / (1024 * 1024):.0f} MB)")
+    report(run(variants))
@@ -0,0 +1,43 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# blender --background --factory-startup --python benchmarks/staging_import.py -- model.fbx
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import FORMATS, Variant, report, run, script_args
+
+# objects in the heavy scene, a production set dressing scene is in this range
+HEAVY_SCENE = 5000
+
+for path in script_args():
+    format = FORMATS.get(os.path.splitext(path)[1].lower())
+
+    if format is None:
+        print(f"\n{path}: unsupported format")
+        continue
+
+    operator = f"object.import_{format}_with_defaults"
+    kwargs = {"filename": path}
+    # background runs have no window, so only the windowed ones switch the window to
+    # the staging scene and include the viewport redraw
+    variants = [
+        Variant("empty scene", operator, kwargs, 0, False),
+        Variant("empty scene, staged", operator, kwargs, 0, True),
+        Variant("heavy scene", operator, kwargs, HEAVY_SCENE, False),
+        Variant("heavy scene, staged", operator, kwargs, HEAVY_SCENE, True),
+        Variant("empty scene, windowed", operator, kwargs, 0, False, True),
+        Variant("empty scene, staged, windowed", operator, kwargs, 0, True, True),
+        Variant("heavy scene, windowed", operator, kwargs, HEAVY_SCENE, False, True),
+        Variant(
+            "heavy scene, staged, windowed", operator, kwargs, HEAVY_SCENE, True, True
+        ),
+    ]
+
+    print(f"\n{path} ({os.path.getsize(path) / (1024 * 1024):.0f} MB)")
+    report(run(variants))
@@ -0,0 +1,34 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# blender --background --factory-startup --python benchmarks/stl_import.py -- model.stl
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bpy
+
+from common import Variant, report, run, script_args
+
+for path in script_args():
+    variants = [
+        Variant("wm.stl_import", "wm.stl_import", {"filepath": path}),
+        Variant("fast", "object.import_stl_fast_with_defaults", {"filename": path}),
+        Variant(
+            "fast (facet normals)",
+            "object.import_stl_fast_with_custom_settings",
+            {"filename": path, "use_facet_normal": True},
+        ),
+    ]
+
+    if hasattr(bpy.ops.import_mesh, "stl"):
+        variants.append(
+            Variant("import_mesh.stl", "import_mesh.stl", {"filepath": path})
+        )
+
+    print(f"\n{path} ({os.path.getsize(path) / (1024 * 1024):.0f} MB)")
+    report(run(variants))
@@ -31,10 +31,24 @@ def register():
     for c in classes:
         bpy.utils.register_class(c)
 
+    # register handlers
+    for name, handler in formats.HANDLERS:
+        handlers = getattr(bpy.app.handlers, name)
+
+        if handler not in handlers:
+            handlers.append(handler)
+
 
 def unregister():
     global classes
 
+    # unregister handlers
+    for name, handler in formats.HANDLERS:
+        handlers = getattr(bpy.app.handlers, name)
+
+        if handler in handlers:
+            handlers.remove(handler)
+
     # unregister classes
     for c in classes:
         try:
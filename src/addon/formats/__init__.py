@@ -7,16 +7,23 @@
 
 from . import _3mf
 from . import abc
+from . import auto
 from . import bvh
 from . import dae
 from . import fbx
 from . import glb
+from . import merge
+from . import movie
 from . import obj
+from . import obj_fast
 from . import obj_legacy
 from . import pmx
 from . import png
 from . import ply
+from . import preview
+from . import sequence
 from . import stl
+from . import stl_fast
 from . import stl_legacy
 from . import svg
 from . import usd
@@ -29,6 +36,13 @@ CLASSES: list[type] = []
 CLASSES.extend(obj_legacy.OPERATORS)
 CLASSES.extend(stl_legacy.OPERATORS)
 
+# importer selection
+CLASSES.extend(auto.OPERATORS)
+
+# numpy based importers
+CLASSES.extend(obj_fast.OPERATORS)
+CLASSES.extend(stl_fast.OPERATORS)
+
 # modern importers
 CLASSES.extend(_3mf.OPERATORS)
 CLASSES.extend(abc.OPERATORS)
@@ -36,12 +50,22 @@ CLASSES.extend(bvh.OPERATORS)
 CLASSES.extend(dae.OPERATORS)
 CLASSES.extend(fbx.OPERATORS)
 CLASSES.extend(glb.OPERATORS)
+CLASSES.extend(merge.OPERATORS)
+CLASSES.extend(movie.OPERATORS)
 CLASSES.extend(obj.OPERATORS)
 CLASSES.extend(pmx.OPERATORS)
 CLASSES.extend(png.OPERATORS)
 CLASSES.extend(ply.OPERATORS)
+CLASSES.extend(preview.OPERATORS)
+CLASSES.extend(sequence.OPERATORS)
 CLASSES.extend(stl.OPERATORS)
 CLASSES.extend(svg.OPERATORS)
 CLASSES.extend(usd.OPERATORS)
 CLASSES.extend(vrm.OPERATORS)
 CLASSES.extend(x3d.OPERATORS)
+
+# app handlers, as pairs of (bpy.app.handlers attribute, callback)
+HANDLERS: list[tuple[str, object]] = []
+HANDLERS.extend(movie.HANDLERS)
+HANDLERS.extend(sequence.HANDLERS)
+HANDLERS.extend(usd.HANDLERS)
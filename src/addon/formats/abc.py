@@ -8,6 +8,7 @@
 # pyright: reportUnknownMemberType=false
 # pyright: reportInvalidTypeForm=false
 
+import os
 from typing import Set
 import bpy
 
@@ -17,19 +18,125 @@ from bpy.props import (
 )
 from bpy.types import Context
 
+from ..readers.abc import ABCObject, ABCSummary, UnsupportedABC, read_summary
 from .super import (
     ImportWithDefaultsBase,
     ImportsWithCustomSettingsBase,
     VIEW3D_MT_Space_Import_BASE,
 )
 
+# objects listed in the hierarchy before it is cut short
+MAX_LISTED = 30
+
+# path -> ((mtime, size), summary), menus and dialogs redraw often
+summaries: dict[str, tuple[tuple[float, int], ABCSummary | None]] = {}
+
+
+def inspect_abc(path: str) -> ABCSummary | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    key = (stat.st_mtime, stat.st_size)
+    cached = summaries.get(path)
+
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    try:
+        summary = read_summary(path)
+    except (OSError, UnsupportedABC) as e:
+        print(f"{path}: {e}, no summary available")
+        summary = None
+
+    summaries[path] = (key, summary)
+    return summary
+
+
+def draw_summary(layout: bpy.types.UILayout, summary: ABCSummary, fps: float):
+    meshes = [o for o in summary.objects if o.schema in ("PolyMesh", "SubD")]
+    animated = [o for o in summary.objects if o.samples > 1]
+
+    layout.label(
+        text=f"{len(summary.objects)} objects, {len(meshes)} meshes, {len(animated)} animated"
+    )
+
+    if summary.samples > 1:
+        layout.label(
+            text=f"Frames {summary.start * fps:.0f} - {summary.end * fps:.0f}, {summary.samples} samples"
+        )
+
+    deforming = [m for m in meshes if m.samples > 1]
+    changing = [m for m in deforming if m.topology_changes > 1]
+
+    if deforming:
+        layout.label(
+            text=f"{len(deforming)} deforming meshes, {len(changing)} with changing topology"
+        )
+
+    if summary.application:
+        layout.label(text=f"Written by {summary.application}", icon="INFO")
+
+
+def draw_hierarchy(layout: bpy.types.UILayout, objects: list[ABCObject]):
+    column = layout.column(align=True)
+
+    for obj in objects[:MAX_LISTED]:
+        row = column.row(align=True)
+
+        if obj.depth > 0:
+            row.separator(factor=obj.depth * 1.5)
+
+        text = f"{obj.name} ({obj.schema})" if obj.schema else obj.name
+        row.label(text=text, icon="OBJECT_DATA")
+
+        if obj.samples > 1:
+            row.label(text=f"{obj.samples} samples")
+
+    if len(objects) > MAX_LISTED:
+        column.label(text=f"... and {len(objects) - MAX_LISTED} more")
+
+
+def stream_meshes(objects: list[bpy.types.Object], summary: ABCSummary):
+    # meshes keeping their faces read them once, every frame only updates the rest
+    archive = {o.path: o for o in summary.objects}
+
+    for obj in objects:
+        for modifier in obj.modifiers:
+            if modifier.type != "MESH_SEQUENCE_CACHE":
+                continue
+
+            source = archive.get(modifier.object_path)
+
+            if source is None or source.topology_changes > 1:
+                continue
+
+            animated = {
+                path
+                for path, samples in source.properties.items()
+                if samples.distinct > 1
+            }
+            uvs = any("/uv" in path for path in animated)
+            attributes = any("/.arbGeomParams/" in path for path in animated)
+
+            modifier.read_data = {
+                data
+                for data in modifier.read_data
+                if data == "VERT"
+                or (data == "UV" and uvs)
+                or (data in ("COLOR", "ATTRIBUTES") and attributes)
+            }
+
 
 class ImportABCWithDefaults(ImportWithDefaultsBase):
     bl_idname = "object.import_abc_with_defaults"
     bl_label = "Import ABC File"
 
     def execute(self, context: Context) -> Set[str] | Set[int]:
-        bpy.ops.wm.alembic_import(filepath=self.filepath())
+        with self.staged_import(context):
+            bpy.ops.wm.alembic_import(filepath=self.filepath())
+
         return {"FINISHED"}
 
 
@@ -44,11 +151,28 @@ class ImportABCWithCustomSettings(ImportsWithCustomSettingsBase):
     validate_meshes: BoolProperty(default=False, name="Validate Meshes")
     always_add_cache_reader: BoolProperty(default=False, name="Always Add Cache Reader")
     is_sequence: BoolProperty(default=False, name="Is Sequence")
+    streamed_cache: BoolProperty(default=False, name="Import as Streamed Cache")
 
+    file_section: BoolProperty(default=True, name="File")
+    hierarchy_section: BoolProperty(default=False, name="Hierarchy")
     manual_transform_section: BoolProperty(default=True, name="Manual Transform")
     options_section: BoolProperty(default=True, name="Option")
 
     def draw(self, context: Context):
+        # File Section
+        summary = inspect_abc(self.filepath())
+
+        if summary is not None:
+            column, state = self.get_expand_column("file_section")
+
+            if state:
+                draw_summary(column, summary, context.scene.render.fps)
+
+            column, state = self.get_expand_column("hierarchy_section")
+
+            if state:
+                draw_hierarchy(column, summary.objects)
+
         # Manual Transform Section
         column, state = self.get_expand_column("manual_transform_section")
 
@@ -62,19 +186,38 @@ class ImportABCWithCustomSettings(ImportsWithCustomSettingsBase):
             column.prop(self, "relative_path")
             column.prop(self, "set_frame_range")
             column.prop(self, "is_sequence")
-            column.prop(self, "validate_meshes")
-            column.prop(self, "always_add_cache_reader")
+            column.prop(self, "streamed_cache")
+
+            # the streamed cache reads through cache readers and skips validation
+            preset = column.column()
+            preset.enabled = not self.streamed_cache
+            preset.prop(self, "validate_meshes")
+            preset.prop(self, "always_add_cache_reader")
+
+        self.draw_lean_section()
 
     def execute(self, context: Context) -> Set[str] | Set[int]:
-        bpy.ops.wm.alembic_import(
-            filepath=self.filepath(),
-            relative_path=self.relative_path,
-            scale=self.scale,
-            set_frame_range=self.set_frame_range,
-            validate_meshes=self.validate_meshes,
-            always_add_cache_reader=self.always_add_cache_reader,
-            is_sequence=self.is_sequence,
-        )
+        if self.defer_lean_import(context):
+            return {"CANCELLED"}
+
+        with self.staged_import(context):
+            before = set(bpy.data.objects)
+
+            bpy.ops.wm.alembic_import(
+                filepath=self.filepath(),
+                relative_path=self.relative_path,
+                scale=self.scale,
+                set_frame_range=self.set_frame_range,
+                validate_meshes=self.validate_meshes and not self.streamed_cache,
+                always_add_cache_reader=self.always_add_cache_reader
+                or self.streamed_cache,
+                is_sequence=self.is_sequence,
+            )
+
+            summary = inspect_abc(self.filepath()) if self.streamed_cache else None
+
+            if summary is not None:
+                stream_meshes([o for o in bpy.data.objects if o not in before], summary)
 
         return {"FINISHED"}
 
@@ -82,6 +225,15 @@ class ImportABCWithCustomSettings(ImportsWithCustomSettingsBase):
 class VIEW3D_MT_Space_Import_ABC(VIEW3D_MT_Space_Import_BASE):
     bl_label = "Import ABC File"
 
+    def draw(self, context: Context | None):
+        super().draw(context)
+
+        summary = inspect_abc(VIEW3D_MT_Space_Import_BASE.filename)
+
+        if summary is not None and context is not None:
+            self.layout.separator()
+            draw_summary(self.layout.column(), summary, context.scene.render.fps)
+
     @staticmethod
     def format():
         return "abc"
@@ -0,0 +1,168 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# pyright: reportGeneralTypeIssues=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+# pyright: reportInvalidTypeForm=false
+
+import os
+import random
+import re
+import bpy
+
+from bpy.types import Context
+
+from ..readers import obj, stl
+from ..utils import history
+from .super import ImportWithDefaultsBase, selectable_importers
+
+# only the head of the file is probed, features are declared before the bulk data
+PROBE_SIZE = 16 * 1024 * 1024
+
+# recorded runs per variant before the history overrides the heuristics
+MIN_RUNS = 3
+
+# share of auto imports that try an importer with fewer than MIN_RUNS runs
+EXPLORE_RATE = 0.1
+
+NEGATIVE_INDEX = re.compile(rb"^f[ \t][^\n]*-\d", re.M)
+GROUP = re.compile(rb"^g[ \t]", re.M)
+SMOOTH_GROUP = re.compile(rb"^s[ \t]+(?!off|0\b)", re.M)
+
+
+def probe_obj(path: str) -> list[str]:
+    with open(path, "rb") as f:
+        head = f.read(PROBE_SIZE)
+
+    head = head[: head.rfind(b"\n") + 1] or head
+    features: list[str] = []
+
+    unsupported = obj.UNSUPPORTED.search(head)
+
+    if unsupported is not None:
+        features.append(f"{unsupported.group(1).decode()} records")
+    if len(obj.OBJECT.findall(head)) > 1:
+        features.append("multiple objects")
+    if len(set(obj.MATERIAL.findall(head))) > 1:
+        features.append("multiple materials")
+    if NEGATIVE_INDEX.search(head):
+        features.append("negative indices")
+    if GROUP.search(head):
+        features.append("groups")
+    if SMOOTH_GROUP.search(head) and not obj.NORMAL.search(head):
+        features.append("smoothing groups")
+
+    return features
+
+
+def heuristic_order(format: str, path: str, names: list[str]) -> tuple[list[str], str]:
+    # legacy importers are never chosen while a modern one is available
+    modern = [n for n in names if not n.endswith("_legacy")] or names
+    size = os.path.getsize(path) / (1024 * 1024)
+    excluded: set[str] = set()
+
+    if format == "stl":
+        if stl.is_binary(path):
+            preferred = f"{format}_fast"
+            reason = f"binary STL ({size:.0f} MB) can be memory-mapped"
+        else:
+            preferred = modern[0]
+            reason = f"ASCII STL ({size:.0f} MB)"
+    elif format == "bvh":
+        preferred = f"{format}_fast"
+        reason = f"BVH ({size:.0f} MB), keyframes are written in bulk"
+    else:
+        features = probe_obj(path)
+
+        if features:
+            # the fast path would drop these features without failing, so it is neither
+            # a fallback nor explored for such files
+            preferred = modern[0]
+            reason = f"OBJ uses {', '.join(features)}"
+            excluded.add(f"{format}_fast")
+        else:
+            preferred = f"{format}_fast"
+            reason = f"plain geometry OBJ ({size:.0f} MB)"
+
+    ordered = [preferred] if preferred in modern else []
+    ordered.extend(n for n in modern if n not in ordered and n not in excluded)
+    ordered.extend(n for n in names if n not in ordered and n not in excluded)
+
+    return ordered, reason
+
+
+def choose_importers(format: str, path: str) -> tuple[list[str], str]:
+    # the parallel importer runs modal and finishes after the operator returns
+    names = [
+        name
+        for _, name in selectable_importers[format]()
+        if not name.endswith("_parallel")
+    ]
+    ordered, reason = heuristic_order(format, path, names)
+
+    recorded = history.load().get(format, {})
+    candidates = [n for n in ordered if not n.endswith("_legacy")] or ordered
+    measured = [n for n in candidates if recorded.get(n, {}).get("runs", 0) >= MIN_RUNS]
+    unmeasured = [n for n in candidates if n not in measured and n != ordered[0]]
+
+    # now and then an importer without enough runs goes first, so the history
+    # fills up for every variant and not only for the one the heuristics prefer
+    if unmeasured and random.random() < EXPLORE_RATE:
+        ordered.remove(unmeasured[0])
+        ordered.insert(0, unmeasured[0])
+        reason += f", trying {unmeasured[0]} to measure it"
+    elif len(measured) == len(candidates) and len(measured) > 1:
+
+        def score(name: str) -> float:
+            entry = recorded[name]
+            reliability = entry["runs"] / (entry["runs"] + entry["failures"])
+            return entry["mb_per_second"] * reliability
+
+        best = max(measured, key=score)
+
+        if best != ordered[0]:
+            ordered.remove(best)
+            ordered.insert(0, best)
+            reason += f", but {best} was fastest so far ({recorded[best]['mb_per_second']:.1f} MB/s)"
+
+    return ordered, reason
+
+
+class ImportAutoWithDefaults(ImportWithDefaultsBase):
+    bl_idname = "object.import_auto_with_defaults"
+    bl_label = "Import with Automatically Selected Importer"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context: Context):
+        path = self.filepath()
+        format = os.path.splitext(path)[1][1:].lower()
+
+        if format not in selectable_importers:
+            return {"CANCELLED"}
+
+        ordered, reason = choose_importers(format, path)
+
+        # every variant records its own runs and failures into the history
+        for name in ordered:
+            print(f"{path}: using {name}, {reason}")
+
+            try:
+                getattr(bpy.ops.object, f"import_{name}_with_defaults")(filename=path)
+            except (RuntimeError, ValueError) as e:
+                reason = f"{name} failed ({e})"
+                continue
+
+            self.report({"INFO"}, f"Imported with {name}: {reason}")
+
+            return {"FINISHED"}
+
+        self.report({"ERROR"}, f"Every importer failed for {path}")
+        return {"CANCELLED"}
+
+
+OPERATORS: list[type] = [
+    ImportAutoWithDefaults,
+]
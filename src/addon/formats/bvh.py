@@ -8,8 +8,13 @@
 # pyright: reportUnknownMemberType=false
 # pyright: reportInvalidTypeForm=false
 
+import math
+import os
+import time
+import typing
 from typing import Set
 import bpy
+import numpy as np
 
 from bpy.props import (
     BoolProperty,  # pyright: ignore[reportUnknownVariableType]
@@ -18,26 +23,291 @@ from bpy.props import (
     IntProperty,  # pyright: ignore[reportUnknownVariableType]
 )
 from bpy.types import Context
+from bpy_extras.io_utils import axis_conversion
 
+from ..readers.bvh import (
+    BVHData,
+    UnsupportedBVH,
+    matrices_to_eulers,
+    matrices_to_quaternions,
+    read_bvh,
+    rotation_matrices,
+)
+from ..utils.mesh import link_object
 from .super import (
     ImportWithDefaultsBase,
     ImportsWithCustomSettingsBase,
     VIEW3D_MT_Space_Import_BASE,
 )
 
+# raw value of the LINEAR interpolation enum, keyframe_points.foreach_set takes integers
+LINEAR_INTERPOLATION = 1
+
+
+def rest_pose(data: BVHData, global_scale: float) -> tuple[np.ndarray, np.ndarray]:
+    # heads and tails of the bones in file axes, placed the way the built-in importer does
+    joints = data.joints
+    heads = np.zeros((len(joints), 3))
+
+    for index, joint in enumerate(joints):
+        parent = heads[joint.parent] if joint.parent >= 0 else 0.0
+        heads[index] = parent + joint.offset * global_scale
+
+    tails = heads.copy()
+
+    for index, joint in enumerate(joints):
+        children = [i for i, j in enumerate(joints) if j.parent == index]
+
+        if joint.end is not None:
+            tails[index] = heads[index] + joint.end * global_scale
+        elif children:
+            tails[index] = heads[children].mean(axis=0)
+
+        if np.linalg.norm(tails[index] - heads[index]) <= 0.001 * global_scale:
+            tails[index][1] += global_scale / 10
+
+    return heads, tails
+
+
+def create_armature(
+    context: Context, name: str, data: BVHData, heads: np.ndarray, tails: np.ndarray
+) -> tuple[bpy.types.Object, list[str]]:
+    armature = bpy.data.armatures.new(name)
+    obj = link_object(context, name, armature)
+
+    # mode_set takes the active object from the window unless it is overridden, and
+    # the window may show another scene than the one imported into
+    override = {"active_object": obj, "object": obj, "edit_object": obj}
+
+    with context.temp_override(**override):
+        bpy.ops.object.mode_set(mode="EDIT")
+
+    bones: list[bpy.types.EditBone] = []
+
+    for joint, head, tail in zip(data.joints, heads, tails):
+        bone = armature.edit_bones.new(joint.name)
+        bone.head = head
+        bone.tail = tail
+        bones.append(bone)
+
+    for joint, bone in zip(data.joints, bones):
+        if joint.parent < 0:
+            continue
+
+        bone.parent = bones[joint.parent]
+        bone.use_connect = joint.location_columns() is None and np.allclose(
+            bones[joint.parent].tail, bone.head
+        )
+
+    # edit bones are gone after leaving edit mode, the names may have been shortened
+    names = [b.name for b in bones]
+
+    with context.temp_override(**override):
+        bpy.ops.object.mode_set(mode="OBJECT")
+
+    return obj, names
+
+
+def new_fcurve(
+    action: bpy.types.Action,
+    obj: bpy.types.Object,
+    data_path: str,
+    index: int,
+    group: str,
+) -> bpy.types.FCurve:
+    # layered actions (4.4+) keep their curves in slots
+    if hasattr(action, "fcurve_ensure_for_datablock"):
+        return action.fcurve_ensure_for_datablock(
+            obj, data_path, index=index, group_name=group
+        )
+
+    return action.fcurves.new(data_path, index=index, action_group=group)
+
+
+def write_keyframes(fcurve: bpy.types.FCurve, times: np.ndarray, values: np.ndarray):
+    points = fcurve.keyframe_points
+    points.add(len(times))
+
+    co = np.empty((len(times), 2), dtype=np.float32)
+    co[:, 0] = times
+    co[:, 1] = values
+
+    points.foreach_set("co", co.ravel())
+    points.foreach_set(
+        "interpolation", np.full(len(times), LINEAR_INTERPOLATION, dtype=np.int32)
+    )
+    fcurve.update()
+
+
+def update_scene_timing(
+    scene: bpy.types.Scene,
+    data: BVHData,
+    frame_start: int,
+    use_fps_scale: bool,
+    update_scene_fps: bool,
+    update_scene_duration: bool,
+):
+    # the same rules as the built-in importer
+    if update_scene_fps and data.frame_time > 0:
+        fps = 1.0 / data.frame_time
+        scene.render.fps = int(round(fps))
+        scene.render.fps_base = scene.render.fps / fps
+
+    if update_scene_duration:
+        frames = len(data.motion)
+
+        if use_fps_scale:
+            scene_fps = scene.render.fps / scene.render.fps_base
+            frames = int(math.ceil(frames * data.frame_time * scene_fps))
+
+        scene.frame_end = max(scene.frame_end, frame_start + frames)
+
+
+def import_bvh_fast(
+    context: Context,
+    path: str,
+    global_scale: float = 1.0,
+    frame_start: int = 1,
+    use_fps_scale: bool = False,
+    update_scene_fps: bool = False,
+    update_scene_duration: bool = False,
+    use_cyclic: bool = False,
+    rotate_mode: str = "NATIVE",
+    axis_forward: str = "-Z",
+    axis_up: str = "Y",
+    frame_stride: int = 1,
+    target_fps: float = 0.0,
+) -> bpy.types.Object | None:
+    started = time.perf_counter()
+    options = {
+        "global_scale": global_scale,
+        "frame_start": frame_start,
+        "use_fps_scale": use_fps_scale,
+        "update_scene_fps": update_scene_fps,
+        "update_scene_duration": update_scene_duration,
+        "use_cyclic": use_cyclic,
+        "rotate_mode": rotate_mode,
+        "axis_forward": axis_forward,
+        "axis_up": axis_up,
+    }
+
+    try:
+        data = read_bvh(path)
+    except UnsupportedBVH as e:
+        print(f"{path}: {e}, falling back to the built-in importer")
+        bpy.ops.import_anim.bvh(filepath=path, **options)
+        return None
+
+    parsed = time.perf_counter() - started
+    scene = context.scene
+    update_scene_timing(
+        scene,
+        data,
+        frame_start,
+        use_fps_scale,
+        update_scene_fps,
+        update_scene_duration,
+    )
+
+    # decimation keeps the timing, the remaining keys are further apart
+    if target_fps > 0 and data.frame_time > 0:
+        frame_stride = max(1, round(1.0 / data.frame_time / target_fps))
+
+    rows = np.arange(0, len(data.motion), max(1, frame_stride))
+    motion = data.motion[rows]
+    step = 1.0
+
+    if use_fps_scale:
+        step = scene.render.fps / scene.render.fps_base * data.frame_time
+
+    times = frame_start + rows * step
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    heads, tails = rest_pose(data, global_scale)
+    obj, names = create_armature(context, name, data, heads, tails)
+    armature = obj.data
+
+    action = bpy.data.actions.new(name)
+    obj.animation_data_create()
+    obj.animation_data.action = action
+    fcurves: list[bpy.types.FCurve] = []
+
+    for joint, bone_name in zip(data.joints, names):
+        pose_bone = obj.pose.bones[bone_name]
+        order = joint.rotation_order()
+
+        if rotate_mode == "NATIVE":
+            # the channel order as the mode, like the built-in importer
+            pose_bone.rotation_mode = order if len(order) == 3 else "XYZ"
+        else:
+            pose_bone.rotation_mode = rotate_mode
+
+        rest = np.array(armature.bones[bone_name].matrix_local.to_3x3())
+        data_path = f'pose.bones["{bpy.utils.escape_identifier(bone_name)}"]'
+        columns = joint.location_columns()
+
+        if columns is not None:
+            locations = motion[:, columns] * global_scale - joint.offset * global_scale
+            locations = locations @ rest  # rest is orthonormal, so this is rest^-1 @ v
+
+            for index in range(3):
+                fcurve = new_fcurve(
+                    action, obj, f"{data_path}.location", index, bone_name
+                )
+                write_keyframes(fcurve, times, locations[:, index])
+                fcurves.append(fcurve)
+
+        if not order:
+            continue
+
+        # the channel rotation expressed relative to the rest orientation of the bone
+        matrices = rotation_matrices(order, motion[:, joint.rotation_columns()])
+        matrices = rest.T @ matrices @ rest
+
+        if rotate_mode == "QUATERNION":
+            values = matrices_to_quaternions(matrices)
+            property = "rotation_quaternion"
+        else:
+            values = matrices_to_eulers(matrices, pose_bone.rotation_mode)
+            property = "rotation_euler"
+
+        for index in range(values.shape[1]):
+            fcurve = new_fcurve(
+                action, obj, f"{data_path}.{property}", index, bone_name
+            )
+            write_keyframes(fcurve, times, values[:, index])
+            fcurves.append(fcurve)
+
+    if use_cyclic:
+        for fcurve in fcurves:
+            fcurve.modifiers.new("CYCLES")
+
+    # bones were built in file axes, turn the rest pose over like transform_apply would
+    armature.transform(
+        axis_conversion(from_forward=axis_forward, from_up=axis_up).to_4x4()
+    )
+
+    print(
+        f"{path}: {len(data.joints)} joints, {len(rows)} of {len(data.motion)} frames, parsed in {parsed:.2f}s, imported in {time.perf_counter() - started:.2f}s"
+    )
+
+    return obj
+
 
 class ImportBVHWithDefaults(ImportWithDefaultsBase):
     bl_idname = "object.import_bvh_with_defaults"
     bl_label = "Import BVH File"
 
     def execute(self, context: Context) -> Set[str] | Set[int]:
-        bpy.ops.import_anim.bvh(filepath=self.filepath())
+        with self.staged_import(context):
+            bpy.ops.import_anim.bvh(filepath=self.filepath())
+
         return {"FINISHED"}
 
 
-class ImportBVHWithCustomSettings(ImportsWithCustomSettingsBase):
-    bl_idname = "object.import_bvh_with_custom_settings"
-    bl_label = "Import BVH File"
+class BVHSettings:
+    # shared by the built-in and the fast importer
+    transform_properties = ("global_scale", "axis_forward", "axis_up")
 
     # Properties based on Blender v4.0.0 (ordered by parameters on documents)
     target: EnumProperty(
@@ -114,20 +384,99 @@ class ImportBVHWithCustomSettings(ImportsWithCustomSettingsBase):
             column.prop(self, "update_scene_fps")
             column.prop(self, "update_scene_duration")
 
+    def bvh_options(self) -> dict[str, typing.Any]:
+        return {
+            "global_scale": self.global_scale,
+            "frame_start": self.frame_start,
+            "use_fps_scale": self.use_fps_scale,
+            "update_scene_fps": self.update_scene_fps,
+            "update_scene_duration": self.update_scene_duration,
+            "use_cyclic": self.use_cyclic,
+            "rotate_mode": self.rotate_mode,
+            "axis_forward": self.axis_forward,
+            "axis_up": self.axis_up,
+        }
+
+
+class ImportBVHWithCustomSettings(BVHSettings, ImportsWithCustomSettingsBase):
+    bl_idname = "object.import_bvh_with_custom_settings"
+    bl_label = "Import BVH File"
+
     def execute(self, context: Context) -> Set[str] | Set[int]:
-        bpy.ops.import_anim.bvh(
-            filepath=self.filepath(),
-            target=self.target,
-            global_scale=self.global_scale,
-            frame_start=self.frame_start,
-            use_fps_scale=self.use_fps_scale,
-            update_scene_fps=self.update_scene_fps,
-            update_scene_duration=self.update_scene_duration,
-            use_cyclic=self.use_cyclic,
-            rotate_mode=self.rotate_mode,
-            axis_forward=self.axis_forward,
-            axis_up=self.axis_up,
-        )
+        if self.reuse_previous_import(context):
+            return {"FINISHED"}
+
+        with self.remember_import(context), self.staged_import(context):
+            bpy.ops.import_anim.bvh(
+                filepath=self.filepath(), target=self.target, **self.bvh_options()
+            )
+
+        return {"FINISHED"}
+
+
+class ImportBVHFastWithDefaults(ImportWithDefaultsBase):
+    bl_idname = "object.import_bvh_fast_with_defaults"
+    bl_label = "Import BVH File (Fast)"
+
+    def execute(self, context: Context) -> Set[str] | Set[int]:
+        with self.staged_import(context):
+            import_bvh_fast(context, self.filepath())
+
+        return {"FINISHED"}
+
+
+class ImportBVHFastWithCustomSettings(BVHSettings, ImportsWithCustomSettingsBase):
+    bl_idname = "object.import_bvh_fast_with_custom_settings"
+    bl_label = "Import BVH File (Fast)"
+
+    decimation: EnumProperty(
+        default="NONE",
+        name="Decimation",
+        items=[
+            ("NONE", "None", "Keep every frame"),
+            ("STRIDE", "Stride", "Keep every n-th frame"),
+            ("FPS", "Frame Rate", "Keep about as many frames as the target rate"),
+        ],
+    )
+    frame_stride: IntProperty(default=2, min=1, max=1000, name="Frame Stride")
+    target_fps: FloatProperty(default=30.0, min=1.0, max=1000.0, name="Target FPS")
+
+    decimation_section: BoolProperty(default=False, name="Decimation")
+
+    def draw(self, context: Context):
+        BVHSettings.draw(self, context)
+
+        # Decimation Section
+        column, state = self.get_expand_column("decimation_section")
+        if state:
+            column.enabled = self.target == "ARMATURE"
+            column.prop(self, "decimation")
+
+            if self.decimation == "STRIDE":
+                column.prop(self, "frame_stride")
+            elif self.decimation == "FPS":
+                column.prop(self, "target_fps")
+
+    def execute(self, context: Context) -> Set[str] | Set[int]:
+        if self.reuse_previous_import(context):
+            return {"FINISHED"}
+
+        with self.remember_import(context), self.staged_import(context):
+            # empties per joint are left to the built-in importer
+            if self.target != "ARMATURE":
+                bpy.ops.import_anim.bvh(
+                    filepath=self.filepath(), target=self.target, **self.bvh_options()
+                )
+            else:
+                import_bvh_fast(
+                    context,
+                    self.filepath(),
+                    **self.bvh_options(),
+                    frame_stride=(
+                        self.frame_stride if self.decimation == "STRIDE" else 1
+                    ),
+                    target_fps=self.target_fps if self.decimation == "FPS" else 0.0,
+                )
 
         return {"FINISHED"}
 
@@ -156,6 +505,8 @@ class VIEW3D_FH_Import_BVH(bpy.types.FileHandler):
 OPERATORS: list[type] = [
     ImportBVHWithDefaults,
     ImportBVHWithCustomSettings,
+    ImportBVHFastWithDefaults,
+    ImportBVHFastWithCustomSettings,
     VIEW3D_MT_Space_Import_BVH,
     VIEW3D_FH_Import_BVH,
 ]
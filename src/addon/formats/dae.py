@@ -29,7 +29,9 @@ class ImportDAEWithDefaults(ImportWithDefaultsBase):
     bl_label = "Import DAE File"
 
     def execute(self, context: Context) -> Set[str] | Set[int]:
-        bpy.ops.wm.collada_import(filepath=self.filepath())
+        with self.staged_import(context):
+            bpy.ops.wm.collada_import(filepath=self.filepath())
+
         return {"FINISHED"}
 
 
@@ -68,16 +70,17 @@ class ImportDAEWithCustomSettings(ImportsWithCustomSettingsBase):
         column.prop(self, "keep_bind_info")
 
     def execute(self, context: Context) -> Set[str] | Set[int]:
-        bpy.ops.wm.collada_import(
-            filepath=self.filepath(),
-            import_units=self.import_units,
-            custom_normals=self.custom_normals,
-            fix_orientation=self.fix_orientation,
-            find_chains=self.find_chains,
-            auto_connect=self.auto_connect,
-            min_chain_length=self.min_chain_length,
-            keep_bind_info=self.keep_bind_info,
-        )
+        with self.staged_import(context):
+            bpy.ops.wm.collada_import(
+                filepath=self.filepath(),
+                import_units=self.import_units,
+                custom_normals=self.custom_normals,
+                fix_orientation=self.fix_orientation,
+                find_chains=self.find_chains,
+                auto_connect=self.auto_connect,
+                min_chain_length=self.min_chain_length,
+                keep_bind_info=self.keep_bind_info,
+            )
 
         return {"FINISHED"}
 
@@ -8,6 +8,8 @@
 # pyright: reportUnknownMemberType=false
 # pyright: reportInvalidTypeForm=false
 
+import os
+import typing
 import bpy
 
 from bpy.props import (
@@ -15,27 +17,154 @@ from bpy.props import (
     EnumProperty,  # pyright: ignore[reportUnknownVariableType]
     FloatProperty,  # pyright: ignore[reportUnknownVariableType]
 )
-from bpy.types import Context
-
+from bpy.types import Context, Event
+from mathutils import Matrix
+
+from ..readers.fbx import (
+    FBXSummary,
+    UnsupportedFBX,
+    basename,
+    read_summary,
+    read_texture_files,
+)
+from ..utils.texture_index import resolve
 from .super import (
+    ImageOptimization,
     ImportWithDefaultsBase,
     ImportsWithCustomSettingsBase,
     VIEW3D_MT_Space_Import_BASE,
 )
 
+# rough costs of the built-in importer in seconds, only meant to compare settings
+COST_BASE = 0.2
+COST_CORNER = 5e-7
+COST_CUSTOM_NORMAL = 2.5e-7
+COST_BONE = 1e-3
+COST_ANIMATION_KEY = 4e-6
+COST_IMAGE_SEARCH = 0.05  # per texture looked up on disk
+EMBEDDED_BYTES_PER_SECOND = 200 * 1024 * 1024
+
+# path -> ((mtime, size), summary), the dialog redraws often and the redo panel re-runs
+summaries: dict[str, tuple[tuple[float, int], FBXSummary | None]] = {}
+
+
+def inspect_fbx(path: str) -> FBXSummary | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    key = (stat.st_mtime, stat.st_size)
+    cached = summaries.get(path)
+
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    try:
+        summary = read_summary(path)
+    except (OSError, UnsupportedFBX) as e:
+        print(f"{path}: {e}, no summary available")
+        summary = None
+
+    summaries[path] = (key, summary)
+    return summary
+
+
+def unneeded_options(summary: FBXSummary) -> dict[str, str]:
+    options: dict[str, str] = {}
+
+    if summary.animation_curves == 0:
+        options["use_anim"] = "no animation curves"
+    if summary.textures == 0:
+        options["use_image_search"] = "no textures"
+    elif summary.embedded_textures >= summary.textures:
+        options["use_image_search"] = "all textures are embedded"
+    if summary.meshes_with_normals == 0:
+        options["use_custom_normals"] = "no stored normals"
+    if summary.subdivided_meshes == 0:
+        options["use_subsurf"] = "no subdivision levels"
+
+    return options
+
+
+def estimate_seconds(
+    summary: FBXSummary,
+    use_custom_normals: bool,
+    use_anim: bool,
+    use_image_search: bool,
+) -> float:
+    seconds = COST_BASE + summary.corners * COST_CORNER
+    seconds += summary.bones * COST_BONE
+    seconds += summary.embedded_bytes / EMBEDDED_BYTES_PER_SECOND
+
+    if use_custom_normals:
+        seconds += summary.corners * COST_CUSTOM_NORMAL
+    if use_anim:
+        seconds += summary.animation_keys * COST_ANIMATION_KEY
+    if use_image_search:
+        seconds += (summary.textures - summary.embedded_textures) * COST_IMAGE_SEARCH
+
+    return seconds
+
+
+def search_textures(path: str) -> dict[str, str] | None:
+    # returns the moved textures when every reference resolved, None to keep the
+    # importer's own recursive search
+    try:
+        textures = read_texture_files(path)
+    except (OSError, UnsupportedFBX) as e:
+        print(f"{path}: {e}, using the importer's image search")
+        return None
+
+    resolution = resolve(path, textures)
+
+    print(
+        f"{path}: resolved {len(textures) - len(resolution.missing)} of {len(textures)} textures in {resolution.seconds:.2f}s ({resolution.rescanned} directories rescanned)"
+    )
+
+    return None if resolution.missing else resolution.found
+
+
+def relink_images(images: list[bpy.types.Image], found: dict[str, str]):
+    for image in images:
+        path = found.get(basename(image.filepath))
+
+        if path is not None and not os.path.isfile(bpy.path.abspath(image.filepath)):
+            image.filepath = path
+            image.reload()
+
+
+def import_fbx(path: str, **options: typing.Any):
+    found = None
+
+    if options.get("use_image_search", True):
+        found = search_textures(path)
+
+        if found is not None:
+            options["use_image_search"] = False
+
+    images = set(bpy.data.images)
+    bpy.ops.import_scene.fbx(filepath=path, **options)
+
+    if found:
+        relink_images([i for i in bpy.data.images if i not in images], found)
+
 
 class ImportFBXWithDefaults(ImportWithDefaultsBase):
     bl_idname = "object.import_fbx_with_defaults"
     bl_label = "Import FBX File"
 
     def execute(self, context: Context):
-        bpy.ops.import_scene.fbx(filepath=self.filepath())
+        with self.staged_import(context):
+            import_fbx(self.filepath())
+
         return {"FINISHED"}
 
 
-class ImportFBXWithCustomSettings(ImportsWithCustomSettingsBase):
+class ImportFBXWithCustomSettings(ImageOptimization, ImportsWithCustomSettingsBase):
     bl_idname = "object.import_fbx_with_custom_settings"
     bl_label = "Import FBX File"
+    transform_properties = ("global_scale", "axis_forward", "axis_up")
 
     # Properties based on Blender latest (ordered by parameters on documents)
     use_manual_orientation: BoolProperty(default=False, name="Manual Orientation")
@@ -115,12 +244,66 @@ class ImportFBXWithCustomSettings(ImportsWithCustomSettingsBase):
     )
 
     # ui properties
+    file_section: BoolProperty(default=True, name="File")
     include_section: BoolProperty(default=True, name="Include")
     transform_section: BoolProperty(default=True, name="Transform")
     animation_section: BoolProperty(default=True, name="Animation")
     armature_section: BoolProperty(default=True, name="Armature")
 
+    def transform_matrix(self) -> Matrix:
+        # without manual orientation the axes come from the file and never change
+        if not self.use_manual_orientation:
+            return Matrix.Scale(self.global_scale, 4)
+
+        return super().transform_matrix()
+
+    def invoke(self, context: Context, event: Event):
+        summary = inspect_fbx(self.filepath())
+
+        if summary is not None:
+            for name in unneeded_options(summary):
+                setattr(self, name, False)
+
+        return super().invoke(context, event)
+
+    def draw_summary(self, column: bpy.types.UILayout, summary: FBXSummary):
+        column.label(
+            text=f"FBX {summary.version / 1000:.1f}: {summary.meshes} meshes, {summary.corners:,} face corners"
+        )
+        column.label(
+            text=f"{summary.bones} bones, {summary.skins} skins, {summary.blend_shapes} shapes"
+        )
+        column.label(
+            text=f"{summary.animation_stacks} animation stacks, {summary.animation_keys:,} keys"
+        )
+        column.label(
+            text=f"{summary.textures} textures, {summary.embedded_textures} embedded ({summary.embedded_bytes / (1024 * 1024):.1f} MB)"
+        )
+
+        seconds = estimate_seconds(
+            summary, self.use_custom_normals, self.use_anim, self.use_image_search
+        )
+        column.label(text=f"Estimated import time: {seconds:.1f}s", icon="TIME")
+
+        for name, reason in unneeded_options(summary).items():
+            if not getattr(self, name):
+                label = self.properties.bl_rna.properties[name].name
+                column.label(text=f"{label} disabled: {reason}", icon="INFO")
+
+    def transform_only_on_roots(self) -> bool:
+        # applied transforms are baked into the mesh data
+        return not self.bake_space_transform
+
     def draw(self, context: Context):
+        # File Section
+        summary = inspect_fbx(self.filepath())
+
+        if summary is not None:
+            column, state = self.get_expand_column("file_section")
+
+            if state:
+                self.draw_summary(column, summary)
+
         # Include Section
         column, state = self.get_expand_column("include_section")
 
@@ -173,31 +356,42 @@ class ImportFBXWithCustomSettings(ImportsWithCustomSettingsBase):
             column.prop(self, "primary_bone_axis")
             column.prop(self, "secondary_bone_axis")
 
+        self.draw_images_section()
+        self.draw_lean_section()
+
     def execute(self, context: Context):
-        bpy.ops.import_scene.fbx(
-            filepath=self.filepath(),
-            use_manual_orientation=self.use_manual_orientation,
-            global_scale=self.global_scale,
-            bake_space_transform=self.bake_space_transform,
-            use_custom_normals=self.use_custom_normals,
-            colors_type=self.colors_type,
-            use_image_search=self.use_image_search,
-            use_alpha_decals=self.use_alpha_decals,
-            decal_offset=self.decal_offset,
-            use_anim=self.use_anim,
-            anim_offset=self.anim_offset,
-            use_subsurf=self.use_subsurf,
-            use_custom_props=self.use_custom_props,
-            use_custom_props_enum_as_string=self.use_custom_props_enum_as_string,
-            ignore_leaf_bones=self.ignore_leaf_bones,
-            force_connect_children=self.force_connect_children,
-            automatic_bone_orientation=self.automatic_bone_orientation,
-            primary_bone_axis=self.primary_bone_axis,
-            secondary_bone_axis=self.secondary_bone_axis,
-            use_prepost_rot=self.use_prepost_rot,
-            axis_forward=self.axis_forward,
-            axis_up=self.axis_up,
-        )
+        if self.defer_lean_import(context):
+            return {"CANCELLED"}
+
+        if self.reuse_previous_import(context):
+            return {"FINISHED"}
+
+        with self.remember_import(context), self.staged_import(context):
+            with self.optimize_images():
+                import_fbx(
+                    self.filepath(),
+                    use_manual_orientation=self.use_manual_orientation,
+                    global_scale=self.global_scale,
+                    bake_space_transform=self.bake_space_transform,
+                    use_custom_normals=self.use_custom_normals,
+                    colors_type=self.colors_type,
+                    use_image_search=self.use_image_search,
+                    use_alpha_decals=self.use_alpha_decals,
+                    decal_offset=self.decal_offset,
+                    use_anim=self.use_anim,
+                    anim_offset=self.anim_offset,
+                    use_subsurf=self.use_subsurf,
+                    use_custom_props=self.use_custom_props,
+                    use_custom_props_enum_as_string=self.use_custom_props_enum_as_string,
+                    ignore_leaf_bones=self.ignore_leaf_bones,
+                    force_connect_children=self.force_connect_children,
+                    automatic_bone_orientation=self.automatic_bone_orientation,
+                    primary_bone_axis=self.primary_bone_axis,
+                    secondary_bone_axis=self.secondary_bone_axis,
+                    use_prepost_rot=self.use_prepost_rot,
+                    axis_forward=self.axis_forward,
+                    axis_up=self.axis_up,
+                )
 
         return {"FINISHED"}
 
@@ -7,28 +7,153 @@
 # pyright: reportUnknownMemberType=false
 # pyright: reportInvalidTypeForm=false
 
+import os
+import time
+import typing
 import bpy
 
-from bpy.props import BoolProperty, EnumProperty  # type: ignore
-from bpy.types import Context
-
+from bpy.props import (  # type: ignore
+    BoolProperty,
+    CollectionProperty,
+    EnumProperty,
+    IntProperty,
+    StringProperty,
+)
+from bpy.types import Context, Event
+
+from ..readers.gltf import (
+    EXTENSION_NAMES,
+    GLTFSummary,
+    UnsupportedGLTF,
+    open_document,
+    read_summary,
+)
+from ..readers.gltf_subset import node_tree, write_subset
+from ..utils.prefetch import DATA_URI_BYTES_PER_SECOND, prefetch_gltf_dependencies
 from .super import (
+    ImageOptimization,
     ImportWithDefaultsBase,
     ImportsWithCustomSettingsBase,
     VIEW3D_MT_Space_Import_BASE,
 )
 
+# path -> ((mtime, size), summary), menus and dialogs redraw often
+summaries: dict[str, tuple[tuple[float, int], GLTFSummary | None]] = {}
+
+
+def inspect_gltf(path: str) -> GLTFSummary | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    key = (stat.st_mtime, stat.st_size)
+    cached = summaries.get(path)
+
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    try:
+        summary = read_summary(path)
+    except (OSError, UnsupportedGLTF) as e:
+        print(f"{path}: {e}, no summary available")
+        summary = None
+
+    summaries[path] = (key, summary)
+    return summary
+
+
+def draw_summary(layout: bpy.types.UILayout, summary: GLTFSummary):
+    layout.label(
+        text=f"glTF {summary.version}: {summary.scenes} scenes, {summary.nodes} nodes, {summary.meshes} meshes"
+    )
+    layout.label(
+        text=f"{summary.primitives} primitives, {summary.vertices:,} vertices, {summary.triangles:,} triangles"
+    )
+
+    if summary.textures:
+        largest = max(summary.textures, key=lambda t: t.width * t.height)
+        size = sum(t.size for t in summary.textures) / (1024 * 1024)
+        layout.label(
+            text=f"{len(summary.textures)} textures ({size:.1f} MB), largest {largest.width}x{largest.height}"
+        )
+
+    external = [r for r in summary.resources if r.path]
+    embedded = sum(r.embedded for r in summary.resources if r.kind == "buffer")
+
+    if external:
+        layout.label(text=f"{len(external)} external files")
+
+    if embedded > 0:
+        layout.label(
+            text=f"Data URI buffers: {embedded / (1024 * 1024):.1f} MB, about {embedded / DATA_URI_BYTES_PER_SECOND:.1f}s to decode",
+            icon="ERROR",
+        )
+
+    names = sorted({EXTENSION_NAMES.get(e, e) for e in summary.extensions})
+
+    if names:
+        layout.label(text=f"Extensions: {', '.join(names)}", icon="INFO")
+
+
+def check_resources(operator: bpy.types.Operator, path: str) -> bool:
+    # the importer reads external files one after another and fails on the first
+    # missing buffer, after everything before it was parsed
+    summary = inspect_gltf(path)
+
+    if summary is None:
+        return True
+
+    return prefetch_gltf_dependencies(operator, path, summary.resources)
+
+
+class GLTFNodeItem(bpy.types.PropertyGroup):
+    kind: StringProperty()  # "SCENE" or "NODE"
+    index: IntProperty()
+    depth: IntProperty()
+    selected: BoolProperty(default=False)
+
+
+class VIEW3D_UL_Import_GLTF_Nodes(bpy.types.UIList):
+    def draw_item(
+        self,
+        context: Context,
+        layout: bpy.types.UILayout,
+        data: typing.Any,
+        item: GLTFNodeItem,
+        icon: int,
+        active_data: typing.Any,
+        active_property: str,
+        index: int = 0,
+        flt_flag: int = 0,
+    ):
+        row = layout.row(align=True)
+
+        if item.depth > 0:
+            row.separator(factor=item.depth * 1.5)
+
+        row.prop(item, "selected", text="")
+        row.label(
+            text=item.name,
+            icon="SCENE_DATA" if item.kind == "SCENE" else "OBJECT_DATA",
+        )
+
 
 class ImportGLBWithDefaults(ImportWithDefaultsBase):
     bl_idname = "object.import_glb_with_defaults"
     bl_label = "Import GLB File"
 
     def execute(self, context: Context):
-        bpy.ops.import_scene.gltf(filepath=self.filepath())
+        if not check_resources(self, self.filepath()):
+            return {"CANCELLED"}
+
+        with self.staged_import(context):
+            bpy.ops.import_scene.gltf(filepath=self.filepath())
+
         return {"FINISHED"}
 
 
-class ImportGLBWithCustomSettings(ImportsWithCustomSettingsBase):
+class ImportGLBWithCustomSettings(ImageOptimization, ImportsWithCustomSettingsBase):
     bl_idname = "object.import_glb_with_custom_settings"
     bl_label = "Import GLB File"
 
@@ -65,7 +190,95 @@ class ImportGLBWithCustomSettings(ImportsWithCustomSettingsBase):
         default=True, name="Guess Original Bind Pose"
     )
 
+    import_subset: BoolProperty(default=False, name="Import Selected Nodes Only")
+    subset_nodes: CollectionProperty(type=GLTFNodeItem)
+    subset_active: IntProperty()
+
+    file_section: BoolProperty(default=True, name="File")
+    subset_section: BoolProperty(default=False, name="Selection")
+
+    def invoke(self, context: Context, event: Event):
+        self.subset_nodes.clear()
+
+        try:
+            with open_document(self.filepath()) as (_, document):
+                tree = node_tree(document)
+        except (OSError, UnsupportedGLTF) as e:
+            print(f"{self.filepath()}: {e}, nodes cannot be selected")
+            tree = []
+
+        for entry in tree:
+            item = self.subset_nodes.add()
+            item.kind = entry.kind
+            item.index = entry.index
+            item.name = entry.name
+            item.depth = entry.depth
+
+        return super().invoke(context, event)
+
+    def draw_subset_section(self):
+        column, state = self.get_expand_column("subset_section")
+
+        if state:
+            column.prop(self, "import_subset")
+
+            nodes = column.column()
+            nodes.enabled = self.import_subset
+            nodes.template_list(
+                "VIEW3D_UL_Import_GLTF_Nodes",
+                "",
+                self,
+                "subset_nodes",
+                self,
+                "subset_active",
+                rows=8,
+            )
+
+    def import_selected(self, options: dict[str, typing.Any]) -> set[str]:
+        nodes = {i.index for i in self.subset_nodes if i.selected and i.kind == "NODE"}
+        scenes = {
+            i.index for i in self.subset_nodes if i.selected and i.kind == "SCENE"
+        }
+
+        if not nodes and not scenes:
+            self.report({"ERROR"}, "No nodes or scenes are selected")
+            return {"CANCELLED"}
+
+        name = os.path.splitext(os.path.basename(self.filepath()))[0]
+        directory = bpy.app.tempdir or os.path.dirname(self.filepath())
+        trimmed = os.path.join(directory, f"{name}_selection.glb")
+        started = time.perf_counter()
+
+        try:
+            subset = write_subset(self.filepath(), trimmed, nodes, scenes)
+        except (OSError, UnsupportedGLTF) as e:
+            self.report({"ERROR"}, f"Could not select nodes of {name}: {e}")
+            return {"CANCELLED"}
+
+        print(
+            f"{self.filepath()}: wrote {subset.nodes} nodes, {subset.meshes} meshes and {subset.binary_bytes / (1024 * 1024):.1f} MB of buffers in {time.perf_counter() - started:.2f}s"
+        )
+
+        try:
+            # images only live in the temporary file, so they are always packed
+            bpy.ops.import_scene.gltf(
+                filepath=trimmed, **{**options, "import_pack_images": True}
+            )
+        finally:
+            os.remove(trimmed)
+
+        return {"FINISHED"}
+
     def draw(self, context: Context):
+        # File Section
+        summary = inspect_gltf(self.filepath())
+
+        if summary is not None:
+            column, state = self.get_expand_column("file_section")
+
+            if state:
+                draw_summary(column, summary)
+
         box = self.layout.box()
         column = box.column()
 
@@ -80,23 +293,50 @@ class ImportGLBWithCustomSettings(ImportsWithCustomSettingsBase):
         if bpy.app.version >= (3, 4, 0):
             column.prop(self, "convert_lighting_mode")
 
+        self.draw_subset_section()
+        self.draw_images_section()
+        self.draw_lean_section()
+
     def execute(self, context: Context):
-        bpy.ops.import_scene.gltf(
-            filepath=self.filepath(),
-            convert_lighting_mode=self.convert_lighting_mode,  # type: ignore
-            import_pack_images=self.import_pack_images,
-            merge_vertices=self.merge_vertices,
-            import_shading=self.import_shading,
-            bone_heuristic=self.bone_heuristic,
-            guess_original_bind_pose=self.guess_original_bind_pose,
-        )
+        if self.defer_lean_import(context):
+            return {"CANCELLED"}
+
+        if not check_resources(self, self.filepath()):
+            return {"CANCELLED"}
+
+        options = {
+            "convert_lighting_mode": self.convert_lighting_mode,
+            "import_pack_images": self.import_pack_images,
+            "merge_vertices": self.merge_vertices,
+            "import_shading": self.import_shading,
+            "bone_heuristic": self.bone_heuristic,
+            "guess_original_bind_pose": self.guess_original_bind_pose,
+        }
+
+        with self.staged_import(context), self.optimize_images():
+            if self.import_subset:
+                return self.import_selected(options)
+
+            bpy.ops.import_scene.gltf(filepath=self.filepath(), **options)
 
         return {"FINISHED"}
 
 
+def draw_menu_summary(layout: bpy.types.UILayout):
+    summary = inspect_gltf(VIEW3D_MT_Space_Import_BASE.filename)
+
+    if summary is not None:
+        layout.separator()
+        draw_summary(layout.column(), summary)
+
+
 class VIEW3D_MT_Space_Import_GLB(VIEW3D_MT_Space_Import_BASE):
     bl_label = "Import glTF File"
 
+    def draw(self, context: Context | None):
+        super().draw(context)
+        draw_menu_summary(self.layout)
+
     @staticmethod
     def format():
         return "glb"
@@ -105,6 +345,10 @@ class VIEW3D_MT_Space_Import_GLB(VIEW3D_MT_Space_Import_BASE):
 class VIEW3D_MT_Space_Import_GLTF(VIEW3D_MT_Space_Import_BASE):
     bl_label = "Import glTF File"
 
+    def draw(self, context: Context | None):
+        super().draw(context)
+        draw_menu_summary(self.layout)
+
     @staticmethod
     def format():
         return "glb"
@@ -139,6 +383,8 @@ class VIEW3D_FH_Import_GLTF(bpy.types.FileHandler):
 
 
 OPERATORS: list[type] = [
+    GLTFNodeItem,
+    VIEW3D_UL_Import_GLTF_Nodes,
     ImportGLBWithDefaults,
     ImportGLBWithCustomSettings,
     VIEW3D_MT_Space_Import_GLB,
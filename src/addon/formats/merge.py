@@ -0,0 +1,180 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# pyright: reportGeneralTypeIssues=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+# pyright: reportInvalidTypeForm=false
+
+import os
+import time
+import typing
+import bpy
+import numpy as np
+
+from bpy.props import StringProperty  # pyright: ignore[reportUnknownVariableType]
+from bpy.types import Context, Operator
+
+from ..readers.stl import read_stl
+from ..utils.mesh import (
+    MeshArrays,
+    add_face_attribute,
+    concatenate,
+    create_mesh,
+    link_object,
+    read_mesh_arrays,
+    triangle_starts,
+    write_attributes,
+)
+from .super import selectable_importers
+
+# extension -> format name used by the import_{format}_with_defaults operators
+MERGEABLE_FORMATS: dict[str, str] = {
+    ".obj": "obj",
+    ".ply": "ply",
+    ".stl": "stl",
+}
+
+
+def can_merge(paths: list[str]) -> bool:
+    return len(paths) > 1 and all(
+        os.path.splitext(p)[1].lower() in MERGEABLE_FORMATS for p in paths
+    )
+
+
+def default_importer(path: str) -> str:
+    format = MERGEABLE_FORMATS[os.path.splitext(path)[1].lower()]
+
+    if format in selectable_importers:
+        return selectable_importers[format]()[0][1]
+
+    return format
+
+
+def read_stl_part(path: str) -> list[MeshArrays]:
+    data = read_stl(path)
+    return [
+        MeshArrays(
+            data.vertices, data.triangles.ravel(), triangle_starts(len(data.triangles))
+        )
+    ]
+
+
+# formats that can be read into arrays without creating any datablock
+DIRECT_READERS: dict[str, typing.Callable[[str], list[MeshArrays]]] = {
+    ".stl": read_stl_part,
+}
+
+
+def read_via_importer(path: str) -> list[MeshArrays]:
+    before = set(bpy.data.objects[:])
+    importer = getattr(bpy.ops.object, f"import_{default_importer(path)}_with_defaults")
+    importer("EXEC_DEFAULT", filename=path)
+
+    imported = [o for o in bpy.data.objects if o not in before]
+    parts = [read_mesh_arrays(o) for o in imported if o.type == "MESH"]
+
+    for obj in imported:
+        data = obj.data
+        bpy.data.objects.remove(obj)
+
+        if isinstance(data, bpy.types.Mesh) and data.users == 0:
+            bpy.data.meshes.remove(data)
+
+    return parts
+
+
+def read_parts(path: str) -> list[MeshArrays]:
+    reader = DIRECT_READERS.get(os.path.splitext(path)[1].lower(), read_via_importer)
+    return reader(path)
+
+
+class ImportMergedWithDefaults(Operator):
+    bl_idname = "object.import_merged_with_defaults"
+    bl_label = "Merge into Single Object"
+    bl_options = {"REGISTER", "UNDO"}
+
+    # newline separated list of dropped files
+    filenames: StringProperty(options={"SKIP_SAVE"})
+
+    def execute(self, context: Context):
+        started = time.perf_counter()
+        paths = [p for p in self.filenames.split("\n") if p]
+
+        parts: list[MeshArrays] = []
+        owners: list[int] = []
+
+        for index, path in enumerate(paths):
+            for part in read_parts(path):
+                parts.append(part)
+                owners.append(index)
+
+        if not parts:
+            self.report({"WARNING"}, "No mesh data found in the dropped files")
+            return {"CANCELLED"}
+
+        merged, part_index = concatenate(parts)
+        name = os.path.basename(os.path.dirname(paths[0])) or "Merged"
+
+        mesh = create_mesh(
+            name, merged.vertices, merged.corner_verts, merged.face_starts
+        )
+        write_attributes(mesh, merged)
+        # identify every face by the dropped file it came from
+        add_face_attribute(
+            mesh, "part_index", np.asarray(owners, dtype=np.int32)[part_index]
+        )
+
+        obj = link_object(context, name, mesh)
+        obj["part_names"] = [os.path.basename(p) for p in paths]
+
+        self.report(
+            {"INFO"},
+            f"Merged {len(paths)} files ({len(merged.vertices)} vertices, {len(merged.face_starts)} faces) in {time.perf_counter() - started:.2f}s",
+        )
+
+        return {"FINISHED"}
+
+
+class ImportEachWithDefaults(Operator):
+    bl_idname = "object.import_each_with_defaults"
+    bl_label = "Import Each with Defaults"
+    bl_options = {"REGISTER", "UNDO"}
+
+    # newline separated list of dropped files
+    filenames: StringProperty(options={"SKIP_SAVE"})
+
+    def execute(self, context: Context):
+        for path in [p for p in self.filenames.split("\n") if p]:
+            importer = getattr(
+                bpy.ops.object, f"import_{default_importer(path)}_with_defaults"
+            )
+            importer("EXEC_DEFAULT", filename=path)
+
+        return {"FINISHED"}
+
+
+class VIEW3D_MT_Space_Import_Multiple(bpy.types.Menu):
+    bl_label = "Import Multiple Files"
+
+    filenames: list[str] = []
+
+    def draw(self, context: Context | None):
+        filenames = "\n".join(VIEW3D_MT_Space_Import_Multiple.filenames)
+
+        col = self.layout.column()
+        col.operator(
+            ImportEachWithDefaults.bl_idname, text="Import Each with Defaults"
+        ).filenames = filenames  # type: ignore
+        col.operator(
+            ImportMergedWithDefaults.bl_idname, text="Merge into Single Object"
+        ).filenames = filenames  # type: ignore
+
+
+OPERATORS: list[type] = [
+    ImportMergedWithDefaults,
+    ImportEachWithDefaults,
+    VIEW3D_MT_Space_Import_Multiple,
+]
@@ -0,0 +1,219 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# pyright: reportGeneralTypeIssues=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+# pyright: reportInvalidTypeForm=false
+
+from typing import Set
+import bpy
+
+from bpy.app.handlers import persistent
+from bpy.props import (
+    BoolProperty,  # pyright: ignore[reportUnknownVariableType]
+    IntProperty,  # pyright: ignore[reportUnknownVariableType]
+)
+from bpy.types import Context
+
+from ..readers.movie import read_movie_info
+from .super import (
+    ImportWithDefaultsBase,
+    ImportsWithCustomSettingsBase,
+    VIEW3D_MT_Space_Import_BASE,
+)
+
+# stored on the image so that the limit survives save and reload
+CACHE_LIMIT_KEY = "drag_and_drop_cache_frames"
+
+# image name -> frames displayed since the last time the buffers were freed
+displayed_frames: dict[str, set[int]] = {}
+
+
+@persistent
+def bound_movie_frame_cache(scene: bpy.types.Scene, *args: object):
+    for img in bpy.data.images:
+        limit = img.get(CACHE_LIMIT_KEY)
+
+        if limit is None or img.source != "MOVIE":
+            continue
+
+        frames = displayed_frames.setdefault(img.name, set())
+        frames.add(scene.frame_current)
+
+        if len(frames) > limit:
+            img.buffers_free()
+            frames.clear()
+
+
+def import_movie(
+    context: Context,
+    path: str,
+    cache_frames: int,
+    set_frame_range: bool,
+    update_scene_fps: bool,
+    use_cyclic: bool,
+):
+    scene = context.scene
+    info = read_movie_info(path)
+
+    bpy.ops.object.empty_add(
+        type="IMAGE",
+        align="VIEW",
+        location=scene.cursor.location,
+        scale=(5, 5, 5),
+    )
+
+    empty = context.active_object
+    img = bpy.data.images.load(path, check_existing=True)
+    img[CACHE_LIMIT_KEY] = cache_frames
+    empty.data = img
+
+    # fall back to what Blender reads from the container header for non ISO-BMFF movies
+    frame_count = info.frame_count if info is not None else img.frame_duration
+    fps = info.fps if info is not None else 0.0
+
+    image_user = empty.image_user
+    image_user.frame_start = scene.frame_start
+    image_user.frame_offset = 0
+    image_user.frame_duration = frame_count
+    image_user.use_auto_refresh = True
+    image_user.use_cyclic = use_cyclic
+
+    if set_frame_range and frame_count > 0:
+        scene.frame_end = scene.frame_start + frame_count - 1
+
+    if update_scene_fps and fps > 0:
+        scene.render.fps = max(1, round(fps))
+        scene.render.fps_base = scene.render.fps / fps
+
+    if info is not None:
+        print(
+            f"{path}: {info.width}x{info.height}, {info.frame_count} frames @ {info.fps:.3f} fps ({info.duration:.2f}s)"
+        )
+
+
+class ImportMovieWithDefaults(ImportWithDefaultsBase):
+    bl_idname = "object.import_movie_with_defaults"
+    bl_label = "Import Movie File"
+
+    def execute(self, context: Context) -> Set[str] | Set[int]:
+        import_movie(
+            context,
+            self.filepath(),
+            cache_frames=100,
+            set_frame_range=True,
+            update_scene_fps=False,
+            use_cyclic=False,
+        )
+
+        return {"FINISHED"}
+
+
+class ImportMovieWithCustomSettings(ImportsWithCustomSettingsBase):
+    bl_idname = "object.import_movie_with_custom_settings"
+    bl_label = "Import Movie File"
+
+    cache_frames: IntProperty(default=100, min=1, max=100000, name="Cached Frames")
+    set_frame_range: BoolProperty(default=True, name="Set Frame Range")
+    update_scene_fps: BoolProperty(default=False, name="Update Scene FPS")
+    use_cyclic: BoolProperty(default=False, name="Cyclic")
+
+    def draw(self, context: Context):
+        column = self.get_column()
+        column.prop(self, "cache_frames")
+        column.prop(self, "set_frame_range")
+        column.prop(self, "update_scene_fps")
+        column.prop(self, "use_cyclic")
+
+    def execute(self, context: Context) -> Set[str] | Set[int]:
+        import_movie(
+            context,
+            self.filepath(),
+            cache_frames=self.cache_frames,
+            set_frame_range=self.set_frame_range,
+            update_scene_fps=self.update_scene_fps,
+            use_cyclic=self.use_cyclic,
+        )
+
+        return {"FINISHED"}
+
+
+class VIEW3D_MT_Space_Import_MP4(VIEW3D_MT_Space_Import_BASE):
+    bl_label = "Import MPEG-4 File"
+
+    @staticmethod
+    def format():
+        return "movie"
+
+
+class VIEW3D_MT_Space_Import_M4V(VIEW3D_MT_Space_Import_BASE):
+    bl_label = "Import MPEG-4 File"
+
+    @staticmethod
+    def format():
+        return "movie"
+
+
+class VIEW3D_MT_Space_Import_MOV(VIEW3D_MT_Space_Import_BASE):
+    bl_label = "Import QuickTime File"
+
+    @staticmethod
+    def format():
+        return "movie"
+
+
+class VIEW3D_MT_Space_Import_AVI(VIEW3D_MT_Space_Import_BASE):
+    bl_label = "Import AVI File"
+
+    @staticmethod
+    def format():
+        return "movie"
+
+
+class VIEW3D_MT_Space_Import_MKV(VIEW3D_MT_Space_Import_BASE):
+    bl_label = "Import Matroska File"
+
+    @staticmethod
+    def format():
+        return "movie"
+
+
+class VIEW3D_MT_Space_Import_WEBM(VIEW3D_MT_Space_Import_BASE):
+    bl_label = "Import WebM File"
+
+    @staticmethod
+    def format():
+        return "movie"
+
+
+class VIEW3D_FH_Import_Movie(bpy.types.FileHandler):
+    bl_idname = "VIEW3D_FH_Import_Movie"
+    bl_label = "Import Movie File"
+    bl_import_operator = "object.drop_event_listener"
+    bl_file_extensions = ".mp4;.m4v;.mov;.avi;.mkv;.webm"
+
+    @classmethod
+    def poll_drop(cls, context: bpy.types.Context | None) -> bool:
+        if context is None:
+            return False
+        return context and context.area and context.area.type == "VIEW_3D"
+
+
+OPERATORS: list[type] = [
+    ImportMovieWithDefaults,
+    ImportMovieWithCustomSettings,
+    VIEW3D_MT_Space_Import_MP4,
+    VIEW3D_MT_Space_Import_M4V,
+    VIEW3D_MT_Space_Import_MOV,
+    VIEW3D_MT_Space_Import_AVI,
+    VIEW3D_MT_Space_Import_MKV,
+    VIEW3D_MT_Space_Import_WEBM,
+    VIEW3D_FH_Import_Movie,
+]
+
+HANDLERS: list[tuple[str, object]] = [
+    ("frame_change_post", bound_movie_frame_cache),
+]
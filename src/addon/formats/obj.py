@@ -8,11 +8,22 @@
 # pyright: reportUnknownMemberType=false
 # pyright: reportInvalidTypeForm=false
 
+import os
+import shutil
+import tempfile
+import threading
 import bpy
 
-from bpy.props import BoolProperty, EnumProperty, FloatProperty  # type: ignore
-from bpy.types import Context
+from bpy.props import BoolProperty, EnumProperty, FloatProperty, IntProperty  # type: ignore
+from bpy.types import Context, Event
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 
+from ..readers.obj import UnsupportedOBJ
+from ..readers.obj_split import SplitOBJ, split_obj
+from ..utils.prefetch import prefetch_obj_dependencies
+from ..utils.workers import Job, Result, WorkerPool, default_workers
+from .obj_fast import create_material, fallback_import
+from .sequence import draw_menu_sequence
 from .super import (
     ImportWithDefaultsBase,
     ImportsWithCustomSettingsBase,
@@ -25,13 +36,17 @@ class ImportOBJWithDefaults(ImportWithDefaultsBase):
     bl_label = "Import Wavefront OBJ File"
 
     def execute(self, context: Context):
-        bpy.ops.wm.obj_import(filepath=self.filepath())
+        with prefetch_obj_dependencies(self, self.filepath()):
+            with self.staged_import(context):
+                bpy.ops.wm.obj_import(filepath=self.filepath())
+
         return {"FINISHED"}
 
 
 class ImportOBJWithCustomSettings(ImportsWithCustomSettingsBase):
     bl_idname = "object.import_obj_with_custom_settings"
     bl_label = "Import Wavefront OBJ File"
+    transform_properties = ("global_scale", "forward_axis", "up_axis")
 
     # properties
     global_scale: FloatProperty(default=1.0, name="Scale", min=0.0001, max=10000)
@@ -88,25 +103,351 @@ class ImportOBJWithCustomSettings(ImportsWithCustomSettingsBase):
             column.prop(self, "import_vertex_groups")
             column.prop(self, "validate_meshes")
 
+        self.draw_lean_section()
+
     def execute(self, context: Context):
-        bpy.ops.wm.obj_import(
-            filepath=self.filepath(),
-            global_scale=self.global_scale,
-            clamp_size=self.clamp_size,
-            forward_axis=self.forward_axis,
-            up_axis=self.up_axis,
-            use_split_objects=self.use_split_objects,
-            use_split_groups=self.use_split_groups,
-            import_vertex_groups=self.import_vertex_groups,
-            validate_meshes=self.validate_meshes,
+        if self.defer_lean_import(context):
+            return {"CANCELLED"}
+
+        if self.reuse_previous_import(context):
+            return {"FINISHED"}
+
+        with prefetch_obj_dependencies(self, self.filepath()):
+            with self.remember_import(context), self.staged_import(context):
+                bpy.ops.wm.obj_import(
+                    filepath=self.filepath(),
+                    global_scale=self.global_scale,
+                    clamp_size=self.clamp_size,
+                    forward_axis=self.forward_axis,
+                    up_axis=self.up_axis,
+                    use_split_objects=self.use_split_objects,
+                    use_split_groups=self.use_split_groups,
+                    import_vertex_groups=self.import_vertex_groups,
+                    validate_meshes=self.validate_meshes,
+                )
+
+        return {"FINISHED"}
+
+
+class ParallelImport:
+    # share of the progress bar taken by the split pass, the rest is for the workers
+    SPLIT_SHARE = 30
+
+    def start(
+        self,
+        context: Context,
+        path: str,
+        settings: dict[str, object],
+        split_groups: bool = False,
+        workers: int = 0,
+        worker_memory: int = 0,
+    ):
+        self._path = path
+        self._settings = settings
+        self._workers = workers or default_workers()
+        self._worker_memory = worker_memory
+        self._size = max(os.path.getsize(path), 1)
+        self._read = 0
+        self._cancelled = threading.Event()
+        self._directory = tempfile.mkdtemp(
+            prefix="obj_shards_", dir=bpy.app.tempdir or None
+        )
+        self._pool: WorkerPool | None = None
+        self._materials: dict[str, bpy.types.Material | None] = {}
+        self._libraries: list[str] = []
+        self._imported: list[bpy.types.Object] = []
+        self._failed: list[Result] = []
+
+        def progress(done: int):
+            if self._cancelled.is_set():
+                raise InterruptedError
+
+            self._read = done
+
+        # the file is split on a thread so the interface keeps redrawing
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="obj_split")
+        self._split: Future[SplitOBJ] = executor.submit(
+            split_obj, path, self._directory, split_groups, progress=progress
+        )
+        executor.shutdown(wait=False)
+
+        wm = context.window_manager
+        wm.progress_begin(0, 100)
+        self._timer = wm.event_timer_add(0.2, window=context.window)
+        wm.modal_handler_add(self)
+
+        return {"RUNNING_MODAL"}
+
+    def status(self, context: Context, text: str, percent: float):
+        context.window_manager.progress_update(percent)
+        context.workspace.status_text_set(text)
+
+    def schedule(self, split: SplitOBJ):
+        self._libraries = split.material_libraries
+        jobs: list[Job] = []
+
+        # the largest shards go first so the last worker is not left with a big one
+        for shard in sorted(split.shards, key=lambda s: s.size, reverse=True):
+            output = os.path.splitext(shard.path)[0] + ".blend"
+            argument = {
+                "name": shard.name,
+                "shard": shard.path,
+                "pools": split.pools,
+                "output": output,
+                **self._settings,
+            }
+            jobs.append(Job(shard.name, "obj_shard.py", argument, output + ".log"))
+
+        print(
+            f"{self._path}: split into {len(jobs)} shards, {split.pools['v'].count} vertices"
         )
+        self._pool = WorkerPool(jobs, self._workers, self._worker_memory)
+
+    def material(self, name: str) -> bpy.types.Material | None:
+        if name not in self._materials:
+            self._materials[name] = create_material(name, self._libraries)
+
+        return self._materials[name]
+
+    def merge(self, context: Context, result: Result):
+        with bpy.data.libraries.load(result.job.argument["output"]) as (source, target):
+            target.objects = source.objects
+
+        for obj in target.objects:
+            mesh = obj.data
+
+            for name in mesh.get("obj_materials", []):
+                mesh.materials.append(self.material(name))
+
+            if "obj_materials" in mesh:
+                del mesh["obj_materials"]
+
+            context.collection.objects.link(obj)
+            self._imported.append(obj)
+
+    def modal(self, context: Context, event: Event):
+        if event.type == "ESC":
+            self.finish(context)
+            self.report(
+                {"WARNING"}, f"Cancelled, {len(self._imported)} objects were imported"
+            )
+            return {"CANCELLED"}
+
+        if event.type != "TIMER":
+            return {"PASS_THROUGH"}
+
+        if self._pool is None:
+            if not self._split.done():
+                percent = self._read / self._size * 100
+                self.status(
+                    context,
+                    f"Splitting {os.path.basename(self._path)}: {percent:.0f}%",
+                    percent * self.SPLIT_SHARE / 100,
+                )
+                return {"RUNNING_MODAL"}
+
+            try:
+                self.schedule(self._split.result())
+            except UnsupportedOBJ as e:
+                print(f"{self._path}: {e}, falling back to the built-in importer")
+                self.finish(context)
+                fallback_import(
+                    self._path,
+                    self._settings["global_scale"],
+                    self._settings["forward_axis"],
+                    self._settings["up_axis"],
+                    self._settings["validate_meshes"],
+                )
+                return {"FINISHED"}
+            except OSError as e:
+                self.finish(context)
+                self.report({"ERROR"}, f"Failed to split {self._path}: {e}")
+                return {"CANCELLED"}
+
+        for result in self._pool.poll():
+            if result.returncode == 0:
+                self.merge(context, result)
+            else:
+                self._failed.append(result)
+
+        pool = self._pool
+        self.status(
+            context,
+            f"Importing {os.path.basename(self._path)}: {pool.completed} of {pool.total} shards, {len(pool.running)} workers",
+            self.SPLIT_SHARE
+            + (100 - self.SPLIT_SHARE) * pool.completed / max(pool.total, 1),
+        )
+
+        if not pool.done():
+            return {"RUNNING_MODAL"}
+
+        self.finish(context)
+
+        for selected in context.selected_objects:
+            selected.select_set(False)
+
+        for obj in self._imported:
+            obj.select_set(True)
+
+        if self._imported:
+            context.view_layer.objects.active = self._imported[-1]
+
+        if self._failed:
+            names = ", ".join(r.job.key for r in self._failed)
+            reason = (
+                f"exceeded {self._worker_memory} MB"
+                if any(r.out_of_memory() for r in self._failed)
+                else "see the console"
+            )
+            self.report(
+                {"WARNING"}, f"{len(self._failed)} shards failed ({reason}): {names}"
+            )
+        else:
+            self.report({"INFO"}, f"Imported {len(self._imported)} objects")
 
         return {"FINISHED"}
 
+    def finish(self, context: Context):
+        self._cancelled.set()
+
+        if self._pool is not None:
+            self._pool.cancel()
+
+        # the split thread stops at its next chunk, wait for it before removing its files
+        wait([self._split])
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+
+    def cancel(self, context: Context):
+        self.finish(context)
+
+
+class ImportOBJParallelWithDefaults(ParallelImport, ImportWithDefaultsBase):
+    bl_idname = "object.import_obj_parallel_with_defaults"
+    bl_label = "Import Wavefront OBJ File (Parallel)"
+
+    def execute(self, context: Context):
+        settings = {
+            "global_scale": 1.0,
+            "forward_axis": "-Z",
+            "up_axis": "Y",
+            "import_normals": True,
+            "validate_meshes": False,
+        }
+
+        with prefetch_obj_dependencies(self, self.filepath()):
+            return self.start(context, self.filepath(), settings)
+
+
+class ImportOBJParallelWithCustomSettings(
+    ParallelImport, ImportsWithCustomSettingsBase
+):
+    bl_idname = "object.import_obj_parallel_with_custom_settings"
+    bl_label = "Import Wavefront OBJ File (Parallel)"
+
+    # properties
+    global_scale: FloatProperty(default=1.0, name="Scale", min=0.0001, max=10000)
+    forward_axis: EnumProperty(
+        name="Forward Axis",
+        default="-Z",
+        items=[
+            ("X", "X", ""),
+            ("Y", "Y", ""),
+            ("Z", "Z", ""),
+            ("-X", "-X", ""),
+            ("-Y", "-Y", ""),
+            ("-Z", "-Z", ""),
+        ],
+    )
+    up_axis: EnumProperty(
+        name="Up Axis",
+        default="Y",
+        items=[
+            ("X", "X", ""),
+            ("Y", "Y", ""),
+            ("Z", "Z", ""),
+            ("-X", "-X", ""),
+            ("-Y", "-Y", ""),
+            ("-Z", "-Z", ""),
+        ],
+    )
+    use_split_groups: BoolProperty(default=False, name="Split by Group")
+    import_normals: BoolProperty(default=True, name="Normals")
+    validate_meshes: BoolProperty(default=False, name="Validate Meshes")
+    workers: IntProperty(
+        default=0,
+        name="Workers",
+        description="Number of background Blender processes, 0 uses the number of cores",
+        min=0,
+        max=64,
+    )
+    worker_memory: IntProperty(
+        default=4096,
+        name="Memory per Worker (MB)",
+        description="Allocations beyond this fail in a worker, which then stops with an error, 0 disables the limit",
+        min=0,
+    )
+
+    # ui properties
+    transform_section: BoolProperty(default=True, name="Transform")
+    options_section: BoolProperty(default=True, name="Options")
+    workers_section: BoolProperty(default=True, name="Workers")
+
+    def draw(self, context: Context):
+        # Transform Section
+        column, state = self.get_expand_column("transform_section")
+
+        if state:
+            column.prop(self, "global_scale")
+            column.prop(self, "forward_axis")
+            column.prop(self, "up_axis")
+
+        # Options Section
+        column, state = self.get_expand_column("options_section")
+
+        if state:
+            column.prop(self, "use_split_groups")
+            column.prop(self, "import_normals")
+            column.prop(self, "validate_meshes")
+
+        # Workers Section
+        column, state = self.get_expand_column("workers_section")
+
+        if state:
+            column.prop(self, "workers")
+            column.prop(self, "worker_memory")
+
+    def execute(self, context: Context):
+        settings = {
+            "global_scale": self.global_scale,
+            "forward_axis": self.forward_axis,
+            "up_axis": self.up_axis,
+            "import_normals": self.import_normals,
+            "validate_meshes": self.validate_meshes,
+        }
+
+        with prefetch_obj_dependencies(self, self.filepath()):
+            return self.start(
+                context,
+                self.filepath(),
+                settings,
+                split_groups=self.use_split_groups,
+                workers=self.workers,
+                worker_memory=self.worker_memory,
+            )
+
 
 class VIEW3D_MT_Space_Import_OBJ(VIEW3D_MT_Space_Import_BASE):
     bl_label = "Import Wavefront OBJ File"
 
+    def draw(self, context: Context | None):
+        super().draw(context)
+        draw_menu_sequence(self.layout)
+
     @staticmethod
     def format():
         return "obj"
@@ -128,6 +469,8 @@ class VIEW3D_FH_Import_OBJ(bpy.types.FileHandler):
 OPERATORS: list[type] = [
     ImportOBJWithDefaults,
     ImportOBJWithCustomSettings,
+    ImportOBJParallelWithDefaults,
+    ImportOBJParallelWithCustomSettings,
     VIEW3D_MT_Space_Import_OBJ,
     VIEW3D_FH_Import_OBJ,
 ]
@@ -0,0 +1,219 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# pyright: reportGeneralTypeIssues=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+# pyright: reportInvalidTypeForm=false
+
+import os
+import time
+import bpy
+import numpy as np
+
+from bpy.props import (
+    BoolProperty,  # pyright: ignore[reportUnknownVariableType]
+    EnumProperty,  # pyright: ignore[reportUnknownVariableType]
+    FloatProperty,  # pyright: ignore[reportUnknownVariableType]
+)
+from bpy.types import Context
+
+from ..readers.mtl import read_color_and_texture
+from ..readers.obj import UnsupportedOBJ, read_obj
+from ..utils.mesh import axis_matrix, create_mesh, link_object, transform_vertices
+from .super import (
+    ImportWithDefaultsBase,
+    ImportsWithCustomSettingsBase,
+)
+
+
+def create_material(name: str, libraries: list[str]) -> bpy.types.Material | None:
+    for library in libraries:
+        if not os.path.exists(library):
+            continue
+
+        color, texture = read_color_and_texture(library, name)
+
+        if color is None and texture is None:
+            continue
+
+        material = bpy.data.materials.new(name)
+        material.use_nodes = True
+        bsdf = material.node_tree.nodes.get("Principled BSDF")
+
+        if bsdf is None:
+            return material
+
+        if color is not None:
+            bsdf.inputs["Base Color"].default_value = (*color, 1.0)
+
+        if texture is not None and os.path.exists(texture):
+            node = material.node_tree.nodes.new("ShaderNodeTexImage")
+            node.image = bpy.data.images.load(texture, check_existing=True)
+            node.location = (bsdf.location.x - 400, bsdf.location.y)
+            material.node_tree.links.new(
+                node.outputs["Color"], bsdf.inputs["Base Color"]
+            )
+
+        return material
+
+    return None
+
+
+def fallback_import(
+    path: str,
+    global_scale: float,
+    forward_axis: str,
+    up_axis: str,
+    validate_meshes: bool,
+):
+    if bpy.app.version >= (3, 4, 0):
+        bpy.ops.wm.obj_import(
+            filepath=path,
+            global_scale=global_scale,
+            forward_axis=forward_axis,
+            up_axis=up_axis,
+            validate_meshes=validate_meshes,
+        )
+    else:
+        bpy.ops.import_scene.obj(
+            filepath=path, axis_forward=forward_axis, axis_up=up_axis
+        )
+
+
+def import_obj_fast(
+    context: Context,
+    path: str,
+    global_scale: float = 1.0,
+    forward_axis: str = "-Z",
+    up_axis: str = "Y",
+    import_normals: bool = True,
+    validate_meshes: bool = False,
+) -> bpy.types.Object | None:
+    started = time.perf_counter()
+
+    try:
+        data = read_obj(path)
+    except UnsupportedOBJ as e:
+        print(f"{path}: {e}, falling back to the built-in importer")
+        fallback_import(path, global_scale, forward_axis, up_axis, validate_meshes)
+        return None
+
+    matrix = axis_matrix(forward_axis, up_axis, global_scale)
+    vertices = transform_vertices(data.vertices, matrix)
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    mesh = create_mesh(name, vertices, data.corner_verts, data.face_starts)
+
+    if data.uvs is not None:
+        uv_layer = mesh.uv_layers.new(name="UVMap")
+        uv_layer.data.foreach_set("uv", np.ascontiguousarray(data.uvs).ravel())
+
+    if import_normals and data.normals is not None:
+        normals = transform_vertices(data.normals, matrix / np.float32(global_scale))
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
+        mesh.normals_split_custom_set(normals)
+
+    if data.material is not None:
+        material = create_material(data.material, data.material_libraries)
+
+        if material is not None:
+            mesh.materials.append(material)
+
+    if validate_meshes:
+        mesh.validate()
+
+    obj = link_object(context, name, mesh)
+
+    print(
+        f"{path}: {len(data.face_starts)} faces, {len(vertices)} vertices in {time.perf_counter() - started:.2f}s"
+    )
+
+    return obj
+
+
+class ImportOBJFastWithDefaults(ImportWithDefaultsBase):
+    bl_idname = "object.import_obj_fast_with_defaults"
+    bl_label = "Import Wavefront OBJ File (Fast)"
+
+    def execute(self, context: Context):
+        with self.staged_import(context):
+            import_obj_fast(context, self.filepath())
+
+        return {"FINISHED"}
+
+
+class ImportOBJFastWithCustomSettings(ImportsWithCustomSettingsBase):
+    bl_idname = "object.import_obj_fast_with_custom_settings"
+    bl_label = "Import Wavefront OBJ File (Fast)"
+
+    # properties
+    global_scale: FloatProperty(default=1.0, name="Scale", min=0.0001, max=10000)
+    forward_axis: EnumProperty(
+        name="Forward Axis",
+        default="-Z",
+        items=[
+            ("X", "X", ""),
+            ("Y", "Y", ""),
+            ("Z", "Z", ""),
+            ("-X", "-X", ""),
+            ("-Y", "-Y", ""),
+            ("-Z", "-Z", ""),
+        ],
+    )
+    up_axis: EnumProperty(
+        name="Up Axis",
+        default="Y",
+        items=[
+            ("X", "X", ""),
+            ("Y", "Y", ""),
+            ("Z", "Z", ""),
+            ("-X", "-X", ""),
+            ("-Y", "-Y", ""),
+            ("-Z", "-Z", ""),
+        ],
+    )
+    import_normals: BoolProperty(default=True, name="Normals")
+    validate_meshes: BoolProperty(default=False, name="Validate Meshes")
+
+    # ui properties
+    transform_section: BoolProperty(default=True, name="Transform")
+    options_section: BoolProperty(default=True, name="Options")
+
+    def draw(self, context: Context):
+        # Transform Section
+        column, state = self.get_expand_column("transform_section")
+
+        if state:
+            column.prop(self, "global_scale")
+            column.prop(self, "forward_axis")
+            column.prop(self, "up_axis")
+
+        # Options Section
+        column, state = self.get_expand_column("options_section")
+
+        if state:
+            column.prop(self, "import_normals")
+            column.prop(self, "validate_meshes")
+
+    def execute(self, context: Context):
+        with self.staged_import(context):
+            import_obj_fast(
+                context,
+                self.filepath(),
+                global_scale=self.global_scale,
+                forward_axis=self.forward_axis,
+                up_axis=self.up_axis,
+                import_normals=self.import_normals,
+                validate_meshes=self.validate_meshes,
+            )
+
+        return {"FINISHED"}
+
+
+OPERATORS: list[type] = [
+    ImportOBJFastWithDefaults,
+    ImportOBJFastWithCustomSettings,
+]
@@ -13,6 +13,7 @@ import bpy
 from bpy.props import BoolProperty, EnumProperty, FloatProperty  # type: ignore
 from bpy.types import Context
 
+from ..utils.prefetch import prefetch_obj_dependencies
 from .super import (
     ImportWithDefaultsBase,
     ImportsWithCustomSettingsBase,
@@ -25,7 +26,10 @@ class ImportOBJLegacyWithDefaults(ImportWithDefaultsBase):
     bl_label = "Import Wavefront OBJ File"
 
     def execute(self, context: Context):
-        bpy.ops.import_scene.obj(filepath=self.filepath())
+        with prefetch_obj_dependencies(self, self.filepath()):
+            with self.staged_import(context):
+                bpy.ops.import_scene.obj(filepath=self.filepath())
+
         return {"FINISHED"}
 
 
@@ -112,19 +116,21 @@ class ImportOBJLegacyWithCustomSettings(ImportsWithCustomSettingsBase):
                 column.prop(self, "use_groups_as_vgroups")
 
     def execute(self, context: Context):
-        bpy.ops.import_scene.obj(
-            filepath=self.filepath(),
-            use_edges=self.use_edges,
-            use_smooth_groups=self.use_smooth_groups,
-            use_split_objects=self.use_split_objects,
-            use_split_groups=self.use_split_groups,
-            use_groups_as_vgroups=self.use_groups_as_vgroups,
-            use_image_search=self.use_image_search,
-            split_mode=self.split_mode,
-            global_clamp_size=self.global_clamp_size,
-            axis_forward=self.axis_forward,
-            axis_up=self.axis_up,
-        )
+        with prefetch_obj_dependencies(self, self.filepath()):
+            with self.staged_import(context):
+                bpy.ops.import_scene.obj(
+                    filepath=self.filepath(),
+                    use_edges=self.use_edges,
+                    use_smooth_groups=self.use_smooth_groups,
+                    use_split_objects=self.use_split_objects,
+                    use_split_groups=self.use_split_groups,
+                    use_groups_as_vgroups=self.use_groups_as_vgroups,
+                    use_image_search=self.use_image_search,
+                    split_mode=self.split_mode,
+                    global_clamp_size=self.global_clamp_size,
+                    axis_forward=self.axis_forward,
+                    axis_up=self.axis_up,
+                )
 
         return {"FINISHED"}
 
@@ -8,6 +8,8 @@
 # pyright: reportUnknownMemberType=false
 # pyright: reportInvalidTypeForm=false
 
+import os
+import time
 from typing import Set
 import bpy
 
@@ -15,9 +17,13 @@ from bpy.props import (
     BoolProperty,  # pyright: ignore[reportUnknownVariableType]
     EnumProperty,  # pyright: ignore[reportUnknownVariableType]
     FloatProperty,  # pyright: ignore[reportUnknownVariableType]
+    IntProperty,  # pyright: ignore[reportUnknownVariableType]
 )
 from bpy.types import Context
 
+from ..readers import ply, points
+from ..utils.mesh import axis_matrix, create_mesh, link_object
+from .sequence import draw_menu_sequence
 from .super import (
     ImportWithDefaultsBase,
     ImportsWithCustomSettingsBase,
@@ -25,18 +31,115 @@ from .super import (
 )
 
 
+def is_point_cloud(header: ply.PLYHeader) -> bool:
+    vertex = header.element("vertex")
+
+    if vertex is None or header.count("face") > 0:
+        return False
+
+    return ply.element_dtype(header, vertex) is not None
+
+
+def import_ply_points(
+    context: Context,
+    path: str,
+    header: ply.PLYHeader,
+    global_scale: float = 1.0,
+    use_scene_unit: bool = False,
+    forward_axis: str = "Y",
+    up_axis: str = "Z",
+    import_colors: str = "SRGB",
+    reduction: str = "NONE",
+    stride: int = 10,
+    ratio: float = 0.1,
+    seed: int = 0,
+    voxel_size: float = 0.05,
+) -> bpy.types.Object:
+    started = time.perf_counter()
+
+    if use_scene_unit:
+        global_scale /= context.scene.unit_settings.scale_length
+
+    fields = ["x", "y", "z"]
+
+    if import_colors != "NONE":
+        fields.extend(["red", "green", "blue", "alpha"])
+
+    vertices = ply.map_vertices(path, header, fields)
+    total = len(vertices)
+
+    # select on the mapped file, only the kept points are ever copied into memory
+    if reduction == "STRIDE":
+        vertices = vertices[points.stride_indices(total, stride)]
+    elif reduction == "RANDOM":
+        vertices = vertices[points.random_indices(total, ratio, seed)]
+    elif reduction == "VOXEL":
+        # voxel size is given in scene units, the grid is built in file units
+        vertices = vertices[points.voxel_indices(vertices, voxel_size / global_scale)]
+
+    matrix = axis_matrix(forward_axis, up_axis, global_scale)
+
+    # point clouds can't be resized from Python, so the points become a face-less mesh
+    name = os.path.splitext(os.path.basename(path))[0]
+    mesh = create_mesh(name, ply.positions(vertices, matrix))
+
+    rgba = ply.colors(vertices) if import_colors != "NONE" else None
+
+    if rgba is not None:
+        if import_colors == "SRGB":
+            attribute = mesh.color_attributes.new("Col", "BYTE_COLOR", "POINT")
+            attribute.data.foreach_set("color_srgb", rgba.ravel())
+        else:
+            attribute = mesh.color_attributes.new("Col", "FLOAT_COLOR", "POINT")
+            attribute.data.foreach_set("color", rgba.ravel())
+
+        mesh.color_attributes.active_color = attribute
+        del rgba
+
+    obj = link_object(context, name, mesh)
+
+    print(
+        f"{path}: {len(vertices)} of {total} points in {time.perf_counter() - started:.2f}s"
+    )
+
+    return obj
+
+
+def read_header_or_report(
+    operator: bpy.types.Operator, path: str
+) -> ply.PLYHeader | None:
+    # None leaves the file to the built-in importer, which reports its own errors
+    try:
+        return ply.read_header(path)
+    except ValueError as e:
+        operator.report({"WARNING"}, f"{e}, using the built-in importer")
+        return None
+
+
 class ImportPLYWithDefaults(ImportWithDefaultsBase):
     bl_idname = "object.import_ply_with_defaults"
     bl_label = "Import PLY File"
 
     def execute(self, context: Context) -> Set[str] | Set[int]:
-        bpy.ops.wm.ply_import(filepath=self.filepath())
+        header = read_header_or_report(self, self.filepath())
+
+        with self.staged_import(context):
+            if header is not None and is_point_cloud(header):
+                try:
+                    import_ply_points(context, self.filepath(), header)
+                except ValueError as e:
+                    self.report({"ERROR"}, str(e))
+                    return {"CANCELLED"}
+            else:
+                bpy.ops.wm.ply_import(filepath=self.filepath())
+
         return {"FINISHED"}
 
 
 class ImportPLYWithCustomSettings(ImportsWithCustomSettingsBase):
     bl_idname = "object.import_ply_with_custom_settings"
     bl_label = "Import PLY File"
+    transform_properties = ("global_scale", "forward_axis", "up_axis")
 
     # Properties based on Blender v4.0.0 (ordered by parameters on documents)
     global_scale: FloatProperty(default=1.0, min=1e-06, max=1e06, name="Scale")
@@ -71,9 +174,39 @@ class ImportPLYWithCustomSettings(ImportsWithCustomSettingsBase):
         name="Import Vertex Colors",
         items=[("NONE", "None", ""), ("SRGB", "sRGB", ""), ("LINEAR", "Linear", "")],
     )
+    import_mode: EnumProperty(
+        default="AUTO",
+        name="Import As",
+        items=[
+            ("AUTO", "Auto", "Point cloud when the file has no faces, mesh otherwise"),
+            ("MESH", "Mesh", "Import with the built-in PLY importer"),
+            (
+                "POINTS",
+                "Point Cloud",
+                "Memory-map the vertices only, faces are skipped",
+            ),
+        ],
+    )
+    reduction: EnumProperty(
+        default="NONE",
+        name="Point Reduction",
+        items=[
+            ("NONE", "None", "Keep every point"),
+            ("STRIDE", "Stride", "Keep every n-th point"),
+            ("RANDOM", "Random", "Keep a random subset of the points"),
+            ("VOXEL", "Voxel Grid", "Keep one point per voxel"),
+        ],
+    )
+    stride: IntProperty(default=10, min=1, max=1000000, name="Stride")
+    ratio: FloatProperty(default=0.1, min=0.0, max=1.0, subtype="FACTOR", name="Ratio")
+    seed: IntProperty(default=0, min=0, name="Seed")
+    voxel_size: FloatProperty(
+        default=0.05, min=1e-06, max=1e06, subtype="DISTANCE", name="Voxel Size"
+    )
 
     def draw(self, context: Context):
         column = self.get_column()
+        column.prop(self, "import_mode")
         column.prop(self, "global_scale")
         column.prop(self, "use_scene_unit")
         column.prop(self, "forward_axis")
@@ -81,16 +214,68 @@ class ImportPLYWithCustomSettings(ImportsWithCustomSettingsBase):
         column.prop(self, "merge_verts")
         column.prop(self, "import_colors")
 
+        column = self.get_column()
+        column.enabled = self.import_mode != "MESH"
+        column.prop(self, "reduction")
+
+        if self.reduction == "STRIDE":
+            column.prop(self, "stride")
+        elif self.reduction == "RANDOM":
+            column.prop(self, "ratio")
+            column.prop(self, "seed")
+        elif self.reduction == "VOXEL":
+            column.prop(self, "voxel_size")
+
+        self.draw_lean_section()
+
     def execute(self, context: Context) -> Set[str] | Set[int]:
-        bpy.ops.wm.ply_import(
-            filepath=self.filepath(),
-            global_scale=self.global_scale,
-            use_scene_unit=self.use_scene_unit,
-            forward_axis=self.forward_axis,
-            up_axis=self.up_axis,
-            merge_verts=self.merge_verts,
-            import_colors=self.import_colors,
-        )
+        if self.defer_lean_import(context):
+            return {"CANCELLED"}
+
+        if self.reuse_previous_import(context):
+            return {"FINISHED"}
+
+        header = read_header_or_report(self, self.filepath())
+
+        with self.remember_import(context), self.staged_import(context):
+            if header is not None and (
+                self.import_mode == "POINTS"
+                or (self.import_mode == "AUTO" and is_point_cloud(header))
+            ):
+                try:
+                    obj = import_ply_points(
+                        context,
+                        self.filepath(),
+                        header,
+                        global_scale=self.global_scale,
+                        use_scene_unit=self.use_scene_unit,
+                        forward_axis=self.forward_axis,
+                        up_axis=self.up_axis,
+                        import_colors=self.import_colors,
+                        reduction=self.reduction,
+                        stride=self.stride,
+                        ratio=self.ratio,
+                        seed=self.seed,
+                        voxel_size=self.voxel_size,
+                    )
+                except ValueError as e:
+                    self.report({"ERROR"}, str(e))
+                    return {"CANCELLED"}
+
+                self.report(
+                    {"INFO"},
+                    f"Imported {len(obj.data.vertices)} of {header.count('vertex')} points",
+                )
+            else:
+                bpy.ops.wm.ply_import(
+                    filepath=self.filepath(),
+                    global_scale=self.global_scale,
+                    use_scene_unit=self.use_scene_unit,
+                    forward_axis=self.forward_axis,
+                    up_axis=self.up_axis,
+                    merge_verts=self.merge_verts,
+                    import_colors=self.import_colors,
+                )
 
         return {"FINISHED"}
 
@@ -98,6 +283,10 @@ class ImportPLYWithCustomSettings(ImportsWithCustomSettingsBase):
 class VIEW3D_MT_Space_Import_PLY(VIEW3D_MT_Space_Import_BASE):
     bl_label = "Import Polygon File Format File"
 
+    def draw(self, context: Context | None):
+        super().draw(context)
+        draw_menu_sequence(self.layout)
+
     @staticmethod
     def format():
         return "ply"
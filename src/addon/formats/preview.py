@@ -0,0 +1,256 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# pyright: reportGeneralTypeIssues=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+# pyright: reportInvalidTypeForm=false
+
+import os
+import time
+import bpy
+
+from bpy.props import StringProperty  # type: ignore
+from bpy.types import Context, Operator
+from mathutils import Matrix
+
+from ..readers import ply
+from ..utils import staging
+from ..utils.staging import import_origin
+from .obj_fast import import_obj_fast
+from .ply import import_ply_points, is_point_cloud
+from .stl_fast import import_stl_fast
+from .super import PREVIEW_PATH, ImportWithDefaultsBase, preview_importers
+
+PREVIEW_FORMAT = "drag_and_drop_preview_format"
+PREVIEW_MATRIX = "drag_and_drop_preview_matrix"
+
+# share of the points kept when previewing a point cloud
+POINT_RATIO = 0.1
+
+
+def preview_obj(context: Context, path: str):
+    import_obj_fast(context, path, import_normals=False)
+
+
+def preview_stl(context: Context, path: str):
+    import_stl_fast(context, path)
+
+
+def preview_ply(context: Context, path: str):
+    try:
+        header = ply.read_header(path)
+
+        if is_point_cloud(header):
+            import_ply_points(
+                context,
+                path,
+                header,
+                import_colors="NONE",
+                reduction="RANDOM",
+                ratio=POINT_RATIO,
+            )
+            return
+    except ValueError:
+        pass
+
+    bpy.ops.wm.ply_import(filepath=path, import_colors="NONE")
+
+
+def preview_fbx(context: Context, path: str):
+    bpy.ops.import_scene.fbx(
+        filepath=path,
+        use_anim=False,
+        use_custom_normals=False,
+        use_image_search=False,
+        use_custom_props=False,
+        use_subsurf=False,
+    )
+
+
+def preview_glb(context: Context, path: str):
+    bpy.ops.import_scene.gltf(
+        filepath=path, import_pack_images=False, import_shading="FLAT"
+    )
+
+
+def preview_usd(context: Context, path: str):
+    bpy.ops.wm.usd_import(
+        filepath=path,
+        set_frame_range=False,
+        import_materials=False,
+        import_skeletons=False,
+        import_blendshapes=False,
+        import_subdiv=False,
+        import_guide=False,
+        import_proxy=True,
+        import_render=False,
+        import_usd_preview=False,
+        import_textures_mode="IMPORT_NONE",
+        read_mesh_uvs=False,
+        read_mesh_colors=False,
+        read_mesh_attributes=False,
+    )
+
+
+def preview_abc(context: Context, path: str):
+    bpy.ops.wm.alembic_import(filepath=path, set_frame_range=False)
+
+
+def preview_dae(context: Context, path: str):
+    bpy.ops.wm.collada_import(filepath=path, custom_normals=False)
+
+
+def preview_pmx(context: Context, path: str):
+    bpy.ops.mmd_tools.import_model(
+        filepath=path,
+        types={"MESH"},
+        clean_model=False,
+        remove_doubles=False,
+        use_mipmap=False,
+    )
+
+
+def preview_vrm(context: Context, path: str):
+    bpy.ops.import_scene.vrm(
+        filepath=path,
+        extract_textures_into_folder=False,
+        set_shading_type_to_material_on_import=False,
+        set_view_transform_to_standard_on_import=False,
+    )
+
+
+preview_importers.update(
+    {
+        "obj": preview_obj,
+        "stl": preview_stl,
+        "ply": preview_ply,
+        "fbx": preview_fbx,
+        "glb": preview_glb,
+        "usd": preview_usd,
+        "abc": preview_abc,
+        "dae": preview_dae,
+        "pmx": preview_pmx,
+        "vrm": preview_vrm,
+    }
+)
+
+
+def roots(objects: list[bpy.types.Object]) -> list[bpy.types.Object]:
+    return [o for o in objects if o.parent is None or o.parent not in objects]
+
+
+def find_preview(path: str) -> list[bpy.types.Object]:
+    return [o for o in bpy.data.objects if o.get(PREVIEW_PATH) == path]
+
+
+def remove_objects(objects: list[bpy.types.Object]):
+    data = {o.data for o in objects if o.data is not None}
+    bpy.data.batch_remove(objects)
+
+    # meshes and armatures of the preview that nothing else uses
+    bpy.data.batch_remove([d for d in data if d.users == 0])
+
+
+class ImportPreview(ImportWithDefaultsBase):
+    bl_idname = "object.import_preview"
+    bl_label = "Import Preview"
+    bl_options = {"REGISTER", "UNDO"}
+
+    format: StringProperty()
+
+    def execute(self, context: Context):
+        path = self.filepath()
+        importer = preview_importers.get(self.format)
+
+        if importer is None:
+            return {"CANCELLED"}
+
+        before = set(bpy.data.objects)
+        started = time.perf_counter()
+        with self.staged_import(context):
+            importer(context, path)
+
+        elapsed = time.perf_counter() - started
+
+        created = [o for o in bpy.data.objects if o not in before]
+
+        for obj in created:
+            obj[PREVIEW_PATH] = path
+            obj[PREVIEW_FORMAT] = self.format
+
+        # the transform at import time, so promoting keeps where the user moved it, stored
+        # relative to the cursor the file was imported at; matrix_world is not evaluated
+        # after the staging scene is relinked, roots have no parent so the basis is used
+        origin = import_origin(context).inverted()
+
+        for obj in roots(created):
+            obj[PREVIEW_MATRIX] = [v for row in origin @ obj.matrix_basis for v in row]
+
+        self.report(
+            {"INFO"},
+            f"Preview of {os.path.basename(path)} imported in {elapsed:.2f}s, promote it for a full import",
+        )
+
+        return {"FINISHED"}
+
+
+class PromotePreview(Operator):
+    bl_idname = "object.promote_preview_import"
+    bl_label = "Promote Preview to Full Import"
+    bl_options = {"REGISTER", "UNDO"}
+
+    filename: StringProperty()
+
+    def execute(self, context: Context):
+        path = self.filename
+        previews = find_preview(path)
+
+        if not previews:
+            self.report({"WARNING"}, f"No preview of {os.path.basename(path)} found")
+            return {"CANCELLED"}
+
+        format = previews[0][PREVIEW_FORMAT]
+        moved = [o for o in roots(previews) if PREVIEW_MATRIX in o]
+        deltas = {o.name: self.moved_by(context, o) for o in moved}
+        fallback = deltas[moved[0].name]
+        collection = (
+            moved[0].users_collection[0]
+            if moved[0].users_collection
+            else context.collection
+        )
+
+        remove_objects(previews)
+
+        before = set(bpy.data.objects)
+
+        # the full import lands next to the preview, the staging scene is linked into
+        # the collection it was in
+        with context.temp_override(collection=collection):
+            with staging.staged(context):
+                getattr(bpy.ops.object, f"import_{format}_with_defaults")(filename=path)
+
+        created = [o for o in bpy.data.objects if o not in before]
+
+        # roots are matched to the preview by name, the importers name them alike;
+        # matrix_world is not evaluated yet, roots have no parent so the basis is enough
+        for obj in roots(created):
+            obj.matrix_basis = deltas.get(obj.name, fallback) @ obj.matrix_basis
+
+        return {"FINISHED"}
+
+    def moved_by(self, context: Context, root: bpy.types.Object) -> Matrix:
+        stored = list(root[PREVIEW_MATRIX])
+        imported = import_origin(context) @ Matrix(
+            [stored[i : i + 4] for i in range(0, 16, 4)]
+        )
+
+        return root.matrix_world @ imported.inverted()
+
+
+OPERATORS: list[type] = [
+    ImportPreview,
+    PromotePreview,
+]
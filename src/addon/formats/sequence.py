@@ -0,0 +1,455 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# pyright: reportGeneralTypeIssues=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+# pyright: reportInvalidTypeForm=false
+
+import collections
+import os
+import time
+import bpy
+import numpy as np
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from bpy.app.handlers import persistent
+from bpy.props import (
+    BoolProperty,  # pyright: ignore[reportUnknownVariableType]
+    EnumProperty,  # pyright: ignore[reportUnknownVariableType]
+    FloatProperty,  # pyright: ignore[reportUnknownVariableType]
+    IntProperty,  # pyright: ignore[reportUnknownVariableType]
+)
+from bpy.types import Context, Event
+
+from ..readers.obj import UnsupportedOBJ
+from ..readers.sequence import Frame, Sequence, find_sequence, read_frame
+from ..utils.mesh import axis_matrix, link_object, write_geometry
+from .super import (
+    ImportWithDefaultsBase,
+    ImportsWithCustomSettingsBase,
+    VIEW3D_MT_Space_Import_BASE,
+)
+
+# stored on the object so that playback survives save and reload
+SEQUENCE_PATH = "drag_and_drop_sequence"
+SEQUENCE_START = "drag_and_drop_sequence_start"
+SEQUENCE_MATRIX = "drag_and_drop_sequence_matrix"
+SEQUENCE_BUDGET = "drag_and_drop_sequence_budget"
+SEQUENCE_PREFETCH = "drag_and_drop_sequence_prefetch"
+
+WORKERS = 4
+
+# what the readers raise for frames they cannot decode
+FRAME_ERRORS = (OSError, ValueError, KeyError, UnsupportedOBJ)
+
+# the axes each format's own importer uses by default
+FORMAT_AXES = {
+    ".obj": ("-Z", "Y"),
+    ".stl": ("Y", "Z"),
+    ".ply": ("Y", "Z"),
+}
+
+AXES = [
+    ("X", "X", ""),
+    ("Y", "Y", ""),
+    ("Z", "Z", ""),
+    ("-X", "-X", ""),
+    ("-Y", "-Y", ""),
+    ("-Z", "-Z", ""),
+]
+
+# path -> (directory mtime, sequence), menus redraw often and a directory can hold
+# thousands of frames
+sequences: dict[str, tuple[float, Sequence | None]] = {}
+
+# object name -> player, rebuilt after reload from the custom properties
+players: dict[str, "SequencePlayer"] = {}
+
+executor: ThreadPoolExecutor | None = None
+
+
+def inspect_sequence(path: str) -> Sequence | None:
+    try:
+        key = os.path.getmtime(os.path.dirname(os.path.abspath(path)))
+    except OSError:
+        return None
+
+    cached = sequences.get(path)
+
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    try:
+        sequence = find_sequence(path)
+    except OSError as e:
+        print(f"{path}: {e}, not imported as a sequence")
+        sequence = None
+
+    sequences[path] = (key, sequence)
+    return sequence
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global executor
+
+    if executor is None:
+        executor = ThreadPoolExecutor(
+            max_workers=WORKERS, thread_name_prefix="sequence"
+        )
+
+    return executor
+
+
+def same_topology(a: Frame, b: Frame) -> bool:
+    return (
+        len(a.vertices) == len(b.vertices)
+        and np.array_equal(a.face_starts, b.face_starts)
+        and np.array_equal(a.corner_verts, b.corner_verts)
+    )
+
+
+class SequencePlayer:
+    def __init__(
+        self, sequence: Sequence, matrix: np.ndarray, budget: int, prefetch: int
+    ):
+        self.sequence = sequence
+        self.matrix = matrix
+        self.budget = budget
+        self.prefetch = prefetch
+
+        # decoded frames, least recently shown first
+        self.frames: collections.OrderedDict[int, Frame] = collections.OrderedDict()
+        self.size = 0
+        self.pending: dict[int, Future[Frame]] = {}
+
+        self.shown: Frame | None = None
+        self.shown_index = -1
+
+    def settings(self) -> tuple[list[float], int, int]:
+        return [float(v) for v in self.matrix.ravel()], self.budget, self.prefetch
+
+    def store(self, index: int, frame: Frame):
+        self.frames[index] = frame
+        self.size += frame.size()
+
+        # the newest frame stays even when it alone is over the budget
+        while self.size > self.budget and len(self.frames) > 1:
+            _, evicted = self.frames.popitem(last=False)
+            self.size -= evicted.size()
+
+    def collect(self):
+        # only the main thread touches the cache, workers just return arrays
+        for index, future in list(self.pending.items()):
+            if not future.done():
+                continue
+
+            del self.pending[index]
+
+            try:
+                self.store(index, future.result())
+            except FRAME_ERRORS as e:
+                print(f"{self.sequence.path(index)}: {e}, frame skipped")
+
+    def frame(self, index: int) -> Frame | None:
+        self.collect()
+
+        if index in self.frames:
+            self.frames.move_to_end(index)
+            return self.frames[index]
+
+        future = self.pending.pop(index, None)
+
+        try:
+            if future is not None:
+                frame = future.result()
+            else:
+                frame = read_frame(self.sequence.path(index), self.matrix)
+        except FRAME_ERRORS as e:
+            print(f"{self.sequence.path(index)}: {e}, frame skipped")
+            return None
+
+        self.store(index, frame)
+        return frame
+
+    def schedule(self, index: int, step: int):
+        # read ahead in the direction of playback, scrubbing backwards reads backwards
+        pool = get_executor()
+        count = len(self.sequence.names)
+
+        for ahead in range(1, self.prefetch + 1):
+            upcoming = index + ahead * step
+
+            if not 0 <= upcoming < count:
+                break
+
+            if upcoming in self.frames or upcoming in self.pending:
+                continue
+
+            self.pending[upcoming] = pool.submit(
+                read_frame, self.sequence.path(upcoming), self.matrix
+            )
+
+        # requests that fell behind the playhead are not worth the decoding
+        for pending in list(self.pending):
+            if (pending - index) * step < 0 and self.pending[pending].cancel():
+                del self.pending[pending]
+
+    def show(self, mesh: bpy.types.Mesh, offset: int):
+        index = self.sequence.index(offset)
+
+        if index == self.shown_index:
+            return
+
+        step = -1 if index < self.shown_index else 1
+        frame = self.frame(index)
+        self.schedule(index, step)
+
+        if frame is None:
+            return
+
+        # one mesh is rewritten in place, only the decoded arrays are cached
+        if self.shown is not None and same_topology(self.shown, frame):
+            mesh.vertices.foreach_set("co", frame.vertices.ravel())
+            mesh.update()
+        else:
+            mesh.clear_geometry()
+            write_geometry(mesh, frame.vertices, frame.corner_verts, frame.face_starts)
+
+        self.shown = frame
+        self.shown_index = index
+
+    def cancel(self):
+        for future in self.pending.values():
+            future.cancel()
+
+        self.pending.clear()
+
+
+def find_player(obj: bpy.types.Object) -> SequencePlayer | None:
+    matrix = np.array(obj[SEQUENCE_MATRIX], dtype=np.float32).reshape(3, 3)
+    budget = int(obj.get(SEQUENCE_BUDGET, 1024)) * 1024 * 1024
+    prefetch = int(obj.get(SEQUENCE_PREFETCH, 8))
+    player = players.get(obj.name)
+
+    if player is not None and player.sequence.path(0) == obj[SEQUENCE_PATH]:
+        if player.settings() == ([float(v) for v in matrix.ravel()], budget, prefetch):
+            return player
+
+        player.cancel()
+
+    sequence = inspect_sequence(obj[SEQUENCE_PATH])
+
+    if sequence is None:
+        return None
+
+    players[obj.name] = SequencePlayer(sequence, matrix, budget, prefetch)
+    return players[obj.name]
+
+
+@persistent
+def update_mesh_sequences(scene: bpy.types.Scene, *args: object):
+    for name in [n for n in players if n not in bpy.data.objects]:
+        players.pop(name).cancel()
+
+    for obj in scene.objects:
+        if SEQUENCE_PATH not in obj or obj.type != "MESH":
+            continue
+
+        player = find_player(obj)
+
+        if player is not None:
+            player.show(obj.data, scene.frame_current - obj[SEQUENCE_START])
+
+
+@persistent
+def reset_mesh_sequences(*args: object):
+    # objects of the loaded file may share names with the ones before it
+    for player in players.values():
+        player.cancel()
+
+    players.clear()
+
+
+def import_sequence(
+    context: Context,
+    path: str,
+    global_scale: float = 1.0,
+    forward_axis: str | None = None,
+    up_axis: str | None = None,
+    cache_budget: int = 1024,
+    prefetch_frames: int = 8,
+    set_frame_range: bool = True,
+) -> bpy.types.Object | None:
+    sequence = inspect_sequence(path)
+
+    if sequence is None:
+        return None
+
+    started = time.perf_counter()
+    scene = context.scene
+    forward, up = FORMAT_AXES[sequence.extension.lower()]
+    matrix = axis_matrix(forward_axis or forward, up_axis or up, global_scale)
+
+    # a sequence the readers reject fails here instead of playing back as an empty
+    # object, the decoded frame is kept for the first update
+    first = read_frame(sequence.path(0), matrix)
+
+    name = sequence.prefix.rstrip("_.- ") or os.path.splitext(sequence.names[0])[0]
+    obj = link_object(context, name, bpy.data.meshes.new(name))
+
+    obj[SEQUENCE_PATH] = sequence.path(0)
+    obj[SEQUENCE_START] = scene.frame_start
+    obj[SEQUENCE_MATRIX] = [float(v) for v in matrix.ravel()]
+    obj[SEQUENCE_BUDGET] = cache_budget
+    obj[SEQUENCE_PREFETCH] = prefetch_frames
+
+    player = find_player(obj)
+
+    if player is not None:
+        player.store(0, first)
+
+    if set_frame_range:
+        scene.frame_end = scene.frame_start + sequence.numbers[-1] - sequence.numbers[0]
+
+    print(
+        f"{path}: sequence of {len(sequence.names)} frames ({sequence.numbers[0]} to {sequence.numbers[-1]}) in {time.perf_counter() - started:.2f}s"
+    )
+
+    return obj
+
+
+class ImportSequenceWithDefaults(ImportWithDefaultsBase):
+    bl_idname = "object.import_sequence_with_defaults"
+    bl_label = "Import Mesh Sequence"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context: Context):
+        try:
+            with self.staged_import(context):
+                obj = import_sequence(context, self.filepath())
+        except FRAME_ERRORS as e:
+            self.report({"ERROR"}, f"{self.filepath()}: {e}")
+            return {"CANCELLED"}
+
+        if obj is None:
+            self.report({"ERROR"}, f"{self.filepath()} is not part of a sequence")
+            return {"CANCELLED"}
+
+        # the first frame, the staging scene is not at the current frame
+        update_mesh_sequences(context.scene)
+
+        return {"FINISHED"}
+
+
+class ImportSequenceWithCustomSettings(ImportsWithCustomSettingsBase):
+    bl_idname = "object.import_sequence_with_custom_settings"
+    bl_label = "Import Mesh Sequence"
+
+    global_scale: FloatProperty(default=1.0, name="Scale", min=0.0001, max=10000)
+    use_format_axes: BoolProperty(default=True, name="Format Default Axes")
+    forward_axis: EnumProperty(name="Forward Axis", default="Y", items=AXES)
+    up_axis: EnumProperty(name="Up Axis", default="Z", items=AXES)
+    set_frame_range: BoolProperty(default=True, name="Set Frame Range")
+    cache_budget: IntProperty(default=1024, min=16, max=65536, name="Cache Budget (MB)")
+    prefetch_frames: IntProperty(default=8, min=0, max=256, name="Prefetch Frames")
+
+    transform_section: BoolProperty(default=True, name="Transform")
+    playback_section: BoolProperty(default=True, name="Playback")
+
+    def invoke(self, context: Context, event: Event):
+        if inspect_sequence(self.filepath()) is None:
+            self.report({"ERROR"}, f"{self.filepath()} is not part of a sequence")
+            return {"CANCELLED"}
+
+        return super().invoke(context, event)
+
+    def draw(self, context: Context):
+        sequence = inspect_sequence(self.filepath())
+
+        if sequence is not None:
+            box = self.layout.box()
+            box.label(
+                text=f"{sequence.prefix}#{sequence.extension}: {len(sequence.names)} frames, {sequence.numbers[0]} to {sequence.numbers[-1]}"
+            )
+
+        # Transform Section
+        column, state = self.get_expand_column("transform_section")
+
+        if state:
+            column.prop(self, "global_scale")
+            column.prop(self, "use_format_axes")
+
+            axes = column.column()
+            axes.enabled = not self.use_format_axes
+            axes.prop(self, "forward_axis")
+            axes.prop(self, "up_axis")
+
+        # Playback Section
+        column, state = self.get_expand_column("playback_section")
+
+        if state:
+            column.prop(self, "set_frame_range")
+            column.prop(self, "cache_budget")
+            column.prop(self, "prefetch_frames")
+
+    def execute(self, context: Context):
+        try:
+            with self.staged_import(context):
+                obj = import_sequence(
+                    context,
+                    self.filepath(),
+                    global_scale=self.global_scale,
+                    forward_axis=None if self.use_format_axes else self.forward_axis,
+                    up_axis=None if self.use_format_axes else self.up_axis,
+                    cache_budget=self.cache_budget,
+                    prefetch_frames=self.prefetch_frames,
+                    set_frame_range=self.set_frame_range,
+                )
+        except FRAME_ERRORS as e:
+            self.report({"ERROR"}, f"{self.filepath()}: {e}")
+            return {"CANCELLED"}
+
+        if obj is None:
+            self.report({"ERROR"}, f"{self.filepath()} is not part of a sequence")
+            return {"CANCELLED"}
+
+        update_mesh_sequences(context.scene)
+
+        return {"FINISHED"}
+
+
+def draw_menu_sequence(layout: bpy.types.UILayout):
+    filename = VIEW3D_MT_Space_Import_BASE.filename
+    sequence = inspect_sequence(filename)
+
+    if sequence is None:
+        return
+
+    layout.separator()
+
+    col = layout.column()
+    col.operator(
+        "object.import_sequence_with_defaults",
+        text=f"Import as Mesh Sequence ({len(sequence.names)} frames)",
+    ).filename = filename  # type: ignore
+
+    col = layout.column()
+    col.operator_context = "INVOKE_DEFAULT"
+    col.operator(
+        "object.import_sequence_with_custom_settings",
+        text="Import as Mesh Sequence with Custom Settings",
+    ).filename = filename  # type: ignore
+
+
+OPERATORS: list[type] = [
+    ImportSequenceWithDefaults,
+    ImportSequenceWithCustomSettings,
+]
+
+HANDLERS: list[tuple[str, object]] = [
+    ("frame_change_pre", update_mesh_sequences),
+    ("load_post", reset_mesh_sequences),
+]
@@ -17,6 +17,7 @@ from bpy.props import (
 )
 from bpy.types import Context
 
+from .sequence import draw_menu_sequence
 from .super import (
     ImportWithDefaultsBase,
     ImportsWithCustomSettingsBase,
@@ -29,7 +30,9 @@ class ImportSTLWithDefaults(ImportWithDefaultsBase):
     bl_label = "Import Wavefront STL File (Experimental)"
 
     def execute(self, context: Context):
-        bpy.ops.wm.stl_import(filepath=self.filepath())
+        with self.staged_import(context):
+            bpy.ops.wm.stl_import(filepath=self.filepath())
+
         return {"FINISHED"}
 
 
@@ -74,15 +77,21 @@ class ImportSTLWithCustomSettings(ImportsWithCustomSettingsBase):
         column.prop(self, "axis_up")
         column.prop(self, "use_facet_normal")
 
+        self.draw_lean_section()
+
     def execute(self, context: Context):
-        bpy.ops.wm.stl_import(
-            global_scale=self.global_scale,
-            use_scene_unit=self.use_scene_unit,
-            use_facet_normal=self.use_facet_normal,
-            axis_forward=self.axis_forward,
-            axis_up=self.axis_up,
-            use_mesh_validate=self.use_mesh_validate,
-        )
+        if self.defer_lean_import(context):
+            return {"CANCELLED"}
+
+        with self.staged_import(context):
+            bpy.ops.wm.stl_import(
+                global_scale=self.global_scale,
+                use_scene_unit=self.use_scene_unit,
+                use_facet_normal=self.use_facet_normal,
+                axis_forward=self.axis_forward,
+                axis_up=self.axis_up,
+                use_mesh_validate=self.use_mesh_validate,
+            )
 
         return {"FINISHED"}
 
@@ -90,6 +99,10 @@ class ImportSTLWithCustomSettings(ImportsWithCustomSettingsBase):
 class VIEW3D_MT_Space_Import_STL(VIEW3D_MT_Space_Import_BASE):
     bl_label = "Import Wavefront STL File (Experimental)"
 
+    def draw(self, context: Context | None):
+        super().draw(context)
+        draw_menu_sequence(self.layout)
+
     @staticmethod
     def format():
         return "stl"
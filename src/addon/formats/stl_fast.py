@@ -0,0 +1,142 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# pyright: reportGeneralTypeIssues=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+# pyright: reportInvalidTypeForm=false
+
+import os
+import time
+import bpy
+import numpy as np
+
+from bpy.props import (
+    BoolProperty,  # pyright: ignore[reportUnknownVariableType]
+    EnumProperty,  # pyright: ignore[reportUnknownVariableType]
+    FloatProperty,  # pyright: ignore[reportUnknownVariableType]
+)
+from bpy.types import Context
+
+from ..readers.stl import read_stl
+from ..utils.mesh import (
+    axis_matrix,
+    create_mesh,
+    link_object,
+    transform_vertices,
+    triangle_starts,
+)
+from .super import (
+    ImportWithDefaultsBase,
+    ImportsWithCustomSettingsBase,
+)
+
+
+def import_stl_fast(
+    context: Context,
+    path: str,
+    global_scale: float = 1.0,
+    use_scene_unit: bool = False,
+    use_facet_normal: bool = False,
+    axis_forward: str = "Y",
+    axis_up: str = "Z",
+) -> bpy.types.Object:
+    started = time.perf_counter()
+
+    if use_scene_unit:
+        global_scale /= context.scene.unit_settings.scale_length
+
+    data = read_stl(path, read_normals=use_facet_normal)
+    matrix = axis_matrix(axis_forward, axis_up, global_scale)
+    vertices = transform_vertices(data.vertices, matrix)
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    mesh = create_mesh(
+        name, vertices, data.triangles, triangle_starts(len(data.triangles))
+    )
+
+    if data.normals is not None:
+        normals = transform_vertices(data.normals, matrix / np.float32(global_scale))
+        mesh.normals_split_custom_set(np.repeat(normals, 3, axis=0))
+
+    obj = link_object(context, name, mesh)
+
+    print(
+        f"{path}: {len(data.triangles)} triangles, {len(vertices)} vertices in {time.perf_counter() - started:.2f}s"
+    )
+
+    return obj
+
+
+class ImportSTLFastWithDefaults(ImportWithDefaultsBase):
+    bl_idname = "object.import_stl_fast_with_defaults"
+    bl_label = "Import Wavefront STL File (Fast)"
+
+    def execute(self, context: Context):
+        with self.staged_import(context):
+            import_stl_fast(context, self.filepath())
+
+        return {"FINISHED"}
+
+
+class ImportSTLFastWithCustomSettings(ImportsWithCustomSettingsBase):
+    bl_idname = "object.import_stl_fast_with_custom_settings"
+    bl_label = "Import Wavefront STL File (Fast)"
+
+    global_scale: FloatProperty(default=1.0, min=1e-06, max=1e06, name="Scale")
+    use_scene_unit: BoolProperty(default=False, name="Scene Unit")
+    use_facet_normal: BoolProperty(default=False, name="Facet Normals")
+    axis_forward: EnumProperty(
+        default="Y",
+        name="Forward",
+        items=[
+            ("X", "X Forward", ""),
+            ("Y", "Y Forward", ""),
+            ("Z", "Z Forward", ""),
+            ("-X", "-X Forward", ""),
+            ("-Y", "-Y Forward", ""),
+            ("-Z", "-Z Forward", ""),
+        ],
+    )
+    axis_up: EnumProperty(
+        default="Z",
+        name="Up",
+        items=[
+            ("X", "X Up", ""),
+            ("Y", "Y Up", ""),
+            ("Z", "Z Up", ""),
+            ("-X", "-X Up", ""),
+            ("-Y", "-Y Up", ""),
+            ("-Z", "-Z Up", ""),
+        ],
+    )
+
+    def draw(self, context: Context):
+        column = self.get_column()
+        column.prop(self, "global_scale")
+        column.prop(self, "use_scene_unit")
+        column.prop(self, "axis_forward")
+        column.prop(self, "axis_up")
+        column.prop(self, "use_facet_normal")
+
+    def execute(self, context: Context):
+        with self.staged_import(context):
+            import_stl_fast(
+                context,
+                self.filepath(),
+                global_scale=self.global_scale,
+                use_scene_unit=self.use_scene_unit,
+                use_facet_normal=self.use_facet_normal,
+                axis_forward=self.axis_forward,
+                axis_up=self.axis_up,
+            )
+
+        return {"FINISHED"}
+
+
+OPERATORS: list[type] = [
+    ImportSTLFastWithDefaults,
+    ImportSTLFastWithCustomSettings,
+]
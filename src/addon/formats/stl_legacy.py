@@ -25,7 +25,9 @@ class ImportSTLLegacyWithDefaults(ImportWithDefaultsBase):
     bl_label = "Import Wavefront STL File"
 
     def execute(self, context: Context):
-        bpy.ops.import_mesh.stl(filepath=self.filepath())
+        with self.staged_import(context):
+            bpy.ops.import_mesh.stl(filepath=self.filepath())
+
         return {"FINISHED"}
 
 
@@ -80,13 +82,14 @@ class ImportSTLLegacyWithCustomSettings(ImportsWithCustomSettingsBase):
             column.prop(self, "use_facet_normal")
 
     def execute(self, context: Context):
-        bpy.ops.import_mesh.stl(
-            global_scale=self.global_scale,
-            use_scene_unit=self.use_scene_unit,
-            use_facet_normal=self.use_facet_normal,
-            axis_forward=self.axis_forward,
-            axis_up=self.axis_up,
-        )
+        with self.staged_import(context):
+            bpy.ops.import_mesh.stl(
+                global_scale=self.global_scale,
+                use_scene_unit=self.use_scene_unit,
+                use_facet_normal=self.use_facet_normal,
+                axis_forward=self.axis_forward,
+                axis_up=self.axis_up,
+            )
 
         return {"FINISHED"}
 
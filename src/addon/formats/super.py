@@ -7,20 +7,47 @@
 # pyright: reportUnknownArgumentType=false
 # pyright: reportUnknownMemberType=false
 
+import contextlib
+import os
+import time
 import bpy
 import typing
 
-from bpy.props import StringProperty  # type: ignore
+from bpy.props import BoolProperty, EnumProperty, IntProperty, StringProperty  # type: ignore
 from bpy.types import Context, Event, Operator
+from mathutils import Matrix
 
+from ..utils import history, images, lean, redo, staging
 
 selectable_importers: typing.Dict[
     str, typing.Callable[[], typing.List[tuple[str, str]]]
 ] = {
-    "obj": lambda: [("", "obj"), ("(Legacy)", "obj_legacy")] if bpy.app.version >= (3, 4, 0) else [("", "obj_legacy")],  # type: ignore
-    "stl": lambda: [("", "stl"), ("(Legacy)", "stl_legacy")] if bpy.app.version >= (3, 4, 0) else [("", "stl_legacy")],  # type: ignore
+    "obj": lambda: [("", "obj"), ("(Legacy)", "obj_legacy"), ("(Fast)", "obj_fast"), ("(Parallel)", "obj_parallel")] if bpy.app.version >= (3, 4, 0) else [("", "obj_legacy"), ("(Fast)", "obj_fast"), ("(Parallel)", "obj_parallel")],  # type: ignore
+    "stl": lambda: [("", "stl"), ("(Legacy)", "stl_legacy"), ("(Fast)", "stl_fast")] if bpy.app.version >= (3, 4, 0) else [("", "stl_legacy"), ("(Fast)", "stl_fast")],  # type: ignore
+    "bvh": lambda: [("", "bvh"), ("(Fast)", "bvh_fast")],  # type: ignore
 }
 
+# format -> importer with the cheapest settings, filled by the preview module
+preview_importers: typing.Dict[str, typing.Callable[[Context, str], None]] = {}
+
+# custom property holding the source file on objects imported as a preview
+PREVIEW_PATH = "drag_and_drop_preview"
+
+
+def property_value(value: typing.Any) -> typing.Any:
+    # collections are passed to operators and compared as lists of dictionaries
+    if isinstance(value, bpy.types.bpy_prop_collection):
+        return [
+            {
+                p.identifier: getattr(item, p.identifier)
+                for p in item.bl_rna.properties
+                if p.identifier != "rna_type"
+            }
+            for item in value
+        ]
+
+    return value
+
 
 class ImportWithDefaultsBase(Operator):
     filename: StringProperty()
@@ -28,10 +55,185 @@ class ImportWithDefaultsBase(Operator):
     def filepath(self) -> str:
         return typing.cast(str, self.filename)
 
+    @contextlib.contextmanager
+    def staged_import(self, context: Context):
+        # imports into an empty scene first, so a heavy scene is not evaluated and
+        # redrawn after every step of the importer
+        with self.record_history(), staging.staged(context):
+            yield
+
+    def history_variant(self) -> tuple[str, str] | None:
+        # (format, importer name) of the selectable importers run with their defaults,
+        # other settings would skew the throughput the auto importer compares
+        prefix, suffix = "object.import_", "_with_defaults"
+        idname = typing.cast(str, type(self).bl_idname)
+
+        if not idname.startswith(prefix) or not idname.endswith(suffix):
+            return None
+
+        name = idname[len(prefix) : -len(suffix)]
+        format = os.path.splitext(self.filepath())[1][1:].lower()
+
+        if format not in selectable_importers or name not in (
+            n for _, n in selectable_importers[format]()
+        ):
+            return None
+
+        return format, name
+
+    @contextlib.contextmanager
+    def record_history(self):
+        variant = self.history_variant()
+
+        if variant is None or not os.path.isfile(self.filepath()):
+            yield
+            return
+
+        size = os.path.getsize(self.filepath())
+        started = time.perf_counter()
+
+        try:
+            yield
+        except Exception:
+            history.record(*variant, size, None)
+            raise
+
+        history.record(*variant, size, time.perf_counter() - started)
+
 
 class ImportsWithCustomSettingsBase(ImportWithDefaultsBase):
     bl_options = {"REGISTER", "UNDO"}
 
+    # (scale, forward axis, up axis) property names, when only these change in the redo
+    # panel the previous result is moved instead of importing the file again
+    transform_properties: typing.Optional[tuple[typing.Optional[str], str, str]] = None
+
+    lean_mode: EnumProperty(
+        default="AUTO",
+        name="Lean Mode",
+        items=[
+            (
+                "AUTO",
+                "Auto",
+                "No undo step of its own for files above the size threshold. The next undo step still stores the import, so the memory is only needed later",
+            ),
+            (
+                "ON",
+                "On",
+                "No undo step of its own, the import cannot be undone. The next undo step still stores the import, so the memory is only needed later",
+            ),
+            ("OFF", "Off", "Always record an undo step"),
+        ],
+    )
+    lean_threshold: IntProperty(default=1024, min=0, name="Lean Above (MB)")
+    lean_deferred: BoolProperty(default=False, options={"HIDDEN", "SKIP_SAVE"})
+
+    lean_section: BoolProperty(default=False, name="Memory")
+
+    def use_lean_import(self) -> bool:
+        if self.lean_deferred or self.lean_mode == "OFF":
+            return False
+
+        if self.lean_mode == "ON":
+            return True
+
+        try:
+            size = os.path.getsize(self.filepath())
+        except OSError:
+            return False
+
+        return size >= self.lean_threshold * 1024 * 1024
+
+    def defer_lean_import(self, context: Context) -> bool:
+        if not self.use_lean_import():
+            return False
+
+        name = os.path.basename(self.filepath())
+        properties = {
+            p.identifier: property_value(getattr(self, p.identifier))
+            for p in self.properties.bl_rna.properties
+            if p.identifier != "rna_type"
+        }
+        properties["lean_deferred"] = True
+
+        lean.run_deferred(context, type(self).bl_idname, properties, name)
+        self.report({"WARNING"}, f"{name} is imported without an undo step of its own")
+
+        return True
+
+    def draw_lean_section(self):
+        column, state = self.get_expand_column("lean_section")
+
+        if state:
+            column.prop(self, "lean_mode")
+
+            threshold = column.row()
+            threshold.enabled = self.lean_mode == "AUTO"
+            threshold.prop(self, "lean_threshold")
+
+    def transform_matrix(self) -> Matrix:
+        scale, forward, up = typing.cast(
+            tuple[str, str, str], self.transform_properties
+        )
+
+        return redo.transform_matrix(
+            getattr(self, scale) if scale else 1.0,
+            getattr(self, forward),
+            getattr(self, up),
+        )
+
+    def import_settings(self) -> dict[str, typing.Any]:
+        skip = set(self.transform_properties or ())
+
+        return {
+            p.identifier: property_value(getattr(self, p.identifier))
+            for p in self.properties.bl_rna.properties
+            if p.identifier != "rna_type"
+            and p.identifier not in skip
+            and not p.identifier.endswith("_section")
+            and not p.identifier.startswith("lean_")
+        }
+
+    def transform_only_on_roots(self) -> bool:
+        # redo moves the root objects of the previous import, see redo.restore
+        return self.transform_properties is not None
+
+    def reuse_previous_import(self, context: Context) -> bool:
+        if not self.transform_only_on_roots():
+            return False
+
+        cached = redo.find(self.bl_idname, self.filepath(), self.import_settings())
+
+        if cached is None:
+            return False
+
+        objects = redo.restore(
+            context, cached, self.transform_matrix(), staging.import_origin(context)
+        )
+        print(
+            f"{self.filepath()}: only the transform changed, reused {len(objects)} objects"
+        )
+
+        return True
+
+    @contextlib.contextmanager
+    def remember_import(self, context: Context):
+        before = set(bpy.data.objects)
+        yield
+
+        # a lean import has no undo step the redo panel could go back to
+        if self.transform_only_on_roots() and not self.lean_deferred:
+            created = [o for o in bpy.data.objects if o not in before]
+            # inside a staging scene the origin is still to be applied
+            redo.remember(
+                self.bl_idname,
+                self.filepath(),
+                self.import_settings(),
+                self.transform_matrix(),
+                staging.applied_origin(context),
+                created,
+            )
+
     def get_expand_state(self, name: str) -> bool:
         return getattr(self, name)
 
@@ -73,6 +275,46 @@ class ImportsWithCustomSettingsBase(ImportWithDefaultsBase):
         return wm.invoke_props_dialog(self)
 
 
+class ImageOptimization:
+    # post-import pass for formats that pack or embed their textures
+    merge_duplicate_images: BoolProperty(default=False, name="Merge Duplicate Images")
+    max_image_size: IntProperty(
+        default=0, min=0, name="Max Image Size", subtype="PIXEL"
+    )
+
+    images_section: BoolProperty(default=False, name="Images")
+
+    @contextlib.contextmanager
+    def optimize_images(self):
+        before = set(bpy.data.images)
+        yield
+
+        if not self.merge_duplicate_images and self.max_image_size == 0:
+            return
+
+        created = [i for i in bpy.data.images if i not in before]
+        savings = images.optimize(
+            created, self.merge_duplicate_images, self.max_image_size
+        )
+        mb = 1024 * 1024
+
+        self.report(
+            {"INFO"},
+            f"Merged {savings.merged} duplicate images ({savings.merged_bytes / mb:.1f} MB of source data), "
+            f"downscaled {savings.scaled} (packed {savings.packed_before / mb:.1f} MB, now {savings.packed_after / mb:.1f} MB)",
+        )
+
+    def draw_images_section(self):
+        column, state = self.get_expand_column("images_section")
+
+        if state:
+            column.prop(self, "merge_duplicate_images")
+            column.prop(self, "max_image_size")
+
+            if self.max_image_size > 0:
+                column.label(text="Only packed images are downscaled", icon="INFO")
+
+
 class VIEW3D_MT_Space_Import_BASE(bpy.types.Menu):
     filename: str
 
@@ -85,6 +327,10 @@ class VIEW3D_MT_Space_Import_BASE(bpy.types.Menu):
                 importers = selectable_importers[format]()
 
                 col = layout.column()
+                col.operator(
+                    "object.import_auto_with_defaults",
+                    text="Import with Defaults (Auto)",
+                ).filename = VIEW3D_MT_Space_Import_BASE.filename  # type: ignore
 
                 for importer in importers:
                     text, name = importer
@@ -119,6 +365,23 @@ class VIEW3D_MT_Space_Import_BASE(bpy.types.Menu):
                     text="Import with Custom Settings",
                 ).filename = VIEW3D_MT_Space_Import_BASE.filename  # type: ignore
 
+            if format in preview_importers:
+                self.draw_preview(format)
+
+    def draw_preview(self, format: str):
+        filename = VIEW3D_MT_Space_Import_BASE.filename
+
+        col = self.layout.column()
+        op = col.operator("object.import_preview", text="Import Preview")
+        op.filename = filename  # type: ignore
+        op.format = format  # type: ignore
+
+        if any(o.get(PREVIEW_PATH) == filename for o in bpy.data.objects):
+            col.operator(
+                "object.promote_preview_import",
+                text="Promote Preview to Full Import",
+            ).filename = filename  # type: ignore
+
     @staticmethod
     def format() -> str:
         return ""
@@ -24,7 +24,9 @@ class ImportSVGWithDefaults(ImportWithDefaultsBase):
     bl_label = "Import SVG File"
 
     def execute(self, context: Context) -> Set[str] | Set[int]:
-        bpy.ops.import_curve.svg(filepath=self.filepath())
+        with self.staged_import(context):
+            bpy.ops.import_curve.svg(filepath=self.filepath())
+
         return {"FINISHED"}
 
 
@@ -36,7 +38,9 @@ class ImportSVGWithCustomSettings(ImportsWithCustomSettingsBase):
         pass
 
     def execute(self, context: Context) -> Set[str] | Set[int]:
-        bpy.ops.import_curve.svg(filepath=self.filepath())
+        with self.staged_import(context):
+            bpy.ops.import_curve.svg(filepath=self.filepath())
+
         return {"FINISHED"}
 
 
@@ -8,33 +8,211 @@
 # pyright: reportUnknownMemberType=false
 # pyright: reportInvalidTypeForm=false
 
+import os
+import shutil
+import typing
 import bpy
 
+from bpy.app.handlers import persistent
 from bpy.props import (
     BoolProperty,  # pyright: ignore[reportUnknownVariableType]
+    CollectionProperty,  # pyright: ignore[reportUnknownVariableType]
     EnumProperty,  # pyright: ignore[reportUnknownVariableType]
     FloatProperty,  # pyright: ignore[reportUnknownVariableType]
+    IntProperty,  # pyright: ignore[reportUnknownVariableType]
     StringProperty,  # pyright: ignore[reportUnknownVariableType]
 )
-from bpy.types import Context
-
+from bpy.types import Context, Event
+
+from ..readers.usd import (
+    PackageEntry,
+    UnsupportedUSD,
+    prim_path_mask,
+    read_package,
+    read_prims,
+)
+from ..utils import texture_store, usdz_cache
+from ..utils.texture_index import IMAGE_EXTENSIONS
 from .super import (
+    ImageOptimization,
     ImportWithDefaultsBase,
     ImportsWithCustomSettingsBase,
     VIEW3D_MT_Space_Import_BASE,
 )
 
+PRIM_ICONS = {
+    "Mesh": "MESH_DATA",
+    "Xform": "EMPTY_AXIS",
+    "Scope": "OUTLINER_COLLECTION",
+    "Camera": "CAMERA_DATA",
+    "Material": "MATERIAL",
+    "SkelRoot": "ARMATURE_DATA",
+    "Skeleton": "ARMATURE_DATA",
+}
+
+# stored on images that point into the USDZ texture cache until the file is saved
+CACHED_TEXTURES_KEY = "drag_and_drop_usdz_textures"
+
+# path -> ((mtime, size), entries), the dialog redraws often
+packages: dict[str, tuple[tuple[float, int], list[PackageEntry]]] = {}
+
+
+def image_directories() -> set[str]:
+    return {
+        os.path.dirname(os.path.normpath(bpy.path.abspath(i.filepath)))
+        for i in bpy.data.images
+        if i.source == "FILE" and i.filepath
+    }
+
+
+@persistent
+def move_cached_textures(*args: object):
+    # the textures directory can be resolved once the file has a path, so the cached
+    # textures are copied there and the saved file points to the copies
+    path = args[0] if args and isinstance(args[0], str) else bpy.data.filepath
+
+    if not path:
+        return
+
+    base = os.path.dirname(path)
+
+    for image in [i for i in bpy.data.images if CACHED_TEXTURES_KEY in i]:
+        settings = image[CACHED_TEXTURES_KEY]
+        textures_dir = settings["directory"]
+        directory = os.path.join(base, textures_dir[2:])
+        source = bpy.path.abspath(image.filepath)
+        target = os.path.join(directory, os.path.basename(source))
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+
+            if settings["overwrite"] or not os.path.exists(target):
+                shutil.copyfile(source, target)
+        except OSError as e:
+            print(f"{source}: {e}, the image still uses the USDZ texture cache")
+            continue
+
+        image.filepath = (
+            "//" + os.path.relpath(target, base) if settings["relative"] else target
+        )
+        del image[CACHED_TEXTURES_KEY]
+
+
+def inspect_package(path: str) -> list[PackageEntry]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return []
+
+    key = (stat.st_mtime, stat.st_size)
+    cached = packages.get(path)
+
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    try:
+        entries = read_package(path)
+    except (OSError, UnsupportedUSD) as e:
+        print(f"{path}: {e}, no package contents available")
+        entries = []
+
+    packages[path] = (key, entries)
+    return entries
+
+
+def size_label(size: float) -> str:
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+
+    return f"{size / 1024:.1f} KB"
+
+
+class USDPrimItem(bpy.types.PropertyGroup):
+    path: StringProperty()
+    type_name: StringProperty()
+    depth: IntProperty()
+    size: FloatProperty()  # bytes, stages can be larger than an int property holds
+    payload: BoolProperty(default=False)
+    has_children: BoolProperty(default=False)
+    expanded: BoolProperty(default=False)
+    selected: BoolProperty(default=False)
+
+
+class VIEW3D_UL_Import_USD_Prims(bpy.types.UIList):
+    def draw_item(
+        self,
+        context: Context,
+        layout: bpy.types.UILayout,
+        data: typing.Any,
+        item: USDPrimItem,
+        icon: int,
+        active_data: typing.Any,
+        active_property: str,
+        index: int = 0,
+        flt_flag: int = 0,
+    ):
+        row = layout.row(align=True)
+
+        if item.depth > 0:
+            row.separator(factor=item.depth * 1.5)
+
+        if item.has_children:
+            row.prop(
+                item,
+                "expanded",
+                text="",
+                icon="DISCLOSURE_TRI_DOWN" if item.expanded else "DISCLOSURE_TRI_RIGHT",
+                emboss=False,
+            )
+        else:
+            row.label(text="", icon="BLANK1")
+
+        row.prop(item, "selected", text="")
+        row.label(text=item.name, icon=PRIM_ICONS.get(item.type_name, "OBJECT_DATA"))
+
+        if item.payload:
+            row.label(text="", icon="LINKED")
+
+        size = row.row()
+        size.alignment = "RIGHT"
+        size.label(text=size_label(item.size))
+
+    def filter_items(self, context: Context, data: typing.Any, propname: str):
+        items = getattr(data, propname)
+
+        if self.filter_name:
+            flags = bpy.types.UI_UL_list.filter_items_by_name(
+                self.filter_name, self.bitflag_filter_item, items, "name"
+            )
+            return flags, []
+
+        # descendants of collapsed prims are hidden
+        flags: list[int] = []
+        collapsed = -1
+
+        for item in items:
+            if collapsed >= 0 and item.depth > collapsed:
+                flags.append(0)
+                continue
+
+            collapsed = -1 if item.expanded else item.depth
+            flags.append(self.bitflag_filter_item)
+
+        return flags, []
+
 
 class ImportUSDWithDefaults(ImportWithDefaultsBase):
     bl_idname = "object.import_usd_with_defaults"
     bl_label = "Import Wavefront USD File (Experimental)"
 
     def execute(self, context: Context):
-        bpy.ops.wm.usd_import(filepath=self.filepath())
+        with self.staged_import(context):
+            bpy.ops.wm.usd_import(filepath=self.filepath())
+
         return {"FINISHED"}
 
 
-class ImportUSDWithCustomSettings(ImportsWithCustomSettingsBase):
+class ImportUSDWithCustomSettings(ImageOptimization, ImportsWithCustomSettingsBase):
     bl_idname = "object.import_usd_with_custom_settings"
     bl_label = "Import Wavefront USD File (Experimental)"
 
@@ -92,8 +270,102 @@ class ImportUSDWithCustomSettings(ImportsWithCustomSettingsBase):
         name="File Name Collision",
         items=[("USE_EXISTING", "Use Existing", ""), ("OVERWRITE", "Overwrite", "")],
     )
+    use_texture_store: BoolProperty(default=False, name="Shared Texture Store")
+
+    prims: CollectionProperty(type=USDPrimItem)
+    prims_active: IntProperty()
+
+    file_section: BoolProperty(default=True, name="File")
+    prims_section: BoolProperty(default=False, name="Hierarchy")
+
+    def invoke(self, context: Context, event: Event):
+        self.prims.clear()
+
+        try:
+            prims = read_prims(self.filepath())
+        except (OSError, UnsupportedUSD) as e:
+            print(f"{self.filepath()}: {e}, prims cannot be selected")
+            prims = []
+
+        for index, prim in enumerate(prims):
+            item = self.prims.add()
+            item.name = prim.name
+            item.path = prim.path
+            item.type_name = prim.type_name
+            item.depth = prim.depth
+            item.size = prim.size
+            item.payload = prim.payload
+            item.has_children = (
+                index + 1 < len(prims) and prims[index + 1].depth > prim.depth
+            )
+            item.expanded = prim.depth == 0
+
+        return super().invoke(context, event)
+
+    def selected_prim_mask(self) -> str:
+        return prim_path_mask(i.path for i in self.prims if i.selected)
+
+    def draw_prims_section(self):
+        if not self.prims:
+            return
+
+        column, state = self.get_expand_column("prims_section")
+
+        if state:
+            column.template_list(
+                "VIEW3D_UL_Import_USD_Prims",
+                "",
+                self,
+                "prims",
+                self,
+                "prims_active",
+                rows=8,
+            )
+
+            mask = self.selected_prim_mask()
+
+            if mask:
+                column.label(text=f"Path Mask: {mask}", icon="INFO")
+
+    def use_texture_cache(self) -> bool:
+        # without a saved file the textures directory has nowhere to point to
+        return (
+            self.import_textures_mode == "IMPORT_COPY"
+            and self.import_textures_dir.startswith("//")
+            and not bpy.data.is_saved
+            and bool(inspect_package(self.filepath()))
+        )
+
+    def draw_file_section(self):
+        entries = inspect_package(self.filepath())
+
+        if not entries:
+            return
+
+        column, state = self.get_expand_column("file_section")
+
+        if state:
+            textures = [
+                e
+                for e in entries
+                if os.path.splitext(e.name)[1].lower() in IMAGE_EXTENSIONS
+            ]
+            column.label(
+                text=f"USDZ package: {len(entries)} files, root layer {entries[0].name}"
+            )
+            column.label(
+                text=f"{len(textures)} textures ({size_label(sum(t.length for t in textures))})"
+            )
+
+            if self.use_texture_cache():
+                column.label(
+                    text="Textures are extracted to a cache and copied when the file is saved",
+                    icon="INFO",
+                )
 
     def draw(self, context: Context):
+        self.draw_file_section()
+
         column, box = self.get_heading_column("Data Types")
         column.prop(self, "import_cameras")
         column.prop(self, "import_curves")
@@ -106,7 +378,12 @@ class ImportUSDWithCustomSettings(ImportsWithCustomSettingsBase):
         column.prop(self, "import_blendshapes")
 
         column = self.get_column(box=box)
-        column.prop(self, "prim_path_mask")
+
+        # the mask is generated while prims are selected in the hierarchy
+        path_mask = column.column()
+        path_mask.enabled = not self.selected_prim_mask()
+        path_mask.prop(self, "prim_path_mask")
+
         column.prop(self, "scale")
 
         column, box = self.get_heading_column("Mesh Data")
@@ -147,9 +424,118 @@ class ImportUSDWithCustomSettings(ImportsWithCustomSettingsBase):
         texture_mode_copy = column.column()
         texture_mode_copy.enabled = self.import_textures_mode == "IMPORT_COPY"
         texture_mode_copy.prop(self, "import_textures_dir")
-        texture_mode_copy.prop(self, "tex_name_collision_mode")
+        texture_mode_copy.prop(self, "use_texture_store")
+
+        collision_mode = texture_mode_copy.column()
+        collision_mode.enabled = not self.use_texture_store
+        collision_mode.prop(self, "tex_name_collision_mode")
+
+        self.draw_prims_section()
+        self.draw_images_section()
+        self.draw_lean_section()
 
     def execute(self, context: Context):
+        if self.defer_lean_import(context):
+            return {"CANCELLED"}
+
+        textures_dir = self.import_textures_dir
+        collision_mode = self.tex_name_collision_mode
+        directory = None
+        cached = False
+
+        if self.use_texture_cache():
+            # the package is only extracted where the importer needs files on disk
+            try:
+                textures_dir = usdz_cache.extract_textures(
+                    self.filepath(), image_directories()
+                )
+                collision_mode = "USE_EXISTING"
+                cached = True
+            except (OSError, UnsupportedUSD) as e:
+                print(f"{self.filepath()}: {e}, textures are copied by the importer")
+        else:
+            directory = self.texture_store_directory()
+
+        with self.staged_import(context), self.optimize_images():
+            with texture_store.incoming_directory(directory) as incoming:
+                before = set(bpy.data.images)
+                placed: dict[str, str] = {}
+
+                if incoming is not None:
+                    placed = self.preplace_textures(
+                        incoming, typing.cast(str, directory)
+                    )
+
+                    if placed:
+                        collision_mode = "USE_EXISTING"
+
+                self.import_usd(incoming or textures_dir, collision_mode)
+
+                if incoming is not None:
+                    self.store_textures(
+                        [i for i in bpy.data.images if i not in before],
+                        incoming,
+                        typing.cast(str, directory),
+                        placed,
+                    )
+
+                if cached:
+                    self.mark_cached_textures(
+                        [i for i in bpy.data.images if i not in before], textures_dir
+                    )
+
+        return {"FINISHED"}
+
+    def mark_cached_textures(self, images: list[bpy.types.Image], cache: str):
+        for image in images:
+            path = os.path.normpath(bpy.path.abspath(image.filepath))
+
+            if image.source == "FILE" and path.startswith(cache + os.sep):
+                image[CACHED_TEXTURES_KEY] = {
+                    "directory": self.import_textures_dir,
+                    "relative": self.relative_path,
+                    "overwrite": self.tex_name_collision_mode == "OVERWRITE",
+                }
+
+    def texture_store_directory(self) -> str | None:
+        if not self.use_texture_store or self.import_textures_mode != "IMPORT_COPY":
+            return None
+
+        if self.import_textures_dir.startswith("//") and not bpy.data.is_saved:
+            self.report(
+                {"WARNING"},
+                "Save the file first to use the shared texture store, textures are copied as usual",
+            )
+            return None
+
+        return bpy.path.abspath(self.import_textures_dir)
+
+    def preplace_textures(self, incoming: str, directory: str) -> dict[str, str]:
+        try:
+            return texture_store.preplace_package(
+                self.filepath(), inspect_package(self.filepath()), incoming, directory
+            )
+        except (OSError, UnsupportedUSD) as e:
+            print(f"{self.filepath()}: {e}, textures are copied by the importer")
+            return {}
+
+    def store_textures(
+        self,
+        images: list[bpy.types.Image],
+        incoming: str,
+        directory: str,
+        placed: dict[str, str],
+    ):
+        result = texture_store.store_images(
+            images, incoming, directory, self.relative_path, placed
+        )
+
+        self.report(
+            {"INFO"},
+            f"Stored {result.stored} new textures, reused {result.reused} ({result.saved / (1024 * 1024):.1f} MB not written again)",
+        )
+
+    def import_usd(self, textures_dir: str, collision_mode: str):
         bpy.ops.wm.usd_import(
             filepath=self.filepath(),
             relative_path=self.relative_path,
@@ -171,7 +557,7 @@ class ImportUSDWithCustomSettings(ImportsWithCustomSettingsBase):
             read_mesh_uvs=self.read_mesh_uvs,
             read_mesh_colors=self.read_mesh_colors,
             read_mesh_attributes=self.read_mesh_attributes,
-            prim_path_mask=self.prim_path_mask,
+            prim_path_mask=self.selected_prim_mask() or self.prim_path_mask,
             import_guide=self.import_guide,
             import_proxy=self.import_proxy,
             import_render=self.import_render,
@@ -181,8 +567,8 @@ class ImportUSDWithCustomSettings(ImportsWithCustomSettingsBase):
             light_intensity_scale=self.light_intensity_scale,
             mtl_name_collision_mode=self.mtl_name_collision_mode,
             import_textures_mode=self.import_textures_mode,
-            import_textures_dir=self.import_textures_dir,
-            tex_name_collision_mode=self.tex_name_collision_mode,
+            import_textures_dir=textures_dir,
+            tex_name_collision_mode=collision_mode,
         )
 
         return {"FINISHED"}
@@ -273,6 +659,8 @@ class VIEW3D_FH_Import_USDZ(bpy.types.FileHandler):
 
 
 OPERATORS: list[type] = [
+    USDPrimItem,
+    VIEW3D_UL_Import_USD_Prims,
     ImportUSDWithDefaults,
     ImportUSDWithCustomSettings,
     VIEW3D_MT_Space_Import_USD,
@@ -284,3 +672,7 @@ OPERATORS: list[type] = [
     VIEW3D_FH_Import_USDC,
     VIEW3D_FH_Import_USDZ,
 ]
+
+HANDLERS: list[tuple[str, object]] = [
+    ("save_pre", move_cached_textures),
+]
@@ -28,13 +28,16 @@ class ImportX3DWithDefaults(ImportWithDefaultsBase):
     bl_label = "Import X3D File"
 
     def execute(self, context: Context) -> Set[str] | Set[int]:
-        bpy.ops.import_scene.x3d(filepath=self.filepath())
+        with self.staged_import(context):
+            bpy.ops.import_scene.x3d(filepath=self.filepath())
+
         return {"FINISHED"}
 
 
 class ImportX3DWithCustomSettings(ImportsWithCustomSettingsBase):
     bl_idname = "object.import_x3d_with_custom_settings"
     bl_label = "Import X3D File"
+    transform_properties = (None, "axis_forward", "axis_up")
 
     axis_forward: EnumProperty(
         default="Y",
@@ -70,11 +73,15 @@ class ImportX3DWithCustomSettings(ImportsWithCustomSettingsBase):
             column.prop(self, "axis_up")
 
     def execute(self, context: Context) -> Set[str] | Set[int]:
-        bpy.ops.import_scene.x3d(
-            filepath=self.filepath(),
-            axis_forward=self.axis_forward,
-            axis_up=self.axis_up,
-        )
+        if self.reuse_previous_import(context):
+            return {"FINISHED"}
+
+        with self.remember_import(context), self.staged_import(context):
+            bpy.ops.import_scene.x3d(
+                filepath=self.filepath(),
+                axis_forward=self.axis_forward,
+                axis_up=self.axis_up,
+            )
 
         return {"FINISHED"}
 
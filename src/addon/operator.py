@@ -14,10 +14,14 @@ import bpy
 import os
 import typing
 
-from bpy.props import StringProperty  # pyright: ignore[reportUnknownVariableType]
-from bpy.types import Context, Event, Operator
+from bpy.props import (
+    CollectionProperty,  # pyright: ignore[reportUnknownVariableType]
+    StringProperty,  # pyright: ignore[reportUnknownVariableType]
+)
+from bpy.types import Context, Event, Operator, OperatorFileListElement
 
 from .formats import CLASSES
+from .formats.merge import VIEW3D_MT_Space_Import_Multiple, can_merge
 from .formats.super import VIEW3D_MT_Space_Import_BASE
 
 # formats that Blender does not supported by default
@@ -40,6 +44,10 @@ class DropEventListener(Operator):
     filename: StringProperty()
     filepath: StringProperty(subtype="FILE_PATH", options={"SKIP_SAVE"})
 
+    # filled by the file handler when multiple files are dropped at once
+    directory: StringProperty(subtype="DIR_PATH", options={"SKIP_SAVE"})
+    files: CollectionProperty(type=OperatorFileListElement, options={"SKIP_SAVE"})
+
     def find_class(self, ext: str) -> VIEW3D_MT_Space_Import_BASE | None:
         for c in CLASSES:
             if c.__name__ == f"VIEW3D_MT_Space_Import_{ext}":
@@ -61,8 +69,20 @@ class DropEventListener(Operator):
                 i("EXEC_DEFAULT", filename=self.filename)
         return
 
+    def dropped_paths(self) -> list[str]:
+        if self.directory and len(self.files) > 0:
+            return [os.path.join(self.directory, f.name) for f in self.files]
+
+        return [typing.cast(str, self.filepath)]
+
     def invoke(self, context: Context, event: Event):
         try:
+            paths = self.dropped_paths()
+
+            if can_merge(paths):
+                VIEW3D_MT_Space_Import_Multiple.filenames = paths
+                bpy.ops.wm.call_menu(name=VIEW3D_MT_Space_Import_Multiple.__name__)  # type: ignore
+                return {"FINISHED"}
 
             path = typing.cast(str, self.filepath)
 
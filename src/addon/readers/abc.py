@@ -0,0 +1,310 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+import typing
+
+OGAWA_MAGIC = b"Ogawa"
+OGAWA_FROZEN = 0xFF
+ROOT_OFFSET = 8
+
+# children with the high bit set are data blocks, the others are groups
+DATA_BIT = 1 << 63
+
+# children of the root group
+ROOT_METADATA = 3
+ROOT_TIME_SAMPLINGS = 4
+ROOT_INDEXED_METADATA = 5
+
+# object headers end with the hashes of the properties and the children
+HEADER_HASHES = 32
+INLINE_METADATA = 0xFF
+
+# bits of the property info, the type in the lowest two and the metadata index above
+PROPERTY_TYPE = 0x3
+PROPERTY_SIZE_HINT = 0xC
+PROPERTY_TIME_SAMPLING = 0x100
+PROPERTY_FIRST_LAST_CHANGED = 0x200
+PROPERTY_CONSTANT = 0x800
+PROPERTY_METADATA = 0xFF00000
+PROPERTY_COMPOUND = 0
+
+ACYCLIC_TIME_PER_CYCLE = sys.float_info.max / 32.0
+
+TOPOLOGY_PROPERTIES = {".faceIndices", ".faceCounts"}
+
+
+class UnsupportedABC(Exception):
+    pass
+
+
+class Samples(typing.NamedTuple):
+    written: int
+    # samples that differ from the one before, writers repeat unchanged samples
+    distinct: int
+
+
+class ABCObject(typing.NamedTuple):
+    path: str
+    name: str
+    schema: str  # "PolyMesh", "Xform", ... empty for objects without a schema
+    depth: int
+    samples: int  # the most samples of any of its properties
+    topology_changes: int  # distinct samples of the face lists, 0 for other schemas
+    properties: dict[str, Samples]
+
+
+class TimeSampling(typing.NamedTuple):
+    time_per_cycle: float
+    times: list[float]
+    samples: int  # the most samples of any property using it
+
+
+class ABCSummary(typing.NamedTuple):
+    application: str
+    objects: list[ABCObject]
+    start: float  # seconds
+    end: float
+    samples: int
+
+
+class Ogawa:
+    def __init__(self, data: mmap.mmap):
+        if data[:5] != OGAWA_MAGIC:
+            raise UnsupportedABC("not an Ogawa Alembic archive (HDF5 is not supported)")
+
+        if data[5] != OGAWA_FROZEN:
+            raise UnsupportedABC("the archive is still being written")
+
+        self.data = data
+        (self.root,) = struct.unpack_from("<Q", data, ROOT_OFFSET)
+
+    def children(self, group: int) -> list[int]:
+        if group == 0:
+            return []
+
+        (count,) = struct.unpack_from("<Q", self.data, group)
+        return list(struct.unpack_from(f"<{count}Q", self.data, group + 8))
+
+    def read(self, child: int) -> bytes:
+        position = child & ~DATA_BIT
+
+        if position == 0:
+            return b""
+
+        (size,) = struct.unpack_from("<Q", self.data, position)
+        return self.data[position + 8 : position + 8 + size]
+
+
+def parse_metadata(text: str) -> dict[str, str]:
+    pairs = (p.split("=", 1) for p in text.split(";") if "=" in p)
+    return {key: value for key, value in pairs}
+
+
+def read_indexed_metadata(data: bytes) -> list[dict[str, str]]:
+    # the first entry is always the empty metadata
+    metadata: list[dict[str, str]] = [{}]
+    offset = 0
+
+    while offset < len(data):
+        size = data[offset]
+        metadata.append(parse_metadata(data[offset + 1 : offset + 1 + size].decode()))
+        offset += 1 + size
+
+    return metadata
+
+
+def read_time_samplings(data: bytes) -> list[TimeSampling]:
+    samplings: list[TimeSampling] = []
+    offset = 0
+
+    while offset < len(data):
+        samples, time_per_cycle, count = struct.unpack_from("<IdI", data, offset)
+        offset += 16
+        times = list(struct.unpack_from(f"<{count}d", data, offset))
+        offset += count * 8
+        samplings.append(TimeSampling(time_per_cycle, times, samples))
+
+    return samplings
+
+
+def sample_time(sampling: TimeSampling, index: int) -> float:
+    if sampling.time_per_cycle >= ACYCLIC_TIME_PER_CYCLE:
+        return sampling.times[min(index, len(sampling.times) - 1)]
+
+    # uniform sampling is a cycle of one
+    cycles, sample = divmod(index, len(sampling.times))
+    return sampling.times[sample] + cycles * sampling.time_per_cycle
+
+
+def read_uint(data: bytes, offset: int, size: int) -> tuple[int, int]:
+    return int.from_bytes(data[offset : offset + size], "little"), offset + size
+
+
+def read_metadata(
+    data: bytes, offset: int, size: int, index: int, indexed: list[dict[str, str]]
+) -> tuple[dict[str, str], int]:
+    if index != INLINE_METADATA:
+        return indexed[index] if index < len(indexed) else {}, offset
+
+    length, offset = read_uint(data, offset, size)
+    return parse_metadata(data[offset : offset + length].decode()), offset + length
+
+
+def read_properties(
+    ogawa: Ogawa, group: int, prefix: str, properties: dict[str, Samples]
+):
+    children = ogawa.children(group)
+
+    if not children:
+        return
+
+    data = ogawa.read(children[-1])
+    offset = 0
+    index = 0
+
+    while offset < len(data):
+        (info,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        # 1, 2 or 4 bytes for the numbers that follow
+        size = 1 << ((info & PROPERTY_SIZE_HINT) >> 2)
+        samples = 0
+        first, last = 1, 0
+
+        if info & PROPERTY_TYPE != PROPERTY_COMPOUND:
+            samples, offset = read_uint(data, offset, size)
+            last = samples - 1
+
+            if info & PROPERTY_FIRST_LAST_CHANGED:
+                first, offset = read_uint(data, offset, size)
+                last, offset = read_uint(data, offset, size)
+            elif info & PROPERTY_CONSTANT:
+                first, last = 0, 0
+
+            if info & PROPERTY_TIME_SAMPLING:
+                offset += size
+
+        length, offset = read_uint(data, offset, size)
+        name = data[offset : offset + length].decode("utf-8", "replace")
+        offset += length
+        metadata = (info & PROPERTY_METADATA) >> 20
+        _, offset = read_metadata(data, offset, size, metadata, [])
+
+        path = f"{prefix}/{name}" if prefix else name
+
+        if info & PROPERTY_TYPE == PROPERTY_COMPOUND:
+            read_properties(ogawa, children[index], path, properties)
+        else:
+            distinct = last - first + 2 if last > 0 else min(samples, 1)
+            properties[path] = Samples(samples, distinct)
+
+        index += 1
+
+
+def read_objects(
+    ogawa: Ogawa,
+    group: int,
+    parent: str,
+    depth: int,
+    indexed: list[dict[str, str]],
+    objects: list[ABCObject],
+):
+    children = ogawa.children(group)
+
+    if len(children) < 2:
+        return
+
+    data = ogawa.read(children[-1])[:-HEADER_HASHES]
+    offset = 0
+    index = 1
+
+    while offset < len(data):
+        length, offset = read_uint(data, offset, 4)
+        name = data[offset : offset + length].decode("utf-8", "replace")
+        offset += length
+        metadata, offset = read_metadata(data, offset + 1, 4, data[offset], indexed)
+
+        path = f"{parent}/{name}"
+        child = children[index]
+        index += 1
+
+        properties: dict[str, Samples] = {}
+        read_properties(ogawa, ogawa.children(child)[0], "", properties)
+
+        # "AbcGeom_PolyMesh_v1" -> "PolyMesh"
+        schema = metadata.get("schema", "")
+        schema = schema.split("_")[1] if schema.count("_") >= 2 else schema
+
+        topology = [
+            s.distinct
+            for p, s in properties.items()
+            if p.rsplit("/", 1)[-1] in TOPOLOGY_PROPERTIES
+        ]
+
+        objects.append(
+            ABCObject(
+                path,
+                name,
+                schema,
+                depth,
+                max((s.written for s in properties.values()), default=0),
+                max(topology, default=0),
+                properties,
+            )
+        )
+        read_objects(ogawa, child, path, depth + 1, indexed, objects)
+
+
+def summarize(ogawa: Ogawa) -> ABCSummary:
+    root = ogawa.children(ogawa.root)
+
+    if len(root) <= ROOT_TIME_SAMPLINGS:
+        raise UnsupportedABC("not an Alembic archive")
+
+    indexed = [{}]
+
+    if len(root) > ROOT_INDEXED_METADATA:
+        indexed = read_indexed_metadata(ogawa.read(root[ROOT_INDEXED_METADATA]))
+
+    metadata = parse_metadata(
+        ogawa.read(root[ROOT_METADATA]).decode("utf-8", "replace")
+    )
+    samplings = read_time_samplings(ogawa.read(root[ROOT_TIME_SAMPLINGS]))
+
+    objects: list[ABCObject] = []
+    read_objects(ogawa, root[2], "", 0, indexed, objects)
+
+    # the first sampling is the default one every archive has, it only counts when alone
+    used = [s for s in samplings[1:] if s.samples > 0] or samplings[:1]
+    start = min((s.times[0] for s in used if s.times), default=0.0)
+    end = max(
+        (sample_time(s, max(0, s.samples - 1)) for s in used if s.times), default=0.0
+    )
+
+    return ABCSummary(
+        metadata.get("_ai_Application", ""),
+        objects,
+        start,
+        end,
+        max((s.samples for s in used), default=0),
+    )
+
+
+def read_summary(path: str) -> ABCSummary:
+    with open(path, "rb") as f:
+        if f.read(len(OGAWA_MAGIC)) != OGAWA_MAGIC:
+            raise UnsupportedABC("not an Ogawa Alembic archive (HDF5 is not supported)")
+
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    with data:
+        try:
+            return summarize(Ogawa(data))
+        except (IndexError, ValueError, UnicodeDecodeError, struct.error) as e:
+            raise UnsupportedABC(f"damaged Alembic archive ({e})")
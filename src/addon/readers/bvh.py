@@ -0,0 +1,222 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import typing
+import warnings
+
+import numpy as np
+
+AXES = "XYZ"
+
+# singular matrices below this have no unique first and last euler angle
+GIMBAL_EPSILON = 1e-6
+
+
+class UnsupportedBVH(Exception):
+    pass
+
+
+class Joint(typing.NamedTuple):
+    name: str
+    parent: int  # index into the joints, -1 for roots
+    offset: np.ndarray  # (3,) float64, from the parent head
+    channels: list[str]  # e.g. ["Xposition", ..., "Zrotation", "Xrotation", ...]
+    column: int  # first column of its channels in the motion block
+    end: np.ndarray | None  # offset of the End Site, if any
+
+    def location_columns(self) -> list[int] | None:
+        # x, y, z columns, None when the joint has no position channels
+        names = [f"{a}position" for a in AXES]
+
+        if not any(n in self.channels for n in names):
+            return None
+
+        return [self.column + self.channels.index(n) for n in names]
+
+    def rotation_order(self) -> str:
+        # axes in the order the channels are listed, "ZXY" for Zrotation Xrotation Yrotation
+        return "".join(c[0] for c in self.channels if c.endswith("rotation"))
+
+    def rotation_columns(self) -> list[int]:
+        return [
+            self.column + i
+            for i, c in enumerate(self.channels)
+            if c.endswith("rotation")
+        ]
+
+
+class BVHData(typing.NamedTuple):
+    joints: list[Joint]
+    frame_time: float  # seconds
+    motion: np.ndarray  # (frames, channels) float32
+
+
+def read_hierarchy(lines: typing.Iterator[bytes]) -> tuple[list[Joint], int, float]:
+    joints: list[Joint] = []
+    stack: list[int] = []
+    column = 0
+    in_end_site = False
+    frames = 0
+
+    for raw in lines:
+        tokens = raw.decode("utf-8", errors="replace").split()
+
+        if not tokens:
+            continue
+
+        keyword = tokens[0].upper()
+
+        if keyword in ("ROOT", "JOINT"):
+            name = " ".join(tokens[1:]) or f"joint_{len(joints)}"
+            parent = stack[-1] if stack else -1
+            joints.append(Joint(name, parent, np.zeros(3), [], column, None))
+            stack.append(len(joints) - 1)
+        elif keyword == "END":
+            in_end_site = True
+        elif keyword == "OFFSET":
+            offset = np.array([float(t) for t in tokens[1:4]])
+
+            if in_end_site:
+                joints[stack[-1]] = joints[stack[-1]]._replace(end=offset)
+            else:
+                joints[stack[-1]].offset[:] = offset
+        elif keyword == "CHANNELS":
+            channels = tokens[2 : 2 + int(tokens[1])]
+            joints[stack[-1]].channels.extend(c.capitalize() for c in channels)
+            column += len(channels)
+        elif keyword == "}":
+            if in_end_site:
+                in_end_site = False
+            else:
+                stack.pop()
+        elif keyword == "FRAMES:":
+            frames = int(tokens[1])
+        elif keyword == "FRAME" and len(tokens) >= 3:
+            return joints, frames, float(tokens[2])
+
+    raise UnsupportedBVH("no MOTION block")
+
+
+def read_bvh(path: str) -> BVHData:
+    with open(path, "rb") as f:
+        try:
+            joints, frames, frame_time = read_hierarchy(iter(f.readline, b""))
+        except (ValueError, IndexError) as e:
+            raise UnsupportedBVH(f"damaged HIERARCHY block ({e})")
+
+        text = f.read().decode("ascii", errors="replace")
+
+    if not joints:
+        raise UnsupportedBVH("no joints")
+
+    columns = sum(len(j.channels) for j in joints)
+
+    # the whole MOTION block in one pass, a parse error ends the array early
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        values = np.fromstring(text, dtype=np.float32, sep=" ")
+
+    # exporters sometimes declare more frames than they wrote
+    frames = min(frames, len(values) // columns) if columns > 0 else frames
+    motion = values[: frames * columns].reshape(frames, columns)
+
+    return BVHData(joints, frame_time, motion)
+
+
+def axis_rotations(axis: str, angles: np.ndarray) -> np.ndarray:
+    # (N, 3, 3) rotations about one axis
+    cos = np.cos(angles)
+    sin = np.sin(angles)
+    matrices = np.zeros((len(angles), 3, 3), dtype=angles.dtype)
+    i = AXES.index(axis)
+    j, k = (i + 1) % 3, (i + 2) % 3
+
+    matrices[:, i, i] = 1.0
+    matrices[:, j, j] = cos
+    matrices[:, k, k] = cos
+    matrices[:, j, k] = -sin
+    matrices[:, k, j] = sin
+
+    return matrices
+
+
+def rotation_matrices(order: str, degrees: np.ndarray) -> np.ndarray:
+    # channels listed first are the outermost rotation, "ZXY" is Rz @ Rx @ Ry
+    radians = np.radians(degrees.astype(np.float64))
+    matrices = np.broadcast_to(np.identity(3), (len(radians), 3, 3))
+
+    for index, axis in enumerate(order):
+        matrices = matrices @ axis_rotations(axis, radians[:, index])
+
+    return matrices
+
+
+def matrices_to_quaternions(matrices: np.ndarray) -> np.ndarray:
+    # (N, 4) w, x, y, z, from the largest diagonal term for precision
+    m = matrices
+    trace = m[:, 0, 0] + m[:, 1, 1] + m[:, 2, 2]
+    candidates = np.stack([trace, m[:, 0, 0], m[:, 1, 1], m[:, 2, 2]], axis=1).argmax(
+        axis=1
+    )
+    quaternions = np.empty((len(m), 4))
+
+    w = candidates == 0
+    s = np.sqrt(np.maximum(trace[w] + 1.0, 0.0)) * 2.0
+    quaternions[w] = np.stack(
+        [
+            s / 4.0,
+            (m[w, 2, 1] - m[w, 1, 2]) / s,
+            (m[w, 0, 2] - m[w, 2, 0]) / s,
+            (m[w, 1, 0] - m[w, 0, 1]) / s,
+        ],
+        axis=1,
+    )
+
+    for axis in range(3):
+        i, j, k = axis, (axis + 1) % 3, (axis + 2) % 3
+        rows = candidates == axis + 1
+        r = m[rows]
+        s = np.sqrt(np.maximum(1.0 + r[:, i, i] - r[:, j, j] - r[:, k, k], 0.0)) * 2.0
+        q = np.empty((len(r), 4))
+        q[:, 0] = (r[:, k, j] - r[:, j, k]) / s
+        q[:, 1 + i] = s / 4.0
+        q[:, 1 + j] = (r[:, j, i] + r[:, i, j]) / s
+        q[:, 1 + k] = (r[:, k, i] + r[:, i, k]) / s
+        quaternions[rows] = q
+
+    # neighbours on the same hemisphere, so interpolation takes the short way
+    flips = np.einsum("ij,ij->i", quaternions[1:], quaternions[:-1]) < 0.0
+    signs = np.cumprod(np.concatenate([[1.0], np.where(flips, -1.0, 1.0)]))
+
+    return quaternions * signs[:, None]
+
+
+def matrices_to_eulers(matrices: np.ndarray, order: str) -> np.ndarray:
+    # (N, 3) x, y, z angles for Blender's euler order, where "XYZ" applies X first,
+    # i.e. the matrix is Rz @ Ry @ Rx
+    i, j, k = (AXES.index(a) for a in order)
+    parity = 1.0 if (j - i) % 3 == 1 else -1.0
+    m = matrices
+
+    cos_middle = np.hypot(m[:, i, i], m[:, j, i])
+    regular = cos_middle > GIMBAL_EPSILON
+
+    first = np.where(
+        regular,
+        np.arctan2(parity * m[:, k, j], m[:, k, k]),
+        np.arctan2(-parity * m[:, j, k], m[:, j, j]),
+    )
+    middle = np.arctan2(-parity * m[:, k, i], cos_middle)
+    last = np.where(regular, np.arctan2(parity * m[:, j, i], m[:, i, i]), 0.0)
+
+    eulers = np.empty((len(m), 3))
+    eulers[:, i] = first
+    eulers[:, j] = middle
+    eulers[:, k] = last
+
+    # no jumps of a full turn between frames
+    return np.unwrap(eulers, axis=0)
@@ -0,0 +1,352 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import mmap
+import struct
+import typing
+
+MAGIC = b"Kaydara FBX Binary  \x00"
+VERSION_OFFSET = 23
+NODES_OFFSET = 27
+
+# node records use 64-bit offsets from FBX 7.5
+WIDE_VERSION = 7500
+
+SCALARS: dict[bytes, str] = {
+    b"Y": "<h",
+    b"C": "<?",
+    b"I": "<i",
+    b"F": "<f",
+    b"D": "<d",
+    b"L": "<q",
+}
+# bool, int32, int64, float32 and float64 arrays, only their headers are read
+ARRAYS = {b"b", b"i", b"l", b"f", b"d"}
+
+
+class UnsupportedFBX(Exception):
+    pass
+
+
+class Node(typing.NamedTuple):
+    name: str
+    properties: int  # offset of the property list
+    property_count: int
+    children: int  # offset of the first child record
+    end: int
+
+
+class Blob(typing.NamedTuple):
+    type: bytes
+    length: int  # number of elements, or bytes for raw data
+    encoding: int  # 1 when zlib compressed
+    size: int  # bytes stored in the file
+    offset: int
+
+
+class TextureFile(typing.NamedTuple):
+    filename: str  # as written by the exporter, usually absolute on its machine
+    relative: str  # relative to the FBX file
+
+
+class FBXSummary(typing.NamedTuple):
+    version: int
+    meshes: int
+    corners: int  # face corners of all meshes, read from the array headers
+    meshes_with_normals: int
+    subdivided_meshes: int
+    models: int
+    bones: int
+    skins: int
+    clusters: int
+    blend_shapes: int
+    materials: int
+    textures: int
+    videos: int
+    embedded_videos: int
+    embedded_textures: int  # textures connected to an embedded video
+    embedded_bytes: int
+    animation_stacks: int
+    animation_curves: int
+    animation_keys: int
+    unit_scale: float
+
+
+def iter_nodes(
+    data: mmap.mmap, start: int, stop: int, version: int
+) -> typing.Iterator[Node]:
+    wide = version >= WIDE_VERSION
+    header = "<QQQB" if wide else "<IIIB"
+    header_size = struct.calcsize(header)
+    offset = start
+
+    while offset + header_size <= stop:
+        end, count, length, name_length = struct.unpack_from(header, data, offset)
+
+        # a zeroed record terminates the list of children
+        if end == 0:
+            return
+
+        name_start = offset + header_size
+        properties = name_start + name_length
+        name = data[name_start:properties].decode("ascii", errors="replace")
+
+        yield Node(name, properties, count, properties + length, end)
+        offset = end
+
+
+def children(data: mmap.mmap, node: Node, version: int) -> typing.Iterator[Node]:
+    return iter_nodes(data, node.children, node.end, version)
+
+
+def child(data: mmap.mmap, node: Node, version: int, name: str) -> Node | None:
+    return next((c for c in children(data, node, version) if c.name == name), None)
+
+
+def read_properties(data: mmap.mmap, node: Node) -> list[typing.Any]:
+    # arrays and raw data are not read, only their location is returned
+    values: list[typing.Any] = []
+    offset = node.properties
+
+    for _ in range(node.property_count):
+        kind = data[offset : offset + 1]
+        offset += 1
+
+        if kind in SCALARS:
+            format = SCALARS[kind]
+            values.append(struct.unpack_from(format, data, offset)[0])
+            offset += struct.calcsize(format)
+        elif kind in ARRAYS:
+            length, encoding, size = struct.unpack_from("<III", data, offset)
+            values.append(Blob(kind, length, encoding, size, offset + 12))
+            offset += 12 + size
+        elif kind == b"S":
+            (size,) = struct.unpack_from("<I", data, offset)
+            values.append(
+                data[offset + 4 : offset + 4 + size].decode("utf-8", errors="replace")
+            )
+            offset += 4 + size
+        elif kind == b"R":
+            (size,) = struct.unpack_from("<I", data, offset)
+            values.append(Blob(kind, size, 0, size, offset + 4))
+            offset += 4 + size
+        else:
+            raise UnsupportedFBX(f"unknown property type {kind!r} in {node.name}")
+
+    return values
+
+
+def basename(path: str) -> str:
+    # paths written on Windows keep their backslashes
+    return path.replace("\\", "/").rsplit("/", 1)[-1].lower()
+
+
+def object_class(data: mmap.mmap, node: Node) -> str:
+    # objects are declared as (id, "name\x00\x01Type", "Class")
+    properties = read_properties(data, node)
+    return properties[2] if len(properties) > 2 else ""
+
+
+def summarize(data: mmap.mmap) -> FBXSummary:
+    (version,) = struct.unpack_from("<I", data, VERSION_OFFSET)
+    counts: dict[str, int] = {name: 0 for name in FBXSummary._fields}
+    unit_scale = 1.0
+
+    # ids of the objects that connections are resolved for
+    textures: set[int] = set()
+    embedded: set[int] = set()
+    links: list[tuple[int, int]] = []
+
+    for node in iter_nodes(data, NODES_OFFSET, len(data), version):
+        if node.name == "Objects":
+            count_objects(data, node, version, counts, textures, embedded)
+        elif node.name == "Connections":
+            links.extend(object_links(data, node, version))
+        elif node.name == "Takes":
+            takes = sum(1 for c in children(data, node, version) if c.name == "Take")
+            counts["animation_stacks"] = max(counts["animation_stacks"], takes)
+        elif node.name == "GlobalSettings":
+            unit_scale = read_unit_scale(data, node, version, unit_scale)
+
+    # a video belongs to the texture it is connected to
+    counts["embedded_textures"] = len(
+        {parent for child, parent in links if child in embedded and parent in textures}
+    )
+    counts["version"] = version
+    counts["unit_scale"] = unit_scale  # pyright: ignore[reportArgumentType]
+
+    return FBXSummary(**counts)
+
+
+def object_links(
+    data: mmap.mmap, connections: Node, version: int
+) -> typing.Iterator[tuple[int, int]]:
+    # connections are declared as ("OO", child, parent) or ("OP", child, parent, name)
+    for node in children(data, connections, version):
+        if node.name != "C":
+            continue
+
+        values = read_properties(data, node)
+
+        if len(values) >= 3 and values[0] in ("OO", "OP"):
+            yield values[1], values[2]
+
+
+def count_objects(
+    data: mmap.mmap,
+    objects: Node,
+    version: int,
+    counts: dict[str, int],
+    textures: set[int],
+    embedded: set[int],
+):
+    stacks = 0
+
+    for node in children(data, objects, version):
+        if node.name == "Geometry":
+            kind = object_class(data, node)
+
+            if kind == "Mesh":
+                counts["meshes"] += 1
+                count_geometry(data, node, version, counts)
+            elif kind == "Shape":
+                counts["blend_shapes"] += 1
+        elif node.name == "Model":
+            counts["models"] += 1
+
+            if object_class(data, node) == "LimbNode":
+                counts["bones"] += 1
+        elif node.name == "Deformer":
+            kind = object_class(data, node)
+
+            if kind == "Skin":
+                counts["skins"] += 1
+            elif kind == "Cluster":
+                counts["clusters"] += 1
+        elif node.name == "Material":
+            counts["materials"] += 1
+        elif node.name == "Texture":
+            counts["textures"] += 1
+            textures.add(read_properties(data, node)[0])
+        elif node.name == "Video":
+            counts["videos"] += 1
+            content = child(data, node, version, "Content")
+            blobs = [] if content is None else read_properties(data, content)
+
+            if blobs and isinstance(blobs[0], Blob) and blobs[0].size > 0:
+                counts["embedded_videos"] += 1
+                counts["embedded_bytes"] += blobs[0].size
+                embedded.add(read_properties(data, node)[0])
+        elif node.name == "AnimationStack":
+            stacks += 1
+        elif node.name == "AnimationCurve":
+            counts["animation_curves"] += 1
+            times = child(data, node, version, "KeyTime")
+
+            if times is not None:
+                # the element count is in the array header, the keys are not read
+                counts["animation_keys"] += read_properties(data, times)[0].length
+
+    counts["animation_stacks"] = max(counts["animation_stacks"], stacks)
+
+
+def count_geometry(
+    data: mmap.mmap, geometry: Node, version: int, counts: dict[str, int]
+):
+    normals = False
+
+    for node in children(data, geometry, version):
+        if node.name == "PolygonVertexIndex":
+            # the array header holds the number of corners, the (compressed) indices
+            # themselves are never read
+            counts["corners"] += read_properties(data, node)[0].length
+        elif node.name == "LayerElementNormal":
+            normals = True
+        elif node.name == "PreviewDivisionLevels":
+            if read_properties(data, node)[0] > 0:
+                counts["subdivided_meshes"] += 1
+
+    counts["meshes_with_normals"] += normals
+
+
+def read_unit_scale(data: mmap.mmap, settings: Node, version: int, default: float):
+    properties = child(data, settings, version, "Properties70")
+
+    if properties is None:
+        return default
+
+    for node in children(data, properties, version):
+        values = read_properties(data, node)
+
+        if node.name == "P" and values and values[0] == "UnitScaleFactor":
+            return float(values[-1])
+
+    return default
+
+
+def open_fbx(path: str) -> mmap.mmap:
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise UnsupportedFBX("not a binary FBX file")
+
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def read_summary(path: str) -> FBXSummary:
+    with open_fbx(path) as data:
+        try:
+            return summarize(data)
+        except (IndexError, ValueError, struct.error) as e:
+            raise UnsupportedFBX(f"damaged FBX file ({e})")
+
+
+def string_child(data: mmap.mmap, node: Node, version: int, name: str) -> str:
+    found = child(data, node, version, name)
+    values = [] if found is None else read_properties(data, found)
+
+    return values[0] if values and isinstance(values[0], str) else ""
+
+
+def texture_files(data: mmap.mmap) -> list[TextureFile]:
+    (version,) = struct.unpack_from("<I", data, VERSION_OFFSET)
+    files: dict[tuple[str, str], TextureFile] = {}
+    embedded: set[str] = set()
+
+    for objects in iter_nodes(data, NODES_OFFSET, len(data), version):
+        if objects.name != "Objects":
+            continue
+
+        for node in children(data, objects, version):
+            if node.name == "Texture":
+                filename = string_child(data, node, version, "FileName")
+                relative = string_child(data, node, version, "RelativeFilename")
+            elif node.name == "Video":
+                filename = string_child(data, node, version, "Filename")
+                relative = string_child(data, node, version, "RelativeFilename")
+                content = child(data, node, version, "Content")
+                blobs = [] if content is None else read_properties(data, content)
+
+                if blobs and isinstance(blobs[0], Blob) and blobs[0].size > 0:
+                    embedded.add(basename(filename or relative))
+                    continue
+            else:
+                continue
+
+            if filename or relative:
+                files[(filename, relative)] = TextureFile(filename, relative)
+
+    return [
+        f for f in files.values() if basename(f.filename or f.relative) not in embedded
+    ]
+
+
+def read_texture_files(path: str) -> list[TextureFile]:
+    with open_fbx(path) as data:
+        try:
+            return texture_files(data)
+        except (IndexError, ValueError, struct.error) as e:
+            raise UnsupportedFBX(f"damaged FBX file ({e})")
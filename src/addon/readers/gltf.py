@@ -0,0 +1,405 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import base64
+import binascii
+import contextlib
+import json
+import mmap
+import os
+import struct
+import typing
+import urllib.parse
+
+GLB_MAGIC = b"glTF"
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+# base64 payloads of data URIs are cut out before the JSON is parsed
+DATA_URI = b'"data:'
+DATA_MARKER = "#"
+
+# enough to find the size in the header of every image format glTF allows
+IMAGE_HEADER = 64 * 1024
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+KTX2_SIGNATURE = b"\xabKTX 20\xbb\r\n\x1a\n"
+
+# extensions that change what the importer has to do, by their common name
+EXTENSION_NAMES = {
+    "KHR_draco_mesh_compression": "Draco",
+    "EXT_meshopt_compression": "meshopt",
+    "KHR_meshopt_compression": "meshopt",
+    "KHR_texture_basisu": "KTX2",
+    "EXT_texture_webp": "WebP",
+    "EXT_mesh_gpu_instancing": "GPU instancing",
+}
+
+# primitive modes, 4 (triangles) when not given
+TRIANGLES = 4
+TRIANGLE_STRIP = 5
+TRIANGLE_FAN = 6
+
+
+class UnsupportedGLTF(Exception):
+    pass
+
+
+class Texture(typing.NamedTuple):
+    name: str
+    mime_type: str
+    width: int  # 0 when the header could not be read
+    height: int
+    size: int  # bytes of the encoded image
+
+
+class Resource(typing.NamedTuple):
+    kind: str  # "buffer" or "image"
+    index: int
+    uri: str  # data URIs are shortened to their media type
+    path: str  # external file, empty for data URIs
+    length: int  # byteLength of buffers, 0 for images
+    embedded: int  # decoded bytes of a data URI
+
+
+class GLTFSummary(typing.NamedTuple):
+    version: str
+    generator: str
+    scenes: int
+    nodes: int
+    meshes: int
+    primitives: int
+    vertices: int
+    triangles: int
+    materials: int
+    skins: int
+    animations: int
+    textures: list[Texture]
+    extensions: list[str]  # extensionsUsed
+    required: list[str]  # extensionsRequired
+    binary_bytes: int
+    data_uris: int
+    resources: list[Resource]
+
+
+class Source:
+    # the file is kept mapped while the summary is built, only headers are copied
+    def __init__(
+        self,
+        path: str,
+        data: mmap.mmap,
+        binary: tuple[int, int] | None,
+        data_uris: int,
+    ):
+        self.path = path
+        self.data = data
+        self.binary = binary  # offset and length of the BIN chunk of a GLB file
+        self.data_uris = data_uris
+
+    def data_uri(self, uri: str, offset: int, length: int) -> bytes:
+        # "data:...;base64,#start:end" as left by strip_data_uris
+        start, end = (int(v) for v in uri.rsplit(DATA_MARKER, 1)[1].split(":"))
+        first = start + offset // 3 * 4
+        last = min(end, start + (offset + length + 2) // 3 * 4)
+        raw = base64.b64decode(self.data[first:last])
+        skip = offset % 3
+
+        return raw[skip : skip + length]
+
+    def uri(self, uri: str, offset: int, length: int) -> bytes:
+        if uri.startswith("data:"):
+            return self.data_uri(uri, offset, length)
+
+        path = os.path.join(os.path.dirname(self.path), urllib.parse.unquote(uri))
+
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def read(
+        self, document: dict[str, typing.Any], index: int, offset: int, length: int
+    ) -> bytes:
+        uri = document["buffers"][index].get("uri", "")
+
+        if not uri:
+            # the buffer without uri is the BIN chunk of a GLB file
+            if self.binary is None:
+                return b""
+
+            start, size = self.binary
+            end = start + min(offset + length, size)
+            return self.data[start + offset : end]
+
+        return self.uri(uri, offset, length)
+
+
+def strip_data_uris(data: mmap.mmap, start: int, stop: int) -> tuple[bytes, int]:
+    parts: list[bytes] = []
+    count = 0
+    offset = start
+
+    while True:
+        found = data.find(DATA_URI, offset, stop)
+
+        if found < 0:
+            parts.append(data[offset:stop])
+            return b"".join(parts), count
+
+        # base64 has no quotes or escapes, the payload ends at the next quote
+        comma = data.find(b",", found, stop)
+        end = data.find(b'"', found + 1, stop)
+
+        if end < 0:
+            raise UnsupportedGLTF("unterminated data URI")
+
+        payload = comma + 1 if 0 <= comma < end else end
+        marker = f"{DATA_MARKER}{payload}:{end}".encode("ascii")
+        parts.append(data[offset:payload])
+        parts.append(marker)
+        count += 1
+        offset = end
+
+
+def open_glb(data: mmap.mmap) -> tuple[int, int, tuple[int, int] | None]:
+    magic, version, length = struct.unpack_from("<4sII", data, 0)
+
+    if magic != GLB_MAGIC or version != 2:
+        raise UnsupportedGLTF("not a glTF 2.0 binary file")
+
+    json_length, json_type = struct.unpack_from("<II", data, 12)
+
+    if json_type != CHUNK_JSON:
+        raise UnsupportedGLTF("the first chunk is not JSON")
+
+    json_start = 20
+    binary = None
+    offset = json_start + json_length
+
+    if offset + 8 <= min(length, len(data)):
+        bin_length, bin_type = struct.unpack_from("<II", data, offset)
+
+        if bin_type == CHUNK_BIN:
+            binary = (offset + 8, bin_length)
+
+    return json_start, json_start + json_length, binary
+
+
+def image_size(header: bytes) -> tuple[int, int]:
+    if header.startswith(PNG_SIGNATURE) and len(header) >= 24:
+        return struct.unpack_from(">II", header, 16)
+
+    if header.startswith(KTX2_SIGNATURE) and len(header) >= 28:
+        return struct.unpack_from("<II", header, 20)
+
+    if header.startswith(b"\xff\xd8"):
+        return jpeg_size(header)
+
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return webp_size(header)
+
+    return 0, 0
+
+
+def jpeg_size(header: bytes) -> tuple[int, int]:
+    offset = 2
+
+    while offset + 9 <= len(header):
+        if header[offset] != 0xFF:
+            return 0, 0
+
+        marker = header[offset + 1]
+
+        # start of frame markers, except DHT, JPG and DAC which share the range
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack_from(">HH", header, offset + 5)
+            return width, height
+
+        (length,) = struct.unpack_from(">H", header, offset + 2)
+        offset += 2 + length
+
+    return 0, 0
+
+
+def webp_size(header: bytes) -> tuple[int, int]:
+    chunk = header[12:16]
+
+    if chunk == b"VP8X" and len(header) >= 30:
+        width = int.from_bytes(header[24:27], "little") + 1
+        height = int.from_bytes(header[27:30], "little") + 1
+        return width, height
+
+    if chunk == b"VP8L" and len(header) >= 25:
+        (bits,) = struct.unpack_from("<I", header, 21)
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+
+    if chunk == b"VP8 " and len(header) >= 30:
+        width, height = struct.unpack_from("<HH", header, 26)
+        return width & 0x3FFF, height & 0x3FFF
+
+    return 0, 0
+
+
+def image_bytes(
+    source: Source, document: dict[str, typing.Any], image: dict[str, typing.Any]
+) -> tuple[bytes, int]:
+    # the header of the image and its encoded size
+    if "bufferView" in image:
+        view = document["bufferViews"][image["bufferView"]]
+        length = view["byteLength"]
+        header = source.read(
+            document,
+            view["buffer"],
+            view.get("byteOffset", 0),
+            min(length, IMAGE_HEADER),
+        )
+        return header, length
+
+    uri = image.get("uri", "")
+
+    if uri.startswith("data:"):
+        start, end = (int(v) for v in uri.rsplit(DATA_MARKER, 1)[1].split(":"))
+        return source.uri(uri, 0, IMAGE_HEADER), (end - start) * 3 // 4
+
+    path = os.path.join(os.path.dirname(source.path), urllib.parse.unquote(uri))
+    return source.uri(uri, 0, IMAGE_HEADER), os.path.getsize(path)
+
+
+def mime_type(image: dict[str, typing.Any]) -> str:
+    if "mimeType" in image:
+        return image["mimeType"]
+
+    uri = image.get("uri", "")
+
+    if uri.startswith("data:"):
+        return uri[5:].split(";", 1)[0]
+
+    extension = os.path.splitext(urllib.parse.unquote(uri))[1].lower()
+    return {".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".ktx2": "image/ktx2"}.get(
+        extension, f"image/{extension[1:]}"
+    )
+
+
+def read_textures(source: Source, document: dict[str, typing.Any]) -> list[Texture]:
+    textures: list[Texture] = []
+
+    for index, image in enumerate(document.get("images", [])):
+        name = image.get("name") or f"image {index}"
+
+        try:
+            header, size = image_bytes(source, document, image)
+            width, height = image_size(header)
+        except (OSError, KeyError, ValueError, IndexError, binascii.Error):
+            size, width, height = 0, 0, 0
+
+        textures.append(Texture(name, mime_type(image), width, height, size))
+
+    return textures
+
+
+def read_resources(source: Source, document: dict[str, typing.Any]) -> list[Resource]:
+    resources: list[Resource] = []
+    directory = os.path.dirname(os.path.abspath(source.path))
+
+    for kind, entries in [
+        ("buffer", document.get("buffers", [])),
+        ("image", document.get("images", [])),
+    ]:
+        for index, entry in enumerate(entries):
+            uri = entry.get("uri")
+            length = entry.get("byteLength", 0) if kind == "buffer" else 0
+
+            if uri is None:
+                continue
+
+            if uri.startswith("data:"):
+                start, end = (int(v) for v in uri.rsplit(DATA_MARKER, 1)[1].split(":"))
+                media = uri.split(",", 1)[0]
+                resources.append(
+                    Resource(kind, index, media, "", length, (end - start) * 3 // 4)
+                )
+            else:
+                path = os.path.join(directory, urllib.parse.unquote(uri))
+                resources.append(Resource(kind, index, uri, path, length, 0))
+
+    return resources
+
+
+def count_primitive(
+    document: dict[str, typing.Any], primitive: dict[str, typing.Any]
+) -> tuple[int, int]:
+    accessors = document.get("accessors", [])
+    position = primitive.get("attributes", {}).get("POSITION")
+    vertices = accessors[position]["count"] if position is not None else 0
+
+    indices = primitive.get("indices")
+    corners = accessors[indices]["count"] if indices is not None else vertices
+    mode = primitive.get("mode", TRIANGLES)
+
+    if mode == TRIANGLES:
+        return vertices, corners // 3
+    if mode in (TRIANGLE_STRIP, TRIANGLE_FAN):
+        return vertices, max(corners - 2, 0)
+
+    return vertices, 0
+
+
+def summarize(source: Source, document: dict[str, typing.Any]) -> GLTFSummary:
+    asset = document.get("asset", {})
+    meshes = document.get("meshes", [])
+    primitives = [p for m in meshes for p in m.get("primitives", [])]
+    counts = [count_primitive(document, p) for p in primitives]
+
+    return GLTFSummary(
+        version=asset.get("version", ""),
+        generator=asset.get("generator", ""),
+        scenes=len(document.get("scenes", [])),
+        nodes=len(document.get("nodes", [])),
+        meshes=len(meshes),
+        primitives=len(primitives),
+        vertices=sum(v for v, _ in counts),
+        triangles=sum(t for _, t in counts),
+        materials=len(document.get("materials", [])),
+        skins=len(document.get("skins", [])),
+        animations=len(document.get("animations", [])),
+        textures=read_textures(source, document),
+        extensions=document.get("extensionsUsed", []),
+        required=document.get("extensionsRequired", []),
+        binary_bytes=sum(b.get("byteLength", 0) for b in document.get("buffers", [])),
+        data_uris=source.data_uris,
+        resources=read_resources(source, document),
+    )
+
+
+@contextlib.contextmanager
+def open_document(path: str) -> typing.Iterator[tuple[Source, dict[str, typing.Any]]]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise UnsupportedGLTF("empty file")
+
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    with data:
+        try:
+            if data[:4] == GLB_MAGIC:
+                start, stop, binary = open_glb(data)
+            else:
+                start, stop, binary = 0, len(data), None
+
+            text, data_uris = strip_data_uris(data, start, stop)
+            document = json.loads(text)
+        except (ValueError, struct.error) as e:
+            raise UnsupportedGLTF(f"damaged glTF file ({e})")
+
+        yield Source(path, data, binary, data_uris), document
+
+
+def read_summary(path: str) -> GLTFSummary:
+    with open_document(path) as (source, document):
+        try:
+            return summarize(source, document)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise UnsupportedGLTF(f"damaged glTF file ({e})")
@@ -0,0 +1,486 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import copy
+import json
+import struct
+import typing
+
+from .gltf import (
+    CHUNK_BIN,
+    CHUNK_JSON,
+    GLB_MAGIC,
+    Source,
+    UnsupportedGLTF,
+    image_bytes,
+    mime_type,
+    open_document,
+)
+
+# buffer views are written at offsets aligned to the largest component type
+ALIGNMENT = 4
+
+# extensions naming the image a texture is read from
+TEXTURE_SOURCES = ["KHR_texture_basisu", "EXT_texture_webp", "EXT_texture_avif"]
+
+Document = dict[str, typing.Any]
+
+IDENTITY = [
+    1.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    1.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    1.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    1.0,
+]
+
+
+class TreeItem(typing.NamedTuple):
+    kind: str  # "SCENE" or "NODE"
+    index: int
+    name: str
+    depth: int
+
+
+class Subset(typing.NamedTuple):
+    nodes: int
+    meshes: int
+    accessors: int
+    binary_bytes: int
+
+
+def node_tree(document: Document) -> list[TreeItem]:
+    nodes = document.get("nodes", [])
+    items: list[TreeItem] = []
+    listed: set[int] = set()
+
+    def walk(index: int, depth: int):
+        # a node is listed once even when several scenes use it
+        if index in listed:
+            return
+
+        listed.add(index)
+        items.append(
+            TreeItem("NODE", index, nodes[index].get("name") or f"node {index}", depth)
+        )
+
+        for child in nodes[index].get("children", []):
+            walk(child, depth + 1)
+
+    for index, scene in enumerate(document.get("scenes", [])):
+        items.append(TreeItem("SCENE", index, scene.get("name") or f"scene {index}", 0))
+
+        for root in scene.get("nodes", []):
+            walk(root, 1)
+
+    children = {c for n in nodes for c in n.get("children", [])}
+
+    for index in range(len(nodes)):
+        if index not in children:
+            walk(index, 0)
+
+    return items
+
+
+def multiply(a: list[float], b: list[float]) -> list[float]:
+    # column major like glTF
+    return [
+        sum(a[k * 4 + row] * b[column * 4 + k] for k in range(4))
+        for column in range(4)
+        for row in range(4)
+    ]
+
+
+def local_matrix(node: dict[str, typing.Any]) -> list[float]:
+    if "matrix" in node:
+        return list(node["matrix"])
+
+    tx, ty, tz = node.get("translation", [0.0, 0.0, 0.0])
+    x, y, z, w = node.get("rotation", [0.0, 0.0, 0.0, 1.0])
+    sx, sy, sz = node.get("scale", [1.0, 1.0, 1.0])
+
+    return [
+        (1 - 2 * (y * y + z * z)) * sx,
+        (2 * (x * y + z * w)) * sx,
+        (2 * (x * z - y * w)) * sx,
+        0.0,
+        (2 * (x * y - z * w)) * sy,
+        (1 - 2 * (x * x + z * z)) * sy,
+        (2 * (y * z + x * w)) * sy,
+        0.0,
+        (2 * (x * z + y * w)) * sz,
+        (2 * (y * z - x * w)) * sz,
+        (1 - 2 * (x * x + y * y)) * sz,
+        0.0,
+        tx,
+        ty,
+        tz,
+        1.0,
+    ]
+
+
+def world_matrix(
+    document: Document, parents: dict[int, int], index: int
+) -> list[float]:
+    nodes = document["nodes"]
+    matrix = local_matrix(nodes[index])
+
+    while index in parents:
+        index = parents[index]
+        matrix = multiply(local_matrix(nodes[index]), matrix)
+
+    return matrix
+
+
+def select_nodes(document: Document, nodes: set[int], scenes: set[int]) -> list[int]:
+    all_nodes = document.get("nodes", [])
+    roots = set(nodes)
+
+    for scene in scenes:
+        roots.update(document["scenes"][scene].get("nodes", []))
+
+    selected: set[int] = set()
+    pending = list(roots)
+
+    # whole subtrees, plus the joints of every skin they use
+    while pending:
+        index = pending.pop()
+
+        if index in selected:
+            continue
+
+        selected.add(index)
+        pending.extend(all_nodes[index].get("children", []))
+
+        if "skin" in all_nodes[index]:
+            skin = document["skins"][all_nodes[index]["skin"]]
+            pending.extend(skin.get("joints", []))
+
+    return sorted(selected)
+
+
+class Remap:
+    # old index -> new index for one top level array, in first use order
+    def __init__(self):
+        self.indices: dict[int, int] = {}
+
+    def __call__(self, index: int) -> int:
+        return self.indices.setdefault(index, len(self.indices))
+
+    def order(self) -> list[int]:
+        return sorted(self.indices, key=self.indices.__getitem__)
+
+
+def remap_textures(value: typing.Any, textures: Remap):
+    # texture references are {"index": n} under keys ending with "Texture", also
+    # inside the material extensions
+    if isinstance(value, dict):
+        for key, child in value.items():
+            if key.endswith("Texture") and isinstance(child, dict) and "index" in child:
+                child["index"] = textures(child["index"])
+
+            remap_textures(child, textures)
+    elif isinstance(value, list):
+        for child in value:
+            remap_textures(child, textures)
+
+
+def trim(
+    source: Source, document: Document, selected: list[int]
+) -> tuple[Document, list[bytes]]:
+    if "EXT_meshopt_compression" in document.get("extensionsUsed", []):
+        raise UnsupportedGLTF("meshopt compressed buffers cannot be trimmed")
+
+    nodes = document["nodes"]
+    parents = {c: p for p, n in enumerate(nodes) for c in n.get("children", [])}
+    included = set(selected)
+    node_map = {old: new for new, old in enumerate(selected)}
+
+    meshes, skins, accessors, views = Remap(), Remap(), Remap(), Remap()
+    materials, textures, images = Remap(), Remap(), Remap()
+
+    trimmed: Document = {
+        key: document[key]
+        for key in ["asset", "extensionsUsed", "extensionsRequired", "extensions"]
+        if key in document
+    }
+    # cameras, samplers and lights are small and keep their indices
+    for key in ["cameras", "samplers"]:
+        if key in document:
+            trimmed[key] = document[key]
+
+    new_nodes: list[dict[str, typing.Any]] = []
+
+    for old in selected:
+        node = copy.deepcopy(nodes[old])
+        children = [node_map[c] for c in node.pop("children", []) if c in included]
+
+        if children:
+            node["children"] = children
+
+        if "mesh" in node:
+            node["mesh"] = meshes(node["mesh"])
+        if "skin" in node:
+            node["skin"] = skins(node["skin"])
+
+        new_nodes.append(node)
+
+    roots: list[int] = []
+
+    for old in selected:
+        if parents.get(old) in included:
+            continue
+
+        matrix = world_matrix(document, parents, parents[old]) if old in parents else []
+
+        if not matrix or matrix == IDENTITY:
+            roots.append(node_map[old])
+            continue
+
+        # the transform of the ancestors that were left out goes to a new parent, the
+        # root itself may be animated and animated nodes can't use a matrix
+        roots.append(len(new_nodes))
+        new_nodes.append(
+            {
+                "name": f"{nodes[old].get('name') or f'node {old}'} parent",
+                "matrix": matrix,
+                "children": [node_map[old]],
+            }
+        )
+
+    trimmed["nodes"] = new_nodes
+    trimmed["scenes"] = [{"nodes": roots}]
+    trimmed["scene"] = 0
+
+    trimmed["meshes"] = []
+
+    for old in meshes.order():
+        mesh = copy.deepcopy(document["meshes"][old])
+
+        for primitive in mesh.get("primitives", []):
+            attributes = primitive.get("attributes", {})
+
+            for name, accessor in attributes.items():
+                attributes[name] = accessors(accessor)
+
+            for target in primitive.get("targets", []):
+                for name, accessor in target.items():
+                    target[name] = accessors(accessor)
+
+            if "indices" in primitive:
+                primitive["indices"] = accessors(primitive["indices"])
+            if "material" in primitive:
+                primitive["material"] = materials(primitive["material"])
+
+            extensions = primitive.get("extensions", {})
+
+            if "KHR_draco_mesh_compression" in extensions:
+                draco = extensions["KHR_draco_mesh_compression"]
+                draco["bufferView"] = views(draco["bufferView"])
+
+            for mapping in extensions.get("KHR_materials_variants", {}).get(
+                "mappings", []
+            ):
+                mapping["material"] = materials(mapping["material"])
+
+        trimmed["meshes"].append(mesh)
+
+    if skins.indices:
+        trimmed["skins"] = []
+
+    for old in skins.order():
+        skin = copy.deepcopy(document["skins"][old])
+        skin["joints"] = [node_map[j] for j in skin["joints"]]
+
+        if skin.get("skeleton") in included:
+            skin["skeleton"] = node_map[skin["skeleton"]]
+        else:
+            skin.pop("skeleton", None)
+
+        if "inverseBindMatrices" in skin:
+            skin["inverseBindMatrices"] = accessors(skin["inverseBindMatrices"])
+
+        trimmed["skins"].append(skin)
+
+    animations = []
+
+    for source_animation in document.get("animations", []):
+        samplers = Remap()
+        channels = []
+
+        for channel in source_animation.get("channels", []):
+            if channel.get("target", {}).get("node") not in included:
+                continue
+
+            channel = copy.deepcopy(channel)
+            channel["target"]["node"] = node_map[channel["target"]["node"]]
+            channel["sampler"] = samplers(channel["sampler"])
+            channels.append(channel)
+
+        if not channels:
+            continue
+
+        animation = {
+            k: v
+            for k, v in source_animation.items()
+            if k not in ("channels", "samplers")
+        }
+        animation["channels"] = channels
+        animation["samplers"] = []
+
+        for old in samplers.order():
+            sampler = dict(source_animation["samplers"][old])
+            sampler["input"] = accessors(sampler["input"])
+            sampler["output"] = accessors(sampler["output"])
+            animation["samplers"].append(sampler)
+
+        animations.append(animation)
+
+    if animations:
+        trimmed["animations"] = animations
+
+    trimmed["materials"] = []
+
+    for old in materials.order():
+        material = copy.deepcopy(document["materials"][old])
+        remap_textures(material, textures)
+        trimmed["materials"].append(material)
+
+    trimmed["textures"] = []
+
+    for old in textures.order():
+        texture = copy.deepcopy(document["textures"][old])
+
+        if "source" in texture:
+            texture["source"] = images(texture["source"])
+
+        for name in TEXTURE_SOURCES:
+            extension = texture.get("extensions", {}).get(name)
+
+            if extension is not None and "source" in extension:
+                extension["source"] = images(extension["source"])
+
+        trimmed["textures"].append(texture)
+
+    trimmed["accessors"] = []
+
+    for old in accessors.order():
+        accessor = copy.deepcopy(document["accessors"][old])
+
+        if "bufferView" in accessor:
+            accessor["bufferView"] = views(accessor["bufferView"])
+
+        sparse = accessor.get("sparse")
+
+        if sparse is not None:
+            sparse["indices"]["bufferView"] = views(sparse["indices"]["bufferView"])
+            sparse["values"]["bufferView"] = views(sparse["values"]["bufferView"])
+
+        trimmed["accessors"].append(accessor)
+
+    chunks: list[bytes] = []
+    offset = 0
+
+    def append(data: bytes) -> int:
+        nonlocal offset
+
+        start = offset
+        padding = b"\0" * (-len(data) % ALIGNMENT)
+        chunks.append(data + padding)
+        offset += len(data) + len(padding)
+
+        return start
+
+    trimmed["bufferViews"] = []
+
+    for old in views.order():
+        view = dict(document["bufferViews"][old])
+        data = source.read(
+            document, view["buffer"], view.get("byteOffset", 0), view["byteLength"]
+        )
+        view["buffer"] = 0
+        view["byteOffset"] = append(data)
+        trimmed["bufferViews"].append(view)
+
+    # every image is stored in the binary chunk, the trimmed file is not next to the
+    # source file and relative paths would not resolve from it
+    trimmed["images"] = []
+
+    for old in images.order():
+        image = document["images"][old]
+        length = image_bytes(source, document, image)[1]
+
+        if "bufferView" in image:
+            view = document["bufferViews"][image["bufferView"]]
+            data = source.read(
+                document, view["buffer"], view.get("byteOffset", 0), length
+            )
+        else:
+            data = source.uri(image["uri"], 0, length)
+
+        trimmed["images"].append(
+            {
+                **{k: v for k, v in image.items() if k not in ("uri", "bufferView")},
+                "mimeType": mime_type(image),
+                "bufferView": len(trimmed["bufferViews"]),
+            }
+        )
+        trimmed["bufferViews"].append(
+            {"buffer": 0, "byteOffset": append(data), "byteLength": len(data)}
+        )
+
+    if offset > 0:
+        trimmed["buffers"] = [{"byteLength": offset}]
+
+    # empty arrays are not allowed by the schema
+    return {k: v for k, v in trimmed.items() if v != []}, chunks
+
+
+def write_glb(path: str, document: Document, chunks: list[bytes]):
+    text = json.dumps(document, separators=(",", ":")).encode("utf-8")
+    text += b" " * (-len(text) % 4)
+    binary = sum(len(c) for c in chunks)
+    length = 12 + 8 + len(text) + (8 + binary if binary else 0)
+
+    with open(path, "wb") as f:
+        f.write(struct.pack("<4sII", GLB_MAGIC, 2, length))
+        f.write(struct.pack("<II", len(text), CHUNK_JSON))
+        f.write(text)
+
+        if binary:
+            f.write(struct.pack("<II", binary, CHUNK_BIN))
+
+            for chunk in chunks:
+                f.write(chunk)
+
+
+def write_subset(path: str, output: str, nodes: set[int], scenes: set[int]) -> Subset:
+    with open_document(path) as (source, document):
+        try:
+            selected = select_nodes(document, nodes, scenes)
+            trimmed, chunks = trim(source, document, selected)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise UnsupportedGLTF(f"damaged glTF file ({e})")
+
+        write_glb(output, trimmed, chunks)
+
+    return Subset(
+        len(trimmed.get("nodes", [])),
+        len(trimmed.get("meshes", [])),
+        len(trimmed.get("accessors", [])),
+        sum(b["byteLength"] for b in trimmed.get("buffers", [])),
+    )
@@ -0,0 +1,152 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import os
+import struct
+import typing
+
+# ISO base media containers (mp4, mov, m4v, 3gp) store everything we need in the `moov` box,
+# so the (huge) `mdat` payload is skipped by seeking and no frame is ever decoded.
+ISOBMFF_EXTENSIONS = {".mp4", ".mov", ".m4v", ".3gp"}
+ISOBMFF_CONTAINERS = {b"moov", b"trak", b"mdia", b"minf", b"stbl"}
+
+# `moov` is usually a few MB at most, anything bigger is not a file we understand
+MAX_MOOV_SIZE = 256 * 1024 * 1024
+
+
+class MovieInfo(typing.NamedTuple):
+    width: int
+    height: int
+    fps: float
+    frame_count: int
+    duration: float
+
+
+def iter_boxes(
+    data: bytes | memoryview, start: int = 0, end: int | None = None
+) -> typing.Iterator[tuple[bytes, int, int]]:
+    end = len(data) if end is None else end
+    offset = start
+
+    while offset + 8 <= end:
+        size, kind = struct.unpack_from(">I4s", data, offset)
+        header = 8
+
+        if size == 1:
+            (size,) = struct.unpack_from(">Q", data, offset + 8)
+            header = 16
+        elif size == 0:
+            size = end - offset
+
+        if size < header:
+            return
+
+        yield kind, offset + header, min(offset + size, end)
+        offset += size
+
+
+def find_moov(path: str) -> bytes | None:
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        length = f.tell()
+        offset = 0
+
+        while offset + 8 <= length:
+            f.seek(offset)
+            header = f.read(16)
+            size, kind = struct.unpack_from(">I4s", header)
+            body = 8
+
+            if size == 1:
+                (size,) = struct.unpack_from(">Q", header, 8)
+                body = 16
+            elif size == 0:
+                size = length - offset
+
+            if size < body:
+                return None
+
+            if kind == b"moov":
+                if size > MAX_MOOV_SIZE:
+                    return None
+
+                f.seek(offset + body)
+                return f.read(size - body)
+
+            offset += size
+
+    return None
+
+
+def read_full_box_times(data: bytes, offset: int) -> tuple[int, int]:
+    # mvhd / mdhd: version(1) flags(3) then creation, modification, timescale, duration
+    version = data[offset]
+
+    if version == 1:
+        timescale, duration = struct.unpack_from(">IQ", data, offset + 20)
+    else:
+        timescale, duration = struct.unpack_from(">II", data, offset + 12)
+
+    return timescale, duration
+
+
+def read_track(data: bytes, start: int, end: int) -> MovieInfo | None:
+    width = height = 0
+    timescale = duration = 0
+    handler = b""
+    frame_count = 0
+
+    def walk(s: int, e: int):
+        nonlocal width, height, timescale, duration, handler, frame_count
+
+        for kind, body, box_end in iter_boxes(data, s, e):
+            if kind in ISOBMFF_CONTAINERS:
+                walk(body, box_end)
+            elif kind == b"tkhd":
+                skip = 32 if data[body] == 1 else 20
+                w, h = struct.unpack_from(">II", data, body + 4 + skip + 52)
+                width, height = w >> 16, h >> 16
+            elif kind == b"mdhd":
+                timescale, duration = read_full_box_times(data, body)
+            elif kind == b"hdlr":
+                handler = data[body + 8 : body + 12]
+            elif kind == b"stts":
+                (entries,) = struct.unpack_from(">I", data, body + 4)
+                counts = struct.unpack_from(f">{entries * 2}I", data, body + 8)
+                frame_count = sum(counts[0::2])
+
+    walk(start, end)
+
+    if handler != b"vide" or timescale == 0 or duration == 0:
+        return None
+
+    seconds = duration / timescale
+    return MovieInfo(width, height, frame_count / seconds, frame_count, seconds)
+
+
+def read_movie_info(path: str) -> MovieInfo | None:
+    _, ext = os.path.splitext(path)
+
+    if ext.lower() not in ISOBMFF_EXTENSIONS:
+        return None
+
+    try:
+        moov = find_moov(path)
+
+        if moov is None:
+            return None
+
+        for kind, body, end in iter_boxes(moov):
+            if kind == b"trak":
+                info = read_track(moov, body, end)
+
+                if info is not None:
+                    return info
+    except (OSError, struct.error, IndexError):
+        return None
+
+    return None
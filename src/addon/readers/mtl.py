@@ -0,0 +1,141 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import os
+import typing
+
+from .obj import MATERIAL_LIBRARY
+
+# number of values taken by the options of texture map statements (-o, -s and -t take 1-3)
+MAP_OPTIONS: dict[str, int] = {
+    "-blendu": 1,
+    "-blendv": 1,
+    "-bm": 1,
+    "-boost": 1,
+    "-cc": 1,
+    "-clamp": 1,
+    "-imfchan": 1,
+    "-mm": 2,
+    "-o": 3,
+    "-s": 3,
+    "-t": 3,
+    "-texres": 1,
+    "-type": 1,
+}
+MAP_STATEMENTS = {"bump", "decal", "disp", "norm", "refl"}
+
+
+class TextureReference(typing.NamedTuple):
+    material: str
+    statement: str
+    name: str  # as written in the MTL file
+    path: str  # resolved path, or the most likely one when missing
+    exists: bool
+
+
+def is_number(token: str) -> bool:
+    try:
+        float(token)
+        return True
+    except ValueError:
+        return False
+
+
+def map_filename(arguments: str) -> str:
+    tokens = arguments.split()
+    index = 0
+
+    while index < len(tokens) and tokens[index] in MAP_OPTIONS:
+        option = tokens[index]
+        index += 1
+
+        if option in ("-o", "-s", "-t"):
+            # up to three numbers, the last token is always kept for the file name
+            taken = 0
+
+            while taken < 3 and index < len(tokens) - 1 and is_number(tokens[index]):
+                index += 1
+                taken += 1
+        else:
+            index += MAP_OPTIONS[option]
+
+    # whatever remains is the file name, which may contain spaces
+    return " ".join(tokens[index:])
+
+
+def resolve(directory: str, name: str) -> tuple[str, bool]:
+    name = name.replace("\\", os.sep).replace("/", os.sep)
+    candidates = [
+        os.path.join(directory, name),
+        os.path.join(directory, os.path.basename(name)),
+    ]
+
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate, True
+
+    return candidates[0], False
+
+
+def material_libraries(obj_path: str, head: bytes) -> list[str]:
+    directory = os.path.dirname(obj_path)
+    libraries: list[str] = []
+
+    for line in MATERIAL_LIBRARY.findall(head):
+        # mtllib may list several files separated by spaces
+        for name in line.decode("utf-8", errors="replace").split():
+            path = os.path.join(directory, name)
+
+            if path not in libraries:
+                libraries.append(path)
+
+    return libraries
+
+
+def texture_references(mtl_path: str) -> typing.Iterator[TextureReference]:
+    directory = os.path.dirname(mtl_path)
+    material = ""
+
+    with open(mtl_path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            tokens = line.strip().split(maxsplit=1)
+
+            if len(tokens) < 2:
+                continue
+
+            statement = tokens[0]
+
+            if statement == "newmtl":
+                material = tokens[1].strip()
+            elif statement.startswith("map_") or statement.lower() in MAP_STATEMENTS:
+                name = map_filename(tokens[1])
+
+                if name:
+                    path, exists = resolve(directory, name)
+                    yield TextureReference(material, statement, name, path, exists)
+
+
+def read_color_and_texture(
+    mtl_path: str, material: str
+) -> tuple[tuple[float, float, float] | None, str | None]:
+    color = None
+    current = None
+
+    with open(mtl_path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            tokens = line.split()
+
+            if len(tokens) >= 2 and tokens[0] == "newmtl":
+                current = line.split(maxsplit=1)[1].strip()
+            elif current == material and len(tokens) >= 4 and tokens[0] == "Kd":
+                color = (float(tokens[1]), float(tokens[2]), float(tokens[3]))
+
+    for reference in texture_references(mtl_path):
+        if reference.material == material and reference.statement == "map_Kd":
+            return color, reference.path
+
+    return color, None
@@ -0,0 +1,234 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import os
+import re
+import typing
+
+import numpy as np
+
+# files are streamed in blocks of this size, cut at the last line break
+CHUNK_SIZE = 64 * 1024 * 1024
+
+VERTEX = re.compile(rb"^v[ \t]+([^\n]*)", re.M)
+TEXCOORD = re.compile(rb"^vt[ \t]+([^\n]*)", re.M)
+NORMAL = re.compile(rb"^vn[ \t]+([^\n]*)", re.M)
+FACE = re.compile(rb"^f[ \t]+([^\n]*)", re.M)
+OBJECT = re.compile(rb"^o[ \t]+([^\n]*)", re.M)
+MATERIAL = re.compile(rb"^usemtl[ \t]+([^\n\r]*)", re.M)
+MATERIAL_LIBRARY = re.compile(rb"^mtllib[ \t]+([^\n\r]*)", re.M)
+
+# records the fast path does not handle at all
+UNSUPPORTED = re.compile(rb"^(vp|l|cstype|curv|curv2|surf|deg|bmat|step)[ \t]", re.M)
+
+WHITESPACE = np.frombuffer(b" \t\r\n", dtype=np.uint8)
+
+
+class UnsupportedOBJ(Exception):
+    pass
+
+
+class OBJData(typing.NamedTuple):
+    vertices: np.ndarray  # (V, 3) float32
+    corner_verts: np.ndarray  # (L,) int32
+    face_starts: np.ndarray  # (F,) int32
+    uvs: np.ndarray | None  # (L, 2) float32, per corner
+    normals: np.ndarray | None  # (L, 3) float32, per corner
+    material: str | None
+    material_libraries: list[str]
+
+
+def parse_floats(lines: list[bytes], min_width: int, width: int) -> np.ndarray:
+    if not lines:
+        return np.empty((0, width), dtype=np.float32)
+
+    values = np.fromstring(b"\n".join(lines), dtype=np.float32, sep=" ")
+
+    # v may carry w or vertex colors, vt may carry w, keep the leading columns only
+    if values.size % len(lines) != 0 or values.size // len(lines) < min_width:
+        raise UnsupportedOBJ("records with varying number of components")
+
+    return values.reshape(len(lines), -1)[:, :width]
+
+
+def token_counts(text: bytes, lines: int) -> np.ndarray:
+    data = np.frombuffer(text, dtype=np.uint8)
+    is_token = ~np.isin(data, WHITESPACE)
+    starts = is_token.copy()
+    starts[1:] &= ~is_token[:-1]
+    line = np.cumsum(data == ord("\n"))
+
+    return np.bincount(line[starts], minlength=lines).astype(np.int32)
+
+
+def parse_faces(
+    lines: list[bytes],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray | None, np.ndarray | None]:
+    if not lines:
+        empty = np.empty(0, dtype=np.int32)
+        return empty, empty, None, None
+
+    text = b"\n".join(lines)
+    counts = token_counts(text, len(lines))
+
+    # the layout of the first corner (v, v/t, v//n or v/t/n) is assumed for the whole block
+    first = lines[0].split()[0]
+    has_uv = first.count(b"/") >= 1 and b"//" not in first
+    has_normal = first.count(b"/") == 2
+    width = 1 + has_uv + has_normal
+
+    text = text.replace(b"//", b" ") if b"//" in first else text.replace(b"/", b" ")
+    values = np.fromstring(text, dtype=np.int64, sep=" ")
+
+    if values.size != counts.sum() * width:
+        raise UnsupportedOBJ("faces with mixed index layouts")
+
+    lowest = values.min() if values.size > 0 else 1
+
+    if lowest < 0:
+        raise UnsupportedOBJ("negative (relative) indices")
+
+    # indices start at 1, a 0 would wrap around to the last element once shifted
+    if lowest == 0:
+        raise UnsupportedOBJ("invalid index 0")
+
+    values = values.reshape(-1, width) - 1
+    column = 1
+
+    uv_indices = None
+    normal_indices = None
+
+    if has_uv:
+        uv_indices = values[:, column].astype(np.int32)
+        column += 1
+
+    if has_normal:
+        normal_indices = values[:, column].astype(np.int32)
+
+    return values[:, 0].astype(np.int32), counts, uv_indices, normal_indices
+
+
+def check_indices(indices: np.ndarray, count: int, kind: str):
+    if indices.size > 0 and indices.max() >= count:
+        raise UnsupportedOBJ(f"{kind} indices out of range")
+
+
+def gather(values: np.ndarray, indices: np.ndarray, kind: str) -> np.ndarray:
+    check_indices(indices, len(values), kind)
+    return values[indices]
+
+
+def iter_chunks(path: str, chunk_size: int) -> typing.Iterator[bytes]:
+    with open(path, "rb") as f:
+        rest = b""
+
+        while True:
+            block = f.read(chunk_size)
+
+            if not block:
+                if rest:
+                    yield rest
+                return
+
+            block = rest + block
+            cut = block.rfind(b"\n") + 1
+
+            if cut == 0:
+                rest = block
+                continue
+
+            rest = block[cut:]
+            yield block[:cut]
+
+
+def read_obj(path: str, chunk_size: int = CHUNK_SIZE) -> OBJData:
+    vertices: list[np.ndarray] = []
+    texcoords: list[np.ndarray] = []
+    normals: list[np.ndarray] = []
+    corner_verts: list[np.ndarray] = []
+    face_sizes: list[np.ndarray] = []
+    corner_uvs: list[np.ndarray] = []
+    corner_normals: list[np.ndarray] = []
+
+    layout: tuple[bool, bool] | None = None
+    objects = 0
+    materials: set[bytes] = set()
+    libraries: list[str] = []
+
+    for chunk in iter_chunks(path, chunk_size):
+        unsupported = UNSUPPORTED.search(chunk)
+
+        if unsupported is not None:
+            raise UnsupportedOBJ(f"{unsupported.group(1).decode()} records")
+
+        objects += len(OBJECT.findall(chunk))
+        materials.update(m.strip() for m in MATERIAL.findall(chunk))
+        libraries.extend(l.strip().decode() for l in MATERIAL_LIBRARY.findall(chunk))
+
+        if objects > 1:
+            raise UnsupportedOBJ("multiple objects")
+
+        if len(materials) > 1:
+            raise UnsupportedOBJ("multiple materials")
+
+        vertices.append(parse_floats(VERTEX.findall(chunk), 3, 3))
+        texcoords.append(parse_floats(TEXCOORD.findall(chunk), 2, 2))
+        normals.append(parse_floats(NORMAL.findall(chunk), 3, 3))
+
+        verts, sizes, uvs, norms = parse_faces(FACE.findall(chunk))
+
+        if len(sizes) == 0:
+            continue
+
+        if layout is not None and layout != (uvs is not None, norms is not None):
+            raise UnsupportedOBJ("faces with mixed index layouts")
+
+        layout = (uvs is not None, norms is not None)
+        corner_verts.append(verts)
+        face_sizes.append(sizes)
+
+        if uvs is not None:
+            corner_uvs.append(uvs)
+        if norms is not None:
+            corner_normals.append(norms)
+
+    # empty files and point clouds are left to the built-in importer
+    if not corner_verts:
+        raise UnsupportedOBJ("no faces")
+
+    all_vertices = np.concatenate(vertices)
+    all_corners = np.concatenate(corner_verts)
+    sizes = np.concatenate(face_sizes)
+
+    if np.any(sizes < 3):
+        raise UnsupportedOBJ("faces with less than three corners")
+
+    check_indices(all_corners, len(all_vertices), "vertex")
+    face_starts = (np.cumsum(sizes) - sizes).astype(np.int32)
+
+    uvs = None
+    if corner_uvs:
+        uvs = gather(np.concatenate(texcoords), np.concatenate(corner_uvs), "uv")
+
+    corner_normal = None
+    if corner_normals:
+        corner_normal = gather(
+            np.concatenate(normals), np.concatenate(corner_normals), "normal"
+        )
+
+    material = next(iter(materials)).decode() if materials else None
+    directory = os.path.dirname(path)
+
+    return OBJData(
+        all_vertices,
+        all_corners,
+        face_starts,
+        uvs,
+        corner_normal,
+        material,
+        [os.path.join(directory, l) for l in libraries],
+    )
@@ -0,0 +1,150 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import os
+import re
+import typing
+
+from .obj import (
+    CHUNK_SIZE,
+    FACE,
+    MATERIAL_LIBRARY,
+    NORMAL,
+    TEXCOORD,
+    UNSUPPORTED,
+    VERTEX,
+    UnsupportedOBJ,
+    iter_chunks,
+    parse_floats,
+)
+
+BOUNDARY = re.compile(rb"^(o|g|usemtl)[ \t]+([^\n\r]*)", re.M)
+
+# pool name -> (record pattern, number of stored components)
+POOLS: dict[str, tuple[re.Pattern[bytes], int]] = {
+    "v": (VERTEX, 3),
+    "vt": (TEXCOORD, 2),
+    "vn": (NORMAL, 3),
+}
+
+
+class Pool(typing.NamedTuple):
+    path: str  # raw float32 rows
+    count: int
+    width: int
+
+
+class Shard(typing.NamedTuple):
+    name: str
+    path: str  # f and usemtl records, indices still refer to the global pools
+    size: int
+
+
+class SplitOBJ(typing.NamedTuple):
+    shards: list[Shard]
+    pools: dict[str, Pool]
+    material_libraries: list[str]
+
+
+class ShardWriter:
+    def __init__(self, directory: str, name: str, index: int):
+        self.name = name
+        self.path = os.path.join(directory, f"{index:05d}.faces")
+        self.size = 0
+        self.material: bytes | None = None
+
+    def write(self, segment: bytes, material: bytes | None):
+        lines = FACE.findall(segment)
+
+        if not lines:
+            return
+
+        faces = b"f " + b"\nf ".join(lines) + b"\n"
+
+        # relative indices depend on the position in the original file
+        if b"-" in faces:
+            raise UnsupportedOBJ("negative (relative) indices")
+
+        with open(self.path, "ab") as f:
+            if material is not None and material != self.material:
+                f.write(b"usemtl " + material + b"\n")
+                self.material = material
+
+            f.write(faces)
+
+        self.size += len(faces)
+
+
+def split_obj(
+    path: str,
+    directory: str,
+    split_groups: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    progress: typing.Callable[[int], None] | None = None,
+) -> SplitOBJ:
+    default = os.path.splitext(os.path.basename(path))[0]
+    counts = {key: 0 for key in POOLS}
+    files = {key: open(os.path.join(directory, f"{key}.pool"), "wb") for key in POOLS}
+    writers: dict[str, ShardWriter] = {}
+    libraries: list[str] = []
+    material: bytes | None = None
+    done = 0
+
+    def writer(name: str) -> ShardWriter:
+        # objects that appear again later in the file continue their shard
+        if name not in writers:
+            writers[name] = ShardWriter(directory, name, len(writers))
+
+        return writers[name]
+
+    current = writer(default)
+
+    try:
+        for chunk in iter_chunks(path, chunk_size):
+            unsupported = UNSUPPORTED.search(chunk)
+
+            if unsupported is not None:
+                raise UnsupportedOBJ(f"{unsupported.group(1).decode()} records")
+
+            libraries.extend(
+                l.strip().decode() for l in MATERIAL_LIBRARY.findall(chunk)
+            )
+
+            for key, (pattern, width) in POOLS.items():
+                values = parse_floats(pattern.findall(chunk), width, width)
+                values.tofile(files[key])
+                counts[key] += len(values)
+
+            start = 0
+
+            for match in BOUNDARY.finditer(chunk):
+                current.write(chunk[start : match.start()], material)
+                keyword, name = match.group(1), match.group(2).strip()
+
+                if keyword == b"usemtl":
+                    material = name
+                elif keyword == b"o" or split_groups:
+                    current = writer(name.decode("utf-8", errors="replace") or default)
+
+                start = match.end()
+
+            current.write(chunk[start:], material)
+            done += len(chunk)
+
+            if progress is not None:
+                progress(done)
+    finally:
+        for f in files.values():
+            f.close()
+
+    source = os.path.dirname(path)
+
+    return SplitOBJ(
+        [Shard(w.name, w.path, w.size) for w in writers.values() if w.size > 0],
+        {key: Pool(f.name, counts[key], POOLS[key][1]) for key, f in files.items()},
+        [os.path.join(source, l) for l in libraries],
+    )
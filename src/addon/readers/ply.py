@@ -0,0 +1,346 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import typing
+
+import numpy as np
+
+PLY_TYPES: dict[str, str] = {
+    "char": "i1",
+    "int8": "i1",
+    "uchar": "u1",
+    "uint8": "u1",
+    "short": "i2",
+    "int16": "i2",
+    "ushort": "u2",
+    "uint16": "u2",
+    "int": "i4",
+    "int32": "i4",
+    "uint": "u4",
+    "uint32": "u4",
+    "float": "f4",
+    "float32": "f4",
+    "double": "f8",
+    "float64": "f8",
+}
+
+BYTE_ORDERS: dict[str, str] = {
+    "ascii": "=",
+    "binary_little_endian": "<",
+    "binary_big_endian": ">",
+}
+
+# ~64 MB of float32 triples, used when converting memory-mapped data in place
+CHUNK_SIZE = 1 << 22
+
+
+class PLYProperty(typing.NamedTuple):
+    name: str
+    type: str
+    is_list: bool
+    count_type: str = ""  # type of the length prefix of list properties
+
+
+class PLYElement(typing.NamedTuple):
+    name: str
+    count: int
+    properties: list[PLYProperty]
+
+
+class PLYHeader(typing.NamedTuple):
+    format: str
+    elements: list[PLYElement]
+    size: int  # bytes up to and including "end_header\n"
+
+    def element(self, name: str) -> PLYElement | None:
+        for element in self.elements:
+            if element.name == name:
+                return element
+
+        return None
+
+    def count(self, name: str) -> int:
+        element = self.element(name)
+        return 0 if element is None else element.count
+
+
+def read_property(tokens: list[str]) -> PLYProperty:
+    if tokens[1] == "list":
+        prop = PLYProperty(tokens[4], tokens[3], True, tokens[2])
+    else:
+        prop = PLYProperty(tokens[2], tokens[1], False)
+
+    # unknown types would otherwise only fail later, when building the dtype
+    if prop.type not in PLY_TYPES or (
+        prop.is_list and prop.count_type not in PLY_TYPES
+    ):
+        raise KeyError(prop.type)
+
+    return prop
+
+
+def read_header(path: str) -> PLYHeader:
+    elements: list[PLYElement] = []
+    format = ""
+    size = 0
+
+    with open(path, "rb") as f:
+        first_line = f.readline()
+
+        if first_line.strip() != b"ply":
+            raise ValueError(f"{path} is not a PLY file")
+
+        # "ply\r\n" in files written on Windows
+        size = len(first_line)
+
+        for raw in f:
+            size += len(raw)
+            tokens = raw.decode("ascii", errors="replace").split()
+
+            if not tokens or tokens[0] in ("comment", "obj_info"):
+                continue
+
+            if tokens[0] == "end_header":
+                break
+
+            try:
+                if tokens[0] == "format":
+                    format = tokens[1]
+                elif tokens[0] == "element":
+                    elements.append(PLYElement(tokens[1], int(tokens[2]), []))
+                elif tokens[0] == "property":
+                    elements[-1].properties.append(read_property(tokens))
+            except (IndexError, KeyError):
+                raise ValueError(f"{path} has a damaged header line {raw!r}")
+        else:
+            raise ValueError(f"{path} has no end_header")
+
+    if format not in BYTE_ORDERS:
+        raise ValueError(f"{path} has unsupported format {format}")
+
+    return PLYHeader(format, elements, size)
+
+
+def element_dtype(header: PLYHeader, element: PLYElement) -> np.dtype | None:
+    if any(p.is_list for p in element.properties):
+        return None
+
+    order = BYTE_ORDERS[header.format]
+    return np.dtype([(p.name, order + PLY_TYPES[p.type]) for p in element.properties])
+
+
+def element_offset(path: str, header: PLYHeader, target: PLYElement) -> int:
+    offset = header.size
+
+    for element in header.elements:
+        if element is target:
+            break
+
+        preceding = element_dtype(header, element)
+
+        if preceding is None:
+            raise ValueError(
+                f"{path} has variable sized elements before the {target.name} element"
+            )
+
+        offset += preceding.itemsize * element.count
+
+    return offset
+
+
+def map_vertices(
+    path: str, header: PLYHeader, fields: typing.Iterable[str] = ()
+) -> np.ndarray:
+    vertex = header.element("vertex")
+
+    if vertex is None:
+        raise ValueError(f"{path} has no vertex element")
+
+    dtype = element_dtype(header, vertex)
+
+    if dtype is None:
+        raise ValueError(f"{path} has list properties in its vertex element")
+
+    if header.format == "ascii":
+        # text can't be mapped, so parse only the requested columns of the vertex rows
+        names = [p.name for p in vertex.properties]
+        wanted = [n for n in names if n in set(fields)] or names
+
+        with open(path, "rb") as f:
+            f.seek(header.size)
+
+            for element in header.elements:
+                if element is vertex:
+                    break
+
+                for _ in range(element.count):
+                    f.readline()
+
+            return np.loadtxt(
+                f,
+                dtype=np.dtype([(n, dtype[n]) for n in wanted]),
+                usecols=[names.index(n) for n in wanted],
+                max_rows=vertex.count,
+                ndmin=1,
+            )
+
+    offset = element_offset(path, header, vertex)
+
+    # a view over the file, fields that are never touched are never converted (or copied)
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(vertex.count,))
+
+
+def face_layout(path: str, face: PLYElement) -> tuple[int, PLYProperty]:
+    # (position of the index list among the face properties, the list)
+    lists = [i for i, p in enumerate(face.properties) if p.is_list]
+
+    if len(lists) != 1:
+        raise ValueError(f"{path} has {len(lists)} list properties in its face element")
+
+    return lists[0], face.properties[lists[0]]
+
+
+def read_binary_faces(
+    path: str, header: PLYHeader, face: PLYElement
+) -> tuple[np.ndarray, np.ndarray]:
+    order = BYTE_ORDERS[header.format]
+    before, indices = face_layout(path, face)
+    sizes = [np.dtype(PLY_TYPES[p.type]).itemsize for p in face.properties]
+    prefix = sum(sizes[:before])
+    suffix = sum(sizes[before + 1 :])
+    count_dtype = np.dtype(order + PLY_TYPES[indices.count_type])
+    index_dtype = np.dtype(order + PLY_TYPES[indices.type])
+
+    data = np.memmap(
+        path, dtype=np.uint8, mode="r", offset=element_offset(path, header, face)
+    )
+    first = int(data[prefix : prefix + count_dtype.itemsize].view(count_dtype)[0])
+
+    # simulation exports are usually all triangles, which is a fixed size record
+    record = np.dtype(
+        [
+            ("prefix", np.uint8, (prefix,)),
+            ("count", count_dtype),
+            ("indices", index_dtype, (first,)),
+            ("suffix", np.uint8, (suffix,)),
+        ]
+    )
+
+    if record.itemsize * face.count <= len(data):
+        faces = data[: record.itemsize * face.count].view(record)
+
+        if np.all(faces["count"] == first):
+            corner_verts = np.array(faces["indices"], dtype=np.int32).ravel()
+            return corner_verts, np.arange(0, len(corner_verts), first, dtype=np.int32)
+
+    # mixed face sizes, only the length prefixes are walked one by one
+    raw = data.tobytes()
+    byteorder = "big" if order == ">" else "little"
+    counts = np.empty(face.count, dtype=np.int64)
+    starts = np.empty(face.count, dtype=np.int64)
+    position = 0
+
+    for i in range(face.count):
+        position += prefix
+        count = int.from_bytes(
+            raw[position : position + count_dtype.itemsize], byteorder
+        )
+        counts[i] = count
+        starts[i] = position + count_dtype.itemsize
+        position += count_dtype.itemsize + count * index_dtype.itemsize + suffix
+
+    face_starts = np.cumsum(counts) - counts
+    within = np.arange(counts.sum()) - np.repeat(face_starts, counts)
+    offsets = np.repeat(starts, counts) + within * index_dtype.itemsize
+    buffer = np.frombuffer(raw, dtype=np.uint8)
+    corner_bytes = buffer[offsets[:, None] + np.arange(index_dtype.itemsize)]
+    corner_verts = corner_bytes.copy().view(index_dtype).ravel()
+
+    return corner_verts.astype(np.int32), face_starts.astype(np.int32)
+
+
+def read_ascii_faces(
+    path: str, header: PLYHeader, face: PLYElement
+) -> tuple[np.ndarray, np.ndarray]:
+    before, _ = face_layout(path, face)
+    corners: list[int] = []
+    counts: list[int] = []
+
+    with open(path, "rb") as f:
+        f.seek(header.size)
+
+        for element in header.elements:
+            if element is face:
+                break
+
+            for _ in range(element.count):
+                f.readline()
+
+        for _ in range(face.count):
+            tokens = f.readline().split()
+            count = int(tokens[before])
+            counts.append(count)
+            corners.extend(int(t) for t in tokens[before + 1 : before + 1 + count])
+
+    face_counts = np.array(counts, dtype=np.int32)
+
+    return (
+        np.array(corners, dtype=np.int32),
+        (np.cumsum(face_counts) - face_counts).astype(np.int32),
+    )
+
+
+def read_faces(path: str, header: PLYHeader) -> tuple[np.ndarray, np.ndarray]:
+    # (corner_verts, face_starts) in the layout create_mesh takes
+    face = header.element("face")
+
+    if face is None or face.count == 0:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+
+    if header.format == "ascii":
+        return read_ascii_faces(path, header, face)
+
+    return read_binary_faces(path, header, face)
+
+
+def positions(vertices: np.ndarray, matrix: np.ndarray | None = None) -> np.ndarray:
+    out = np.empty((len(vertices), 3), dtype=np.float32)
+
+    for start in range(0, len(vertices), CHUNK_SIZE):
+        chunk = vertices[start : start + CHUNK_SIZE]
+        block = out[start : start + CHUNK_SIZE]
+        block[:, 0] = chunk["x"]
+        block[:, 1] = chunk["y"]
+        block[:, 2] = chunk["z"]
+
+        if matrix is not None:
+            block[:] = block @ matrix.T
+
+    return out
+
+
+def colors(vertices: np.ndarray) -> np.ndarray | None:
+    names = vertices.dtype.names or ()
+
+    if not all(c in names for c in ("red", "green", "blue")):
+        return None
+
+    out = np.ones((len(vertices), 4), dtype=np.float32)
+    channels = [c for c in ("red", "green", "blue", "alpha") if c in names]
+
+    for start in range(0, len(vertices), CHUNK_SIZE):
+        chunk = vertices[start : start + CHUNK_SIZE]
+        block = out[start : start + CHUNK_SIZE]
+
+        for index, channel in enumerate(channels):
+            values = chunk[channel]
+            block[:, index] = values
+
+            if values.dtype.kind in "iu":
+                block[:, index] /= np.iinfo(values.dtype).max
+
+    return out
@@ -0,0 +1,72 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# point reduction on (memory-mapped) structured vertex arrays with x, y and z fields,
+# every function returns the sorted indices of the points to keep
+
+from __future__ import annotations
+
+import numpy as np
+
+from .ply import CHUNK_SIZE
+
+# voxel coordinates are packed into a single int64, 21 bits per axis
+VOXEL_BITS = 21
+VOXEL_LIMIT = 1 << VOXEL_BITS
+
+
+def stride_indices(count: int, stride: int) -> np.ndarray:
+    return np.arange(0, count, max(1, stride), dtype=np.int64)
+
+
+def random_indices(count: int, ratio: float, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    kept: list[np.ndarray] = []
+
+    # draw per chunk so a 300M point scan doesn't need a 300M element permutation
+    for start in range(0, count, CHUNK_SIZE):
+        size = min(CHUNK_SIZE, count - start)
+        kept.append(np.flatnonzero(rng.random(size) < ratio) + start)
+
+    return np.concatenate(kept) if kept else np.empty(0, dtype=np.int64)
+
+
+def voxel_indices(vertices: np.ndarray, size: float) -> np.ndarray:
+    count = len(vertices)
+
+    if count == 0:
+        return np.empty(0, dtype=np.int64)
+
+    lower = np.full(3, np.inf)
+    upper = np.full(3, -np.inf)
+
+    for start in range(0, count, CHUNK_SIZE):
+        chunk = vertices[start : start + CHUNK_SIZE]
+
+        for axis, name in enumerate(("x", "y", "z")):
+            lower[axis] = min(lower[axis], chunk[name].min())
+            upper[axis] = max(upper[axis], chunk[name].max())
+
+    if np.any((upper - lower) / size >= VOXEL_LIMIT):
+        raise ValueError(f"voxel size {size} is too small for the extent of the points")
+
+    # keep the first point of every voxel, deduplicated per chunk and then across chunks
+    keys: list[np.ndarray] = []
+    firsts: list[np.ndarray] = []
+
+    for start in range(0, count, CHUNK_SIZE):
+        chunk = vertices[start : start + CHUNK_SIZE]
+        key = np.zeros(len(chunk), dtype=np.int64)
+
+        for axis, name in enumerate(("x", "y", "z")):
+            cell = ((chunk[name] - lower[axis]) / size).astype(np.int64)
+            key |= cell << (VOXEL_BITS * axis)
+
+        key, first = np.unique(key, return_index=True)
+        keys.append(key)
+        firsts.append(first + start)
+
+    _, first = np.unique(np.concatenate(keys), return_index=True)
+    return np.sort(np.concatenate(firsts)[first])
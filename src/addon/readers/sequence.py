@@ -0,0 +1,112 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import bisect
+import os
+import re
+import typing
+
+import numpy as np
+
+from . import ply
+from .obj import read_obj
+from .stl import read_stl
+
+SEQUENCE_EXTENSIONS = {".obj", ".stl", ".ply"}
+
+# the last run of digits before the extension, "fluid_0001.obj" -> ("fluid_", "0001", ".obj")
+NUMBERED = re.compile(r"^(.*?)(\d+)(\.[^.]+)$")
+
+
+class Sequence(typing.NamedTuple):
+    directory: str
+    prefix: str
+    extension: str
+    numbers: list[int]  # sorted, may have gaps
+    names: list[str]  # file names in the same order
+
+    def path(self, index: int) -> str:
+        return os.path.join(self.directory, self.names[index])
+
+    def index(self, offset: int) -> int:
+        # frames missing from the numbering hold the file before them
+        target = self.numbers[0] + offset
+        return max(0, bisect.bisect_right(self.numbers, target) - 1)
+
+
+class Frame(typing.NamedTuple):
+    vertices: np.ndarray  # (V, 3) float32, already transformed
+    corner_verts: np.ndarray  # (L,) int32, empty for point clouds
+    face_starts: np.ndarray  # (F,) int32
+
+    def size(self) -> int:
+        return self.vertices.nbytes + self.corner_verts.nbytes + self.face_starts.nbytes
+
+
+def find_sequence(path: str) -> Sequence | None:
+    directory, name = os.path.split(os.path.abspath(path))
+    match = NUMBERED.match(name)
+
+    if match is None or match.group(3).lower() not in SEQUENCE_EXTENSIONS:
+        return None
+
+    prefix, extension = match.group(1), match.group(3)
+    frames: list[tuple[int, str]] = []
+
+    # one pass over the directory, thousands of frames are common for simulations
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            other = NUMBERED.match(entry.name)
+
+            if (
+                other is not None
+                and other.group(1) == prefix
+                and other.group(3).lower() == extension.lower()
+                and entry.is_file()
+            ):
+                frames.append((int(other.group(2)), entry.name))
+
+    if len(frames) < 2:
+        return None
+
+    frames.sort()
+
+    return Sequence(
+        directory,
+        prefix,
+        extension,
+        [n for n, _ in frames],
+        [f for _, f in frames],
+    )
+
+
+def transform(vertices: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    return (vertices @ matrix.T).astype(np.float32, copy=False)
+
+
+def read_frame(path: str, matrix: np.ndarray) -> Frame:
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".obj":
+        data = read_obj(path)
+        return Frame(
+            transform(data.vertices, matrix), data.corner_verts, data.face_starts
+        )
+
+    if extension == ".stl":
+        data = read_stl(path)
+        return Frame(
+            transform(data.vertices, matrix),
+            data.triangles.astype(np.int32).ravel(),
+            np.arange(0, len(data.triangles) * 3, 3, dtype=np.int32),
+        )
+
+    header = ply.read_header(path)
+    vertices = ply.positions(ply.map_vertices(path, header, ("x", "y", "z")), matrix)
+    corner_verts, face_starts = ply.read_faces(path, header)
+
+    return Frame(vertices, corner_verts, face_starts)
@@ -0,0 +1,85 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import os
+import re
+import typing
+
+import numpy as np
+
+BINARY_HEADER_SIZE = 84
+BINARY_TRIANGLE = np.dtype(
+    [
+        ("normal", "<f4", (3,)),
+        ("vertices", "<f4", (3, 3)),
+        ("attribute", "<u2"),
+    ]
+)
+
+ASCII_VERTEX = re.compile(rb"vertex\s+(\S+)\s+(\S+)\s+(\S+)")
+ASCII_NORMAL = re.compile(rb"facet\s+normal\s+(\S+)\s+(\S+)\s+(\S+)")
+
+
+class STLData(typing.NamedTuple):
+    vertices: np.ndarray  # (V, 3) float32, welded
+    triangles: np.ndarray  # (T, 3) int32, indices into vertices
+    normals: np.ndarray | None  # (T, 3) float32 facet normals
+
+
+def is_binary(path: str) -> bool:
+    size = os.path.getsize(path)
+
+    if size < BINARY_HEADER_SIZE:
+        return False
+
+    with open(path, "rb") as f:
+        header = f.read(BINARY_HEADER_SIZE)
+
+    # "solid" is also used as a header by some binary exporters, so trust the size instead
+    count = int.from_bytes(header[80:84], "little")
+    return size == BINARY_HEADER_SIZE + count * BINARY_TRIANGLE.itemsize
+
+
+def weld(corners: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # compare the raw 12 bytes of every corner, which sorts much faster than np.unique(axis=0),
+    # adding zero copies into a contiguous array and folds -0.0 into 0.0 so both are welded
+    corners = np.add(corners, 0, dtype=np.float32)
+    keys = corners.view(np.dtype((np.void, corners.dtype.itemsize * 3))).ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+    return corners[first], inverse.astype(np.int32).reshape(-1, 3)
+
+
+def read_binary(path: str, read_normals: bool) -> STLData:
+    triangles = np.memmap(
+        path, dtype=BINARY_TRIANGLE, mode="r", offset=BINARY_HEADER_SIZE
+    )
+    vertices, indices = weld(triangles["vertices"].reshape(-1, 3))
+    normals = np.array(triangles["normal"]) if read_normals else None
+
+    return STLData(vertices, indices, normals)
+
+
+def read_ascii(path: str, read_normals: bool) -> STLData:
+    with open(path, "rb") as f:
+        text = f.read()
+
+    corners = np.array(ASCII_VERTEX.findall(text), dtype=np.float32)
+    vertices, indices = weld(corners.reshape(-1, 3))
+    normals = None
+
+    if read_normals:
+        normals = np.array(ASCII_NORMAL.findall(text), dtype=np.float32).reshape(-1, 3)
+
+    return STLData(vertices, indices, normals)
+
+
+def read_stl(path: str, read_normals: bool = False) -> STLData:
+    if is_binary(path):
+        return read_binary(path, read_normals)
+
+    return read_ascii(path, read_normals)
@@ -0,0 +1,621 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import contextlib
+import mmap
+import os
+import re
+import struct
+import typing
+
+import numpy as np
+
+USDA_MAGIC = b"#usda"
+USDC_MAGIC = b"PXR-USDC"
+USDZ_MAGIC = b"PK\x03\x04"
+
+# usdz packages are zip files with stored (uncompressed) entries aligned to 64 bytes
+ZIP_LOCAL_HEADER = 30
+ZIP_CENTRAL_HEADER = 46
+ZIP_END = b"PK\x05\x06"
+ZIP_END_SIZE = 22
+ZIP64_END_LOCATOR = b"PK\x06\x07"
+ZIP64_EXTRA = 0x0001
+ZIP_STORED = 0
+ZIP_LIMIT = 0xFFFFFFFF
+LAYER_EXTENSIONS = {".usd", ".usda", ".usdc"}
+
+# sections of the crate file, the values between the header and them are never read
+SECTION_TOKENS = "TOKENS"
+SECTION_FIELDS = "FIELDS"
+SECTION_FIELDSETS = "FIELDSETS"
+SECTION_PATHS = "PATHS"
+SECTION_SPECS = "SPECS"
+
+# structural sections are compressed from crate 0.4.0
+COMPRESSED_VERSION = (0, 4, 0)
+
+SPEC_PRIM = 6
+
+# value reps, the low 48 bits are the inlined value or the offset of the value
+REP_INLINED = 1 << 62
+REP_PAYLOAD = (1 << 48) - 1
+
+# strings, comments and asset paths may contain braces that are not part of the hierarchy
+USDA_TOKEN = re.compile(
+    rb'"""[\s\S]*?"""'
+    rb"|'''[\s\S]*?'''"
+    rb'|"(?:[^"\\\n]|\\.)*"'
+    rb"|'(?:[^'\\\n]|\\.)*'"
+    rb"|@[^@\n]*@"
+    rb"|#[^\n]*"
+    rb"|[{}()\[]"
+    rb"|\b(?:def|over|class)\b"
+)
+USDA_PRIM = re.compile(
+    rb'(?:def|over|class)[ \t]+(?:([A-Za-z_][\w:]*)[ \t]+)?"([^"\n]*)"'
+)
+
+
+class UnsupportedUSD(Exception):
+    pass
+
+
+class PackageEntry(typing.NamedTuple):
+    name: str
+    offset: int  # of the data, after the local header
+    size: int  # bytes in the package
+    length: int  # bytes once extracted
+    compression: int
+
+
+class Prim(typing.NamedTuple):
+    path: str
+    name: str
+    type_name: str  # empty for typeless prims
+    depth: int
+    size: int  # approximate bytes of the prim and its descendants in the file
+    payload: bool
+
+
+def read_usda(data: mmap.mmap, start: int, end: int) -> list[Prim]:
+    prims: list[Prim] = []
+    # one entry per open brace, the index of the prim it opened or -1
+    braces: list[int] = []
+    parents: list[int] = []
+    pending: tuple[int, int, Prim] | None = None
+    parens = 0
+    offset = start
+
+    while (token := USDA_TOKEN.search(data, offset, end)) is not None:
+        text = token.group()
+        offset = token.end()
+
+        if text == b"[":
+            # numeric arrays are the bulk of a text layer, skip them without tokenizing
+            close = data.find(b"]", offset, end)
+
+            if close >= 0 and data.find(b'"', offset, close) < 0:
+                offset = close + 1
+
+            continue
+
+        if text == b"(":
+            parens += 1
+        elif text == b")":
+            parens = max(0, parens - 1)
+        elif text in (b"{", b"}") and parens > 0:
+            # dictionaries in metadata, e.g. customData = { dictionary Blender = {...} },
+            # are balanced inside their parentheses and never open a prim or variant
+            continue
+        elif text == b"{":
+            # prims inside variants are not at the path the mask would name
+            if braces and braces[-1] < 0:
+                pending = None
+
+            if pending is not None:
+                prim_start, metadata, prim = pending
+                parent = parents[-1] if parents else -1
+                path = f"{prims[parent].path if parent >= 0 else ''}/{prim.name}"
+
+                prims.append(
+                    prim._replace(
+                        path=path,
+                        depth=len(parents),
+                        size=prim_start,
+                        payload=b"payload" in data[metadata : token.start()],
+                    )
+                )
+                parents.append(len(prims) - 1)
+                braces.append(len(prims) - 1)
+                pending = None
+            else:
+                braces.append(-1)
+        elif text == b"}":
+            if braces and (index := braces.pop()) >= 0:
+                prims[index] = prims[index]._replace(size=offset - prims[index].size)
+                parents.pop()
+        elif text in (b"def", b"over", b"class") and parens == 0:
+            prim = USDA_PRIM.match(data, token.start(), end)
+
+            if prim is not None:
+                type_name = (prim.group(1) or b"").decode("utf-8")
+                name = prim.group(2).decode("utf-8")
+                pending = (
+                    token.start(),
+                    prim.end(),
+                    Prim("", name, type_name, 0, 0, False),
+                )
+                offset = prim.end()
+
+    # prims left open by a truncated file end with it
+    for index in braces:
+        if index >= 0:
+            prims[index] = prims[index]._replace(size=end - prims[index].size)
+
+    return prims
+
+
+def decompress_lz4(data: bytes, size: int) -> bytes:
+    output = bytearray()
+    offset = 0
+
+    while offset < len(data):
+        token = data[offset]
+        offset += 1
+        length = token >> 4
+
+        if length == 15:
+            while True:
+                length += data[offset]
+                offset += 1
+
+                if data[offset - 1] != 255:
+                    break
+
+        output += data[offset : offset + length]
+        offset += length
+
+        # the last sequence has literals only
+        if offset >= len(data):
+            break
+
+        distance = data[offset] | data[offset + 1] << 8
+        offset += 2
+        length = token & 15
+
+        if length == 15:
+            while True:
+                length += data[offset]
+                offset += 1
+
+                if data[offset - 1] != 255:
+                    break
+
+        length += 4
+        start = len(output) - distance
+
+        if distance <= 0 or start < 0:
+            raise UnsupportedUSD("damaged compressed section")
+
+        if distance >= length:
+            output += output[start : start + length]
+        else:
+            # the match overlaps what it writes, the copied bytes repeat
+            output += (output[start:] * (length // distance + 1))[:length]
+
+    if len(output) > size:
+        raise UnsupportedUSD("damaged compressed section")
+
+    return bytes(output)
+
+
+def decompress(data: bytes, size: int) -> bytes:
+    chunks = data[0]
+
+    if chunks == 0:
+        return decompress_lz4(data[1:], size)
+
+    parts: list[bytes] = []
+    offset = 1
+
+    for _ in range(chunks):
+        (length,) = struct.unpack_from("<i", data, offset)
+        parts.append(decompress_lz4(data[offset + 4 : offset + 4 + length], size))
+        offset += 4 + length
+
+    return b"".join(parts)
+
+
+def decode_integers(data: bytes, count: int) -> np.ndarray:
+    # a common delta, two bits per value choosing it or a delta of 1, 2 or 4 bytes
+    (common,) = struct.unpack_from("<i", data)
+    codes_size = (count * 2 + 7) // 8
+    packed = np.frombuffer(data, np.uint8, codes_size, 4)
+    shifts = np.array([0, 2, 4, 6], np.uint8)
+    codes = ((packed[:, None] >> shifts) & 3).reshape(-1)[:count]
+
+    widths = np.array([0, 1, 2, 4])[codes]
+    offsets = 4 + codes_size + np.cumsum(widths) - widths
+    raw = np.frombuffer(data, np.uint8)
+    deltas = np.full(count, common, np.int64)
+
+    for code, dtype in (
+        (1, np.dtype("<i1")),
+        (2, np.dtype("<i2")),
+        (3, np.dtype("<i4")),
+    ):
+        mask = codes == code
+
+        if mask.any():
+            indices = offsets[mask][:, None] + np.arange(dtype.itemsize)
+            deltas[mask] = raw[indices].copy().view(dtype).reshape(-1)
+
+    return np.cumsum(deltas).astype(np.int32)
+
+
+class CrateReader:
+    # offsets in the crate are relative to its start, which is not 0 inside a package
+    def __init__(self, data: mmap.mmap, base: int):
+        self.data = data
+        self.base = base
+        self.version = tuple(data[base + 8 : base + 11])
+
+        if self.version < COMPRESSED_VERSION:
+            raise UnsupportedUSD(
+                f"crate version {'.'.join(map(str, self.version))} is not supported"
+            )
+
+        (toc,) = struct.unpack_from("<Q", data, base + 16)
+        toc += base
+        (count,) = struct.unpack_from("<Q", data, toc)
+        self.sections: dict[str, tuple[int, int]] = {}
+
+        for index in range(count):
+            name, start, size = struct.unpack_from("<16sqq", data, toc + 8 + index * 32)
+            self.sections[name.rstrip(b"\0").decode("ascii")] = (start, size)
+
+        self.offset = 0
+
+    def seek(self, section: str):
+        if section not in self.sections:
+            raise UnsupportedUSD(f"no {section} section")
+
+        self.offset = self.base + self.sections[section][0]
+
+    def uint64(self) -> int:
+        (value,) = struct.unpack_from("<Q", self.data, self.offset)
+        self.offset += 8
+        return value
+
+    def read(self, size: int) -> bytes:
+        value = self.data[self.offset : self.offset + size]
+        self.offset += size
+        return value
+
+    def integers(self, count: int) -> np.ndarray:
+        size = self.uint64()
+
+        if count == 0:
+            self.offset += size
+            return np.zeros(0, np.int32)
+
+        # the encoded form is at most a common value, the codes and 4 bytes per value
+        encoded = decompress(self.read(size), 4 + (count * 2 + 7) // 8 + count * 4)
+        return decode_integers(encoded, count)
+
+    def tokens(self) -> list[str]:
+        self.seek(SECTION_TOKENS)
+        count = self.uint64()
+        size = self.uint64()
+        compressed = self.uint64()
+        text = decompress(self.read(compressed), size)
+
+        return [t.decode("utf-8", "replace") for t in text.split(b"\0")[:count]]
+
+    def fields(self) -> tuple[np.ndarray, np.ndarray]:
+        self.seek(SECTION_FIELDS)
+        count = self.uint64()
+        tokens = self.integers(count)
+        size = self.uint64()
+        reps = np.frombuffer(decompress(self.read(size), count * 8), "<u8")
+
+        return tokens, reps
+
+    def fieldsets(self) -> np.ndarray:
+        self.seek(SECTION_FIELDSETS)
+        return self.integers(self.uint64())
+
+    def paths(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        self.seek(SECTION_PATHS)
+        self.uint64()
+        count = self.uint64()
+
+        return self.integers(count), self.integers(count), self.integers(count)
+
+    def specs(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        self.seek(SECTION_SPECS)
+        count = self.uint64()
+
+        return self.integers(count), self.integers(count), self.integers(count)
+
+    def values_end(self) -> int:
+        # values are written between the header and the first structural section
+        return min(start for start, _ in self.sections.values())
+
+
+def value_sizes(reps: np.ndarray, end: int) -> np.ndarray:
+    # a value reaches up to the next value, so the payloads themselves are never read
+    stored = (reps & REP_INLINED) == 0
+    offsets = (reps & REP_PAYLOAD).astype(np.int64)
+    starts = np.unique(np.append(offsets[stored], end))
+    following = np.searchsorted(starts, offsets, side="right")
+    following = np.minimum(following, len(starts) - 1)
+    sizes = np.where(stored, starts[following] - offsets, 0)
+
+    return np.maximum(sizes, 0)
+
+
+def read_usdc(data: mmap.mmap, base: int) -> list[Prim]:
+    crate = CrateReader(data, base)
+    tokens = crate.tokens()
+    field_tokens, reps = crate.fields()
+    fieldsets = crate.fieldsets()
+    path_indexes, element_tokens, jumps = crate.paths()
+    spec_paths, spec_fieldsets, spec_types = crate.specs()
+
+    # the path tree is stored depth first with jumps to the next sibling
+    parent_of: dict[int, int] = {}
+    names: dict[int, str] = {}
+    owners: dict[int, int] = {}
+    siblings: list[int] = []
+    parent = -1
+
+    for index in range(len(path_indexes)):
+        path = int(path_indexes[index])
+        token = int(element_tokens[index])
+        jump = int(jumps[index])
+
+        parent_of[path] = parent
+        names[path] = tokens[abs(token)] if parent >= 0 else ""
+
+        # properties, variant selections and everything below them belong to the prim
+        # above them, negative tokens are properties
+        if parent < 0:
+            owners[path] = path
+        elif (
+            token >= 0 and not names[path].startswith("{") and owners[parent] == parent
+        ):
+            owners[path] = path
+        else:
+            owners[path] = owners[parent]
+
+        if jump > 0 or jump == -1:
+            if jump >= 0:
+                siblings.append(parent)
+
+            parent = path
+        elif jump < 0:
+            parent = siblings.pop() if siblings else -1
+
+    sizes = value_sizes(reps, crate.values_end())
+    valid = fieldsets >= 0
+    cumulative = np.concatenate(
+        ([0], np.cumsum(np.where(valid, sizes[np.where(valid, fieldsets, 0)], 0)))
+    )
+    terminators = np.flatnonzero(~valid)
+    ends = terminators[np.searchsorted(terminators, spec_fieldsets)]
+    spec_sizes = cumulative[ends] - cumulative[spec_fieldsets]
+
+    field_names = [tokens[t] for t in field_tokens]
+    own_sizes: dict[int, int] = {}
+    prims: dict[int, tuple[str, bool]] = {}
+
+    for path, fieldset, kind, size in zip(
+        spec_paths.tolist(),
+        spec_fieldsets.tolist(),
+        spec_types.tolist(),
+        spec_sizes.tolist(),
+    ):
+        owner = owners.get(path, path)
+        own_sizes[owner] = own_sizes.get(owner, 0) + size
+
+        if kind != SPEC_PRIM or owner != path:
+            continue
+
+        type_name = ""
+        payload = False
+        end = fieldset
+
+        while fieldsets[end] >= 0:
+            field = int(fieldsets[end])
+            end += 1
+
+            if field_names[field] == "typeName" and reps[field] & REP_INLINED:
+                type_name = tokens[int(reps[field] & 0xFFFFFFFF)]
+            elif field_names[field] == "payload":
+                payload = True
+
+        prims[path] = (type_name, payload)
+
+    children: dict[int, list[int]] = {}
+
+    for path in prims:
+        parent = parent_of[path]
+
+        while parent >= 0 and parent not in prims:
+            parent = parent_of[parent]
+
+        children.setdefault(parent, []).append(path)
+
+    items: list[Prim] = []
+
+    def walk(path: int, prefix: str, depth: int) -> int:
+        index = len(items)
+        full = f"{prefix}/{names[path]}"
+        type_name, payload = prims[path]
+        items.append(Prim(full, names[path], type_name, depth, 0, payload))
+
+        size = own_sizes.get(path, 0)
+
+        for child in children.get(path, []):
+            size += walk(child, full, depth + 1)
+
+        items[index] = items[index]._replace(size=size)
+        return size
+
+    for root in children.get(-1, []):
+        walk(root, "", 0)
+
+    return items
+
+
+def zip64_extra(extra: bytes, values: list[int]) -> list[int]:
+    # 64-bit values are stored in the extra field for each 32-bit field that is full
+    offset = 0
+
+    while offset + 4 <= len(extra):
+        kind, size = struct.unpack_from("<HH", extra, offset)
+
+        if kind == ZIP64_EXTRA:
+            field = offset + 4
+            values = list(values)
+
+            for index, value in enumerate(values):
+                if value == ZIP_LIMIT:
+                    (values[index],) = struct.unpack_from("<Q", extra, field)
+                    field += 8
+
+            return values
+
+        offset += 4 + size
+
+    return values
+
+
+def package_entries(data: mmap.mmap) -> list[PackageEntry]:
+    # the end record is followed by a comment of up to 64 KB
+    end = data.rfind(ZIP_END, max(0, len(data) - ZIP_END_SIZE - 0xFFFF))
+
+    if end < 0:
+        raise UnsupportedUSD("damaged USDZ package")
+
+    count, _, directory = struct.unpack_from("<HII", data, end + 10)
+
+    if data[end - 20 : end - 16] == ZIP64_END_LOCATOR:
+        (end64,) = struct.unpack_from("<Q", data, end - 12)
+        count, _, directory = struct.unpack_from("<QQQ", data, end64 + 32)
+
+    entries: list[PackageEntry] = []
+    offset = directory
+
+    for _ in range(count):
+        compression, size, length, name_length, extra_length, comment_length = (
+            struct.unpack_from("<H8xIIHHH", data, offset + 10)
+        )
+        (local,) = struct.unpack_from("<I", data, offset + 42)
+        name = data[
+            offset + ZIP_CENTRAL_HEADER : offset + ZIP_CENTRAL_HEADER + name_length
+        ]
+        extra = data[
+            offset
+            + ZIP_CENTRAL_HEADER
+            + name_length : offset
+            + ZIP_CENTRAL_HEADER
+            + name_length
+            + extra_length
+        ]
+        length, size, local = zip64_extra(extra, [length, size, local])
+
+        # the local header has its own extra field, usdz writers pad it for alignment
+        local_name, local_extra = struct.unpack_from("<HH", data, local + 26)
+        entries.append(
+            PackageEntry(
+                name.decode("utf-8", "replace"),
+                local + ZIP_LOCAL_HEADER + local_name + local_extra,
+                size,
+                length,
+                compression,
+            )
+        )
+        offset += ZIP_CENTRAL_HEADER + name_length + extra_length + comment_length
+
+    return entries
+
+
+def root_layer(entries: list[PackageEntry]) -> PackageEntry:
+    # the first layer in a package is its root layer
+    for entry in entries:
+        if os.path.splitext(entry.name)[1].lower() in LAYER_EXTENSIONS:
+            if entry.compression != ZIP_STORED:
+                raise UnsupportedUSD("the root layer of the package is compressed")
+
+            return entry
+
+    raise UnsupportedUSD("no USD layer in the package")
+
+
+@contextlib.contextmanager
+def open_usd(path: str) -> typing.Iterator[mmap.mmap]:
+    with open(path, "rb") as f:
+        magic = f.read(8)
+
+        if (
+            not magic.startswith(USDA_MAGIC)
+            and not magic.startswith(USDZ_MAGIC)
+            and magic != USDC_MAGIC
+        ):
+            raise UnsupportedUSD("not a USD file")
+
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    with data:
+        yield data
+
+
+def read_prims(path: str) -> list[Prim]:
+    with open_usd(path) as data:
+        try:
+            start, end = 0, len(data)
+
+            # the root layer of a package is read in place, nothing is extracted
+            if data[:4] == USDZ_MAGIC:
+                layer = root_layer(package_entries(data))
+                start, end = layer.offset, layer.offset + layer.size
+
+            if data[start : start + 8] == USDC_MAGIC:
+                return read_usdc(data, start)
+
+            if data[start : start + 5] == USDA_MAGIC:
+                return read_usda(data, start, end)
+        except (IndexError, KeyError, ValueError, struct.error) as e:
+            raise UnsupportedUSD(f"damaged USD file ({e})")
+
+    raise UnsupportedUSD("not a USD file")
+
+
+def read_package(path: str) -> list[PackageEntry]:
+    with open_usd(path) as data:
+        if data[:4] != USDZ_MAGIC:
+            return []
+
+        try:
+            return package_entries(data)
+        except (IndexError, ValueError, struct.error) as e:
+            raise UnsupportedUSD(f"damaged USDZ package ({e})")
+
+
+def prim_path_mask(paths: typing.Iterable[str]) -> str:
+    # descendants are imported with their ancestor, listing them again is redundant
+    selected = sorted(set(paths))
+    kept: list[str] = []
+
+    for path in selected:
+        if not any(path.startswith(f"{k}/") for k in kept):
+            kept.append(path)
+
+    return ",".join(kept)
@@ -0,0 +1,74 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# pyright: reportGeneralTypeIssues=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+
+from __future__ import annotations
+
+import json
+import os
+import typing
+
+import bpy
+
+ADDON_PACKAGE = __package__.rpartition(".")[0] if __package__ else ""
+HISTORY_FILE = "import_history.json"
+
+
+class VariantHistory(typing.TypedDict):
+    runs: int
+    failures: int
+    mb_per_second: float
+
+
+def storage_dir() -> str:
+    try:
+        return bpy.utils.extension_path_user(ADDON_PACKAGE, create=True)
+    except (AttributeError, ValueError):
+        # installed as a legacy add-on instead of an extension
+        path = os.path.join(bpy.utils.user_resource("CONFIG"), "drag_and_drop_support")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+
+def load() -> dict[str, dict[str, VariantHistory]]:
+    try:
+        with open(os.path.join(storage_dir(), HISTORY_FILE), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save(history: dict[str, dict[str, VariantHistory]]):
+    path = os.path.join(storage_dir(), HISTORY_FILE)
+
+    try:
+        with open(path + ".tmp", "w") as f:
+            json.dump(history, f, indent=2)
+
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"failed to save import history: {e}")
+
+
+def record(format: str, variant: str, size: int, seconds: float | None):
+    history = load()
+    entry = history.setdefault(format, {}).setdefault(
+        variant, {"runs": 0, "failures": 0, "mb_per_second": 0.0}
+    )
+
+    if seconds is None:
+        entry["failures"] += 1
+    else:
+        # running mean of the throughput, which is comparable across file sizes
+        throughput = size / (1024 * 1024) / max(seconds, 1e-6)
+        entry["mb_per_second"] += (throughput - entry["mb_per_second"]) / (
+            entry["runs"] + 1
+        )
+        entry["runs"] += 1
+
+    save(history)
@@ -0,0 +1,145 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# pyright: reportGeneralTypeIssues=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+
+from __future__ import annotations
+
+import hashlib
+import os
+import typing
+
+import bpy
+
+from concurrent.futures import ThreadPoolExecutor
+
+WORKERS = 8
+BLOCK_SIZE = 4 * 1024 * 1024
+
+
+class ImageSavings(typing.NamedTuple):
+    merged: int
+    merged_bytes: int  # packed or file bytes of the merged duplicates
+    scaled: int
+    packed_before: int  # packed bytes of the downscaled images
+    packed_after: int  # can be larger, compressed formats may be packed again as PNG
+
+
+def source_size(image: bpy.types.Image) -> int:
+    # the pixels are not decoded, reading image.size would load them
+    if image.packed_file is not None:
+        return image.packed_file.size
+
+    try:
+        return os.path.getsize(bpy.path.abspath(image.filepath, library=image.library))
+    except OSError:
+        return 0
+
+
+def hash_file(path: str) -> str | None:
+    digest = hashlib.blake2b(digest_size=16)
+
+    try:
+        with open(path, "rb") as f:
+            while block := f.read(BLOCK_SIZE):
+                digest.update(block)
+    except OSError:
+        return None
+
+    return digest.hexdigest()
+
+
+def source_hashes(images: list[bpy.types.Image]) -> dict[bpy.types.Image, str]:
+    hashes: dict[bpy.types.Image, str] = {}
+    files: dict[bpy.types.Image, str] = {}
+
+    for image in images:
+        if image.packed_file is not None:
+            # packed data is only reachable from the main thread
+            data = image.packed_file.data
+            hashes[image] = hashlib.blake2b(data, digest_size=16).hexdigest()
+        elif image.source == "FILE" and image.filepath:
+            files[image] = bpy.path.abspath(image.filepath, library=image.library)
+
+    # the same texture is often written next to the model once per material
+    with ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="hash") as pool:
+        for image, digest in zip(files, pool.map(hash_file, files.values())):
+            if digest is not None:
+                hashes[image] = digest
+
+    return hashes
+
+
+def deduplicate(
+    images: list[bpy.types.Image],
+) -> tuple[list[bpy.types.Image], int, int]:
+    kept: dict[tuple[str, str, str], bpy.types.Image] = {}
+    duplicates: list[tuple[bpy.types.Image, bpy.types.Image]] = []
+
+    for image, digest in source_hashes(images).items():
+        # the same bytes read as color and as data are different images to Blender
+        key = (digest, image.colorspace_settings.name, image.alpha_mode)
+        original = kept.setdefault(key, image)
+
+        if original is not image:
+            duplicates.append((image, original))
+
+    removed = {image for image, _ in duplicates}
+    remaining = [i for i in images if i not in removed]
+    merged_bytes = 0
+
+    for image, original in duplicates:
+        merged_bytes += source_size(image)
+
+        image.user_remap(original)
+        bpy.data.images.remove(image)
+
+    return remaining, len(duplicates), merged_bytes
+
+
+def downscale(images: list[bpy.types.Image], max_size: int) -> tuple[int, int, int]:
+    scaled = 0
+    packed_before = 0
+    packed_after = 0
+
+    for image in images:
+        # external files would come back at full size when the file is reopened
+        if image.packed_file is None:
+            continue
+
+        width, height = image.size
+        longest = max(width, height)
+
+        if longest <= max_size:
+            continue
+
+        packed_before += image.packed_file.size
+        factor = max_size / longest
+
+        image.scale(max(1, round(width * factor)), max(1, round(height * factor)))
+        image.pack()
+
+        packed_after += image.packed_file.size
+        scaled += 1
+
+    return scaled, packed_before, packed_after
+
+
+def optimize(
+    images: list[bpy.types.Image], merge_duplicates: bool, max_size: int
+) -> ImageSavings:
+    merged, merged_bytes = 0, 0
+
+    if merge_duplicates:
+        images, merged, merged_bytes = deduplicate(images)
+
+    scaled, packed_before, packed_after = 0, 0, 0
+
+    if max_size > 0:
+        scaled, packed_before, packed_after = downscale(images, max_size)
+
+    return ImageSavings(merged, merged_bytes, scaled, packed_before, packed_after)
@@ -0,0 +1,158 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# pyright: reportGeneralTypeIssues=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+
+from __future__ import annotations
+
+import os
+import sys
+import typing
+
+import bpy
+
+from bpy.types import Context
+
+# data created by importers that may be left without users
+ID_COLLECTIONS = [
+    "actions",
+    "armatures",
+    "cameras",
+    "curves",
+    "images",
+    "lights",
+    "materials",
+    "meshes",
+    "node_groups",
+    "textures",
+]
+
+
+def current_rss_mb() -> float | None:
+    if sys.platform == "linux":
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+    if sys.platform == "win32":
+        import ctypes
+        import ctypes.wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", ctypes.wintypes.DWORD),
+                ("PageFaultCount", ctypes.wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            process, ctypes.byref(counters), counters.cb
+        )
+        return counters.WorkingSetSize / (1024 * 1024)
+
+    # macOS only exposes the peak through the standard library, which is not what the
+    # import keeps
+    return None
+
+
+def snapshot_ids() -> set[bpy.types.ID]:
+    return {i for name in ID_COLLECTIONS for i in getattr(bpy.data, name)}
+
+
+def purge_new_orphans(before: set[bpy.types.ID]) -> int:
+    # only data created by the import is removed, older orphans belong to the user
+    removed = 0
+
+    while True:
+        orphans = [i for i in snapshot_ids() - before if i.users == 0]
+
+        if not orphans:
+            return removed
+
+        bpy.data.batch_remove(orphans)
+        removed += len(orphans)
+
+
+def still_open(
+    window: bpy.types.Window | None,
+    area: bpy.types.Area | None,
+    region: bpy.types.Region | None,
+) -> dict[str, typing.Any]:
+    # the window, area and region of the drop may have been closed in the meantime
+    windows = list(bpy.context.window_manager.windows)
+
+    if window not in windows:
+        return {"window": windows[0]} if windows else {}
+
+    if area is None or area not in list(window.screen.areas):
+        return {"window": window}
+
+    if region is None or region not in list(area.regions):
+        return {"window": window, "area": area}
+
+    return {"window": window, "area": area, "region": region}
+
+
+def memory_message(before: float | None, removed: int) -> str:
+    after = current_rss_mb()
+
+    if before is None or after is None:
+        return f"imported without an undo step, {removed} unused datablocks removed"
+
+    # this is what the import keeps, not what is saved, see run_deferred
+    kept = max(after - before, 0.0)
+    return f"imported without an undo step, holding about {kept:.0f} MB, {removed} unused datablocks removed"
+
+
+def run_deferred(
+    context: Context, operator: str, properties: dict[str, typing.Any], title: str
+):
+    # operators called from Python push no undo step and are not offered in the redo
+    # panel, so the import is repeated from a timer once the calling operator is done
+    window = context.window
+    area = context.area
+    region = context.region
+    module, name = operator.split(".")
+
+    def run():
+        # the context of the calling operator is gone once it has returned
+        with bpy.context.temp_override(**still_open(window, area, region)):
+            before = snapshot_ids()
+            rss = current_rss_mb()
+
+            getattr(getattr(bpy.ops, module), name)("EXEC_DEFAULT", **properties)
+
+            message = memory_message(rss, purge_new_orphans(before))
+            print(f"{title}: {message}")
+
+            # the data is only kept out of an undo step of its own, the next undo push
+            # still writes it into its memfile, so the peak is delayed and not saved
+            def draw(menu: bpy.types.Menu, _: Context):
+                menu.layout.label(text=message)
+                menu.layout.label(text="This import cannot be undone on its own.")
+                menu.layout.label(
+                    text="The next undo step still stores it, memory is only needed later."
+                )
+
+            bpy.context.window_manager.popup_menu(
+                draw, title=f"Lean import of {title}", icon="INFO"
+            )
+
+        return None
+
+    bpy.app.timers.register(run, first_interval=0.0)
@@ -0,0 +1,244 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# pyright: reportGeneralTypeIssues=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+
+from __future__ import annotations
+
+import typing
+import bpy
+import numpy as np
+
+from bpy.types import Context
+from bpy_extras.io_utils import axis_conversion
+
+
+def axis_matrix(forward: str, up: str, scale: float = 1.0) -> np.ndarray:
+    # PLY style enums spell negative axes as NEGATIVE_X
+    forward = forward.replace("NEGATIVE_", "-")
+    up = up.replace("NEGATIVE_", "-")
+    matrix = axis_conversion(from_forward=forward, from_up=up).to_3x3()
+
+    return np.array(matrix, dtype=np.float32) * np.float32(scale)
+
+
+def transform_vertices(vertices: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    if np.array_equal(matrix, np.identity(3, dtype=np.float32)):
+        return vertices
+
+    return (vertices @ matrix.T).astype(np.float32, copy=False)
+
+
+def triangle_starts(count: int) -> np.ndarray:
+    return np.arange(0, count * 3, 3, dtype=np.int32)
+
+
+def create_mesh(
+    name: str,
+    vertices: np.ndarray,
+    corner_verts: np.ndarray | None = None,
+    face_starts: np.ndarray | None = None,
+) -> bpy.types.Mesh:
+    mesh = bpy.data.meshes.new(name)
+    write_geometry(mesh, vertices, corner_verts, face_starts)
+
+    return mesh
+
+
+def write_geometry(
+    mesh: bpy.types.Mesh,
+    vertices: np.ndarray,
+    corner_verts: np.ndarray | None = None,
+    face_starts: np.ndarray | None = None,
+):
+    # foreach_set takes the buffer directly when the dtype matches the underlying property
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set(
+        "co", np.ascontiguousarray(vertices, dtype=np.float32).ravel()
+    )
+
+    if corner_verts is not None and face_starts is not None and len(face_starts) > 0:
+        mesh.loops.add(len(corner_verts))
+        mesh.loops.foreach_set(
+            "vertex_index", np.ascontiguousarray(corner_verts, dtype=np.int32).ravel()
+        )
+        mesh.polygons.add(len(face_starts))
+        mesh.polygons.foreach_set(
+            "loop_start", np.ascontiguousarray(face_starts, dtype=np.int32)
+        )
+
+    mesh.update()
+
+
+def link_object(context: Context, name: str, data: bpy.types.ID) -> bpy.types.Object:
+    obj = bpy.data.objects.new(name, data)
+    context.collection.objects.link(obj)
+
+    for selected in context.selected_objects:
+        selected.select_set(False)
+
+    obj.select_set(True)
+    context.view_layer.objects.active = obj
+
+    return obj
+
+
+class MeshArrays(typing.NamedTuple):
+    vertices: np.ndarray  # (V, 3) float32
+    corner_verts: np.ndarray  # (L,) int32
+    face_starts: np.ndarray  # (F,) int32
+    uvs: np.ndarray | None = None  # (L, 2) float32, of the active UV map
+    normals: np.ndarray | None = None  # (L, 3) float32, only custom normals
+    material_indices: np.ndarray | None = None  # (F,) int32, into materials
+    materials: tuple[bpy.types.Material | None, ...] = ()
+
+
+def read_mesh_arrays(obj: bpy.types.Object) -> MeshArrays:
+    mesh = typing.cast(bpy.types.Mesh, obj.data)
+
+    vertices = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", vertices)
+    corner_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", corner_verts)
+    face_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", face_starts)
+
+    # importers may leave a transform on the object, bake it like object.join would
+    matrix = np.array(obj.matrix_world, dtype=np.float32)
+    vertices = vertices.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+
+    uvs = None
+
+    if mesh.uv_layers.active is not None:
+        uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        mesh.uv_layers.active.data.foreach_get("uv", uvs)
+        uvs = uvs.reshape(-1, 2)
+
+    normals = None
+
+    if mesh.has_custom_normals:
+        normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+        mesh.corner_normals.foreach_get("vector", normals)
+        normals = normals.reshape(-1, 3) @ np.linalg.inv(matrix[:3, :3])
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        normals = (normals / np.maximum(lengths, 1e-12)).astype(np.float32)
+
+    material_indices = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_indices)
+
+    return MeshArrays(
+        vertices.astype(np.float32, copy=False),
+        corner_verts,
+        face_starts,
+        uvs,
+        normals,
+        material_indices,
+        tuple(slot.material for slot in obj.material_slots),
+    )
+
+
+def concatenate(parts: list[MeshArrays]) -> tuple[MeshArrays, np.ndarray]:
+    vertex_counts = np.array([len(p.vertices) for p in parts], dtype=np.int32)
+    corner_counts = np.array([len(p.corner_verts) for p in parts], dtype=np.int32)
+    face_counts = np.array([len(p.face_starts) for p in parts], dtype=np.int32)
+
+    # exclusive prefix sums, i.e. where each part starts in the merged arrays
+    vertex_offsets = np.cumsum(vertex_counts) - vertex_counts
+    corner_offsets = np.cumsum(corner_counts) - corner_counts
+
+    uvs = None
+
+    if any(p.uvs is not None for p in parts):
+        uvs = np.concatenate(
+            [
+                p.uvs if p.uvs is not None else np.zeros((len(p.corner_verts), 2))
+                for p in parts
+            ]
+        ).astype(np.float32)
+
+    normals = None
+
+    # corners without custom normals are NaN, write_attributes fills them in
+    if any(p.normals is not None for p in parts):
+        normals = np.concatenate(
+            [
+                (
+                    p.normals
+                    if p.normals is not None
+                    else np.full((len(p.corner_verts), 3), np.nan)
+                )
+                for p in parts
+            ]
+        ).astype(np.float32)
+
+    materials: list[bpy.types.Material | None] = []
+    material_indices: list[np.ndarray] = []
+
+    for part in parts:
+        slots = [materials.index(m) if m in materials else -1 for m in part.materials]
+
+        for slot, material in enumerate(part.materials):
+            if slots[slot] < 0:
+                slots[slot] = len(materials)
+                materials.append(material)
+
+        indices = np.zeros(len(part.face_starts), dtype=np.int32)
+
+        if slots and part.material_indices is not None:
+            lookup = np.array(slots, dtype=np.int32)
+            indices = lookup[np.clip(part.material_indices, 0, len(slots) - 1)]
+
+        material_indices.append(indices)
+
+    merged = MeshArrays(
+        np.concatenate([p.vertices for p in parts]),
+        np.concatenate([p.corner_verts for p in parts])
+        + np.repeat(vertex_offsets, corner_counts),
+        np.concatenate([p.face_starts for p in parts])
+        + np.repeat(corner_offsets, face_counts),
+        uvs,
+        normals,
+        np.concatenate(material_indices) if materials else None,
+        tuple(materials),
+    )
+    part_index = np.repeat(np.arange(len(parts), dtype=np.int32), face_counts)
+
+    return merged, part_index
+
+
+def add_face_attribute(mesh: bpy.types.Mesh, name: str, values: np.ndarray):
+    attribute = mesh.attributes.new(name, "INT", "FACE")
+    attribute.data.foreach_set("value", np.ascontiguousarray(values, dtype=np.int32))
+
+
+def write_attributes(mesh: bpy.types.Mesh, arrays: MeshArrays):
+    # everything create_mesh does not write, in the layout read_mesh_arrays returns
+    if arrays.uvs is not None:
+        layer = mesh.uv_layers.new(name="UVMap")
+        layer.data.foreach_set("uv", np.ascontiguousarray(arrays.uvs).ravel())
+
+    for material in arrays.materials:
+        mesh.materials.append(material)
+
+    if arrays.material_indices is not None:
+        mesh.polygons.foreach_set(
+            "material_index", np.ascontiguousarray(arrays.material_indices)
+        )
+
+    if arrays.normals is not None:
+        normals = arrays.normals.copy()
+        missing = np.isnan(normals[:, 0])
+
+        # corners of parts without custom normals keep the ones Blender computes
+        if missing.any():
+            computed = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+            mesh.corner_normals.foreach_get("vector", computed)
+            normals[missing] = computed.reshape(-1, 3)[missing]
+
+        mesh.normals_split_custom_set(normals)
+
+    mesh.update()
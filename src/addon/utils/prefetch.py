@@ -0,0 +1,184 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# pyright: reportGeneralTypeIssues=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+
+from __future__ import annotations
+
+import contextlib
+import os
+import typing
+
+from bpy.types import Operator
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from ..readers.gltf import Resource
+from ..readers.mtl import TextureReference, material_libraries, texture_references
+from ..readers.obj import MATERIAL
+
+WORKERS = 8
+BLOCK_SIZE = 1024 * 1024
+
+# mtllib statements are declared before the geometry, so only the head is scanned,
+# usemtl statements are only complete when the head is the whole file
+HEAD_SIZE = 16 * 1024 * 1024
+
+# number of missing files listed in the warning before it is shortened
+MAX_LISTED = 10
+
+# base64 decoding plus parsing the JSON string holding it, with CPython's modules
+DATA_URI_BYTES_PER_SECOND = 90 * 1024 * 1024
+
+
+def warm(path: str) -> int:
+    with open(path, "rb", buffering=0) as f:
+        # ask the kernel for readahead, then read through for network file systems that ignore it
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+
+        view = memoryview(bytearray(BLOCK_SIZE))
+        total = 0
+
+        while read := f.readinto(view):
+            total += read
+
+    return total
+
+
+def prefetch(paths: typing.Iterable[str]) -> list[Future[int]]:
+    executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="prefetch")
+    futures = [executor.submit(warm, path) for path in paths]
+
+    # the workers keep running while the importer blocks the main thread
+    executor.shutdown(wait=False)
+    return futures
+
+
+def scan_obj_dependencies(path: str) -> tuple[list[str], list[TextureReference]]:
+    with open(path, "rb") as f:
+        head = f.read(HEAD_SIZE)
+
+    libraries = material_libraries(path, head)
+    found: list[str] = []
+    missing: list[str] = []
+    textures: list[TextureReference] = []
+
+    used: set[str] | None = None
+
+    if len(head) < HEAD_SIZE:
+        used = {
+            m.strip().decode("utf-8", errors="replace") for m in MATERIAL.findall(head)
+        }
+
+    for library in libraries:
+        if not os.path.isfile(library):
+            missing.append(library)
+            continue
+
+        found.append(library)
+        textures.extend(
+            t for t in texture_references(library) if used is None or t.material in used
+        )
+
+    existing = {t.path for t in textures if t.exists}
+    prefetch(found + sorted(existing))
+
+    return missing, [t for t in textures if not t.exists]
+
+
+def list_names(names: list[str]) -> str:
+    listed = ", ".join(names[:MAX_LISTED])
+
+    if len(names) > MAX_LISTED:
+        listed += f" and {len(names) - MAX_LISTED} more"
+
+    return listed
+
+
+@contextlib.contextmanager
+def prefetch_obj_dependencies(operator: Operator, path: str):
+    # the material libraries are scanned alongside the import, what is missing is
+    # reported once it is done
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+    scan = executor.submit(scan_obj_dependencies, path)
+    executor.shutdown(wait=False)
+
+    yield
+
+    try:
+        libraries, textures = scan.result()
+    except OSError as e:
+        print(f"{path}: dependency scan failed: {e}")
+        return
+
+    names = [os.path.basename(l) for l in libraries]
+    names.extend(sorted({f"{t.name} ({t.material})" for t in textures}))
+
+    if not names:
+        return
+
+    operator.report(
+        {"WARNING"}, f"Missing {len(names)} OBJ dependencies: {list_names(names)}"
+    )
+
+
+def check_gltf_resources(
+    resources: list[Resource],
+) -> tuple[list[str], list[str], list[str]]:
+    # missing buffers, buffers shorter than their byteLength and missing images
+    missing: list[str] = []
+    truncated: list[str] = []
+    images: list[str] = []
+
+    for resource in resources:
+        if not resource.path:
+            continue
+
+        try:
+            size = os.path.getsize(resource.path)
+        except OSError:
+            (missing if resource.kind == "buffer" else images).append(resource.uri)
+            continue
+
+        if resource.kind == "buffer" and size < resource.length:
+            truncated.append(f"{resource.uri} ({size} of {resource.length} bytes)")
+
+    return missing, truncated, images
+
+
+def prefetch_gltf_dependencies(
+    operator: Operator, path: str, resources: list[Resource]
+) -> bool:
+    # False when the importer would fail on a buffer, checked before it starts
+    missing, truncated, images = check_gltf_resources(resources)
+
+    if missing or truncated:
+        problems = [f"{m} (missing)" for m in missing] + truncated
+        operator.report(
+            {"ERROR"},
+            f"{len(problems)} glTF buffers cannot be read: {list_names(problems)}",
+        )
+        return False
+
+    external = {r.path for r in resources if r.path and r.uri not in images}
+    prefetch(sorted(external))
+
+    if images:
+        operator.report(
+            {"WARNING"}, f"Missing {len(images)} glTF images: {list_names(images)}"
+        )
+
+    embedded = [r for r in resources if r.kind == "buffer" and r.embedded > 0]
+
+    if embedded:
+        size = sum(r.embedded for r in embedded)
+        operator.report(
+            {"INFO"},
+            f"{len(embedded)} glTF buffers are data URIs ({size / (1024 * 1024):.1f} MB), decoding takes about {size / DATA_URI_BYTES_PER_SECOND:.1f}s, convert them to .bin files to avoid it",
+        )
+
+    return True
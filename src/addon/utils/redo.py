@@ -0,0 +1,167 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# pyright: reportGeneralTypeIssues=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+
+from __future__ import annotations
+
+import os
+import tempfile
+import typing
+
+import bpy
+
+from bpy.types import Context
+from bpy_extras.io_utils import axis_conversion
+from mathutils import Matrix
+
+# smaller files are parsed again faster than the cache is written
+MIN_SIZE = 16 * 1024 * 1024
+
+
+class CachedImport(typing.NamedTuple):
+    operator: str
+    path: str
+    stat: tuple[float, int]
+    settings: dict[str, typing.Any]  # every property except the transform ones
+    matrix: Matrix  # transform the cached objects were imported with
+    origin: Matrix  # import origin already applied to the cached objects
+    blend: str
+
+
+class PendingImport(typing.NamedTuple):
+    cached: CachedImport
+    objects: list[str]  # names, the objects themselves don't survive an undo
+
+
+# only the last import is kept, redo always repeats the last operator
+last: CachedImport | None = None
+
+# the last import until it is written once the operator has returned, see flush
+pending: PendingImport | None = None
+
+
+def transform_matrix(scale: float, forward: str, up: str) -> Matrix:
+    # PLY style enums spell negative axes as NEGATIVE_X
+    forward = forward.replace("NEGATIVE_", "-")
+    up = up.replace("NEGATIVE_", "-")
+    axes = axis_conversion(from_forward=forward, from_up=up).to_4x4()
+
+    return Matrix.Scale(scale, 4) @ axes
+
+
+def file_stat(path: str) -> tuple[float, int]:
+    stat = os.stat(path)
+    return stat.st_mtime, stat.st_size
+
+
+def find(
+    operator: str, path: str, settings: dict[str, typing.Any]
+) -> CachedImport | None:
+    if last is None or (last.operator, last.path) != (operator, path):
+        return None
+
+    # any change besides the transform needs the importer again
+    if last.settings != settings:
+        return None
+
+    try:
+        if file_stat(path) != last.stat or not os.path.isfile(last.blend):
+            return None
+    except OSError:
+        return None
+
+    return last
+
+
+def roots(objects: list[bpy.types.Object]) -> list[bpy.types.Object]:
+    return [o for o in objects if o.parent is None or o.parent not in objects]
+
+
+def restore(
+    context: Context, cached: CachedImport, matrix: Matrix, origin: Matrix
+) -> list[bpy.types.Object]:
+    with bpy.data.libraries.load(cached.blend, link=False) as (source, target):
+        target.objects = source.objects
+
+    objects = [o for o in target.objects if o is not None]
+    delta = origin @ matrix @ cached.matrix.inverted() @ cached.origin.inverted()
+
+    for obj in objects:
+        context.collection.objects.link(obj)
+
+    # matrix_world of loaded objects is not evaluated yet, roots have no parent so their
+    # basis is their place in the world
+    for obj in roots(objects):
+        obj.matrix_basis = delta @ obj.matrix_basis
+
+    for selected in context.selected_objects:
+        selected.select_set(False)
+
+    for obj in objects:
+        obj.select_set(True)
+
+    return objects
+
+
+def remember(
+    operator: str,
+    path: str,
+    settings: dict[str, typing.Any],
+    matrix: Matrix,
+    origin: Matrix,
+    objects: list[bpy.types.Object],
+):
+    global last, pending
+
+    if last is not None and os.path.isfile(last.blend):
+        os.remove(last.blend)
+
+    last = None
+    pending = None
+
+    if not objects or os.path.getsize(path) < MIN_SIZE:
+        return
+
+    # animated roots take their transform from the action again on the next frame change
+    if any(
+        o.animation_data is not None and o.animation_data.action is not None
+        for o in roots(objects)
+    ):
+        return
+
+    directory = bpy.app.tempdir or tempfile.gettempdir()
+    blend = os.path.join(directory, f"redo_{operator.replace('.', '_')}.blend")
+    cached = CachedImport(
+        operator, path, file_stat(path), settings, matrix.copy(), origin.copy(), blend
+    )
+
+    pending = PendingImport(cached, [o.name for o in objects])
+
+    # writing the import would add to the time of the operator itself
+    if not bpy.app.timers.is_registered(flush):
+        bpy.app.timers.register(flush, first_interval=0.0)
+
+
+def flush() -> None:
+    global last, pending
+
+    if pending is None:
+        return None
+
+    objects = [bpy.data.objects.get(name) for name in pending.objects]
+    cached = pending.cached
+    pending = None
+
+    if any(o is None for o in objects):
+        return None
+
+    # dependencies such as meshes, materials and actions are written along
+    bpy.data.libraries.write(cached.blend, set(objects), compress=False)
+    last = cached
+
+    return None
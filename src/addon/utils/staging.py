@@ -0,0 +1,138 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# pyright: reportGeneralTypeIssues=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+
+from __future__ import annotations
+
+import contextlib
+
+import bpy
+
+from bpy.types import Context, Scene
+from mathutils import Matrix
+
+STAGING_NAME = "Drag and Drop Staging"
+STAGING_TAG = "drag_and_drop_staging"
+
+# turned off by the benchmarks to compare against importing into the scene directly
+enabled = True
+
+
+def import_origin(context: Context) -> Matrix:
+    # where the origin of the imported file ends up in the scene
+    return Matrix.Translation(context.scene.cursor.location) if enabled else Matrix()
+
+
+def applied_origin(context: Context) -> Matrix:
+    # objects still inside the staging scene are moved to the origin by relink
+    return Matrix() if context.scene.get(STAGING_TAG) else import_origin(context)
+
+
+def create_staging(scene: Scene) -> Scene:
+    staging = bpy.data.scenes.new(STAGING_NAME)
+    staging[STAGING_TAG] = True
+
+    # importers read the units and may set the frame range of the scene they import into
+    staging.unit_settings.system = scene.unit_settings.system
+    staging.unit_settings.scale_length = scene.unit_settings.scale_length
+    staging.unit_settings.length_unit = scene.unit_settings.length_unit
+    staging.frame_start = scene.frame_start
+    staging.frame_end = scene.frame_end
+    staging.render.fps = scene.render.fps
+    staging.render.fps_base = scene.render.fps_base
+
+    return staging
+
+
+def copy_scene_changes(staging: Scene, scene: Scene):
+    if (staging.frame_start, staging.frame_end) != (scene.frame_start, scene.frame_end):
+        scene.frame_start = staging.frame_start
+        scene.frame_end = staging.frame_end
+
+    if (staging.render.fps, staging.render.fps_base) != (
+        scene.render.fps,
+        scene.render.fps_base,
+    ):
+        scene.render.fps = staging.render.fps
+        scene.render.fps_base = staging.render.fps_base
+
+    if scene.world is None and staging.world is not None:
+        scene.world = staging.world
+
+
+def relink(context: Context, staging: Scene) -> list[bpy.types.Object]:
+    collection = context.collection
+    view_layer = context.view_layer
+    imported = list(staging.collection.all_objects)
+    active = staging.view_layers[0].objects.active
+    origin = import_origin(context)
+
+    # not every importer evaluates the staging scene, so matrix_world may be stale
+    for obj in imported:
+        if obj.parent is None:
+            obj.matrix_basis = origin @ obj.matrix_basis
+
+    # the scene sees the finished result at once, objects inside collections created by
+    # the importer come along with their collection
+    for child in staging.collection.children:
+        collection.children.link(child)
+
+    for obj in staging.collection.objects:
+        collection.objects.link(obj)
+
+    for selected in context.selected_objects:
+        selected.select_set(False)
+
+    for obj in imported:
+        obj.select_set(True, view_layer=view_layer)
+
+    if active is not None and active in imported:
+        view_layer.objects.active = active
+
+    copy_scene_changes(staging, context.scene)
+
+    return imported
+
+
+@contextlib.contextmanager
+def staged(context: Context):
+    scene = context.scene
+    window = context.window
+
+    # nested imports, e.g. the auto importer, already run inside a staging scene
+    if not enabled or scene.get(STAGING_TAG):
+        yield
+        return
+
+    staging = create_staging(scene)
+
+    # switching the scene resets the view layer of the window when the other scene has
+    # no layer of that name
+    view_layer = window.view_layer if window is not None else None
+
+    try:
+        # operators called by the importers, such as mode_set, take the active object
+        # from the window and not from a context override
+        if window is not None:
+            window.scene = staging
+
+        try:
+            with context.temp_override(
+                scene=staging,
+                view_layer=staging.view_layers[0],
+                collection=staging.collection,
+            ):
+                yield
+        finally:
+            if window is not None:
+                window.scene = scene
+                window.view_layer = view_layer
+
+        relink(context, staging)
+    finally:
+        bpy.data.scenes.remove(staging)
@@ -0,0 +1,199 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+import typing
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ..readers.fbx import TextureFile, basename
+from .history import storage_dir
+
+WORKERS = 16
+INDEX_DIRECTORY = "texture_index"
+
+# only image files are kept, asset libraries are mostly meshes and scene files
+IMAGE_EXTENSIONS = {
+    ".bmp",
+    ".dds",
+    ".exr",
+    ".gif",
+    ".hdr",
+    ".jpeg",
+    ".jpg",
+    ".png",
+    ".psd",
+    ".tga",
+    ".tif",
+    ".tiff",
+    ".webp",
+}
+
+
+class Directory(typing.TypedDict):
+    mtime: float
+    files: list[str]
+    dirs: list[str]
+
+
+class TextureIndex:
+    def __init__(self, root: str, directories: dict[str, Directory]):
+        self.root = root
+        self.directories = directories
+        self.names: dict[str, list[str]] = {}
+
+        for path, directory in directories.items():
+            for name in directory["files"]:
+                self.names.setdefault(name.lower(), []).append(os.path.join(path, name))
+
+    def lookup(self, name: str) -> str | None:
+        # the closest match to the root wins when several directories have the file
+        candidates = self.names.get(basename(name))
+        return min(candidates, key=len) if candidates else None
+
+
+class Resolution(typing.NamedTuple):
+    found: dict[str, str]  # lower case file name -> path on disk, for moved files only
+    missing: list[str]
+    seconds: float
+    rescanned: int  # directories listed again because their mtime changed
+
+
+# root -> index, kept for the session on top of the file on disk
+indexes: dict[str, TextureIndex] = {}
+
+
+def index_path(root: str) -> str:
+    directory = os.path.join(storage_dir(), INDEX_DIRECTORY)
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha1(root.encode("utf-8", errors="replace")).hexdigest()[:16]
+
+    return os.path.join(directory, f"{digest}.json")
+
+
+def load(root: str) -> dict[str, Directory]:
+    try:
+        with open(index_path(root), "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    return stored["directories"] if stored.get("root") == root else {}
+
+
+def save(index: TextureIndex):
+    path = index_path(index.root)
+
+    try:
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"root": index.root, "directories": index.directories}, f)
+
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"failed to save the texture index of {index.root}: {e}")
+
+
+def scan(path: str, known: Directory | None) -> tuple[str, Directory | None, bool]:
+    try:
+        mtime = os.stat(path).st_mtime
+
+        # the mtime of a directory changes when entries are added, removed or renamed
+        if known is not None and known["mtime"] == mtime:
+            return path, known, False
+
+        files: list[str] = []
+        dirs: list[str] = []
+
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.name)
+                elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                    files.append(entry.name)
+
+        return path, {"mtime": mtime, "files": files, "dirs": dirs}, True
+    except OSError:
+        return path, None, False
+
+
+def update(root: str, known: dict[str, Directory]) -> tuple[dict[str, Directory], int]:
+    directories: dict[str, Directory] = {}
+    rescanned = 0
+    level = [root]
+
+    # breadth first, every level of the tree is listed in parallel
+    with ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="scandir") as pool:
+        while level:
+            results = pool.map(lambda p: scan(p, known.get(p)), level)
+            level = []
+
+            for path, directory, listed in results:
+                if directory is None:
+                    continue
+
+                directories[path] = directory
+                rescanned += listed
+                level.extend(os.path.join(path, d) for d in directory["dirs"])
+
+    return directories, rescanned
+
+
+def get_index(root: str) -> tuple[TextureIndex, int]:
+    root = os.path.abspath(root)
+    known = indexes[root].directories if root in indexes else load(root)
+    directories, rescanned = update(root, known)
+
+    if rescanned == 0 and root in indexes:
+        return indexes[root], 0
+
+    index = TextureIndex(root, directories)
+    indexes[root] = index
+
+    if rescanned > 0 or directories.keys() != known.keys():
+        save(index)
+
+    return index, rescanned
+
+
+def exists(directory: str, texture: TextureFile) -> bool:
+    # the places the importer looks at before searching recursively
+    relative = texture.relative.replace("\\", os.sep).replace("/", os.sep)
+    name = (texture.filename or texture.relative).replace("\\", "/").rsplit("/", 1)[-1]
+    candidates = [
+        texture.filename,
+        os.path.join(directory, relative) if relative else "",
+        os.path.join(directory, name),
+    ]
+
+    return any(c and os.path.isfile(c) for c in candidates)
+
+
+def resolve(fbx_path: str, textures: list[TextureFile]) -> Resolution:
+    started = time.perf_counter()
+    directory = os.path.dirname(os.path.abspath(fbx_path))
+    unresolved = [t for t in textures if not exists(directory, t)]
+
+    found: dict[str, str] = {}
+    missing: list[str] = []
+    rescanned = 0
+
+    if unresolved:
+        index, rescanned = get_index(directory)
+
+        for texture in unresolved:
+            name = texture.filename or texture.relative
+            path = index.lookup(name)
+
+            if path is None:
+                missing.append(name)
+            else:
+                found[basename(name)] = path
+
+    return Resolution(found, missing, time.perf_counter() - started, rescanned)
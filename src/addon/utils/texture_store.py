@@ -0,0 +1,191 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# pyright: reportGeneralTypeIssues=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+
+from __future__ import annotations
+
+import contextlib
+import os
+import shutil
+import tempfile
+import typing
+
+import bpy
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ..readers.usd import ZIP_STORED, PackageEntry, open_usd
+from .history import storage_dir
+from .images import WORKERS, hash_file
+from .texture_index import IMAGE_EXTENSIONS
+from .usdz_cache import ZIP_DEFLATED, hash_entry
+
+STORE_DIRECTORY = "texture_store"
+INCOMING_PREFIX = ".incoming-"
+
+
+class StoreResult(typing.NamedTuple):
+    stored: int  # textures new to the directory
+    reused: int  # textures already in the directory or linked from the shared store
+    saved: int  # bytes the importer did not write, see preplace_package
+
+
+def shared_path(digest: str, extension: str) -> str:
+    return os.path.join(
+        storage_dir(), STORE_DIRECTORY, digest[:2], f"{digest}{extension}"
+    )
+
+
+def stored_blob(directory: str, digest: str, extension: str) -> str | None:
+    for path in (
+        os.path.join(directory, f"{digest}{extension}"),
+        shared_path(digest, extension),
+    ):
+        if os.path.exists(path):
+            return path
+
+    return None
+
+
+def preplace_package(
+    path: str, entries: list[PackageEntry], incoming: str, directory: str
+) -> dict[str, str]:
+    # package textures that are already stored are linked into the incoming directory
+    # before the import, the importer then keeps them instead of copying them again
+    textures = [
+        e
+        for e in entries
+        if os.path.splitext(e.name)[1].lower() in IMAGE_EXTENSIONS
+        and e.compression in (ZIP_STORED, ZIP_DEFLATED)
+    ]
+    names = [os.path.basename(e.name) for e in textures]
+
+    # the importer copies by file name only, equal names in different folders need the
+    # collision mode of the user
+    if len(set(names)) != len(names):
+        return {}
+
+    with open_usd(path) as data:
+        with ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="hash") as pool:
+            digests = list(pool.map(lambda e: hash_entry(data, e), textures))
+
+    placed: dict[str, str] = {}
+
+    for name, digest in zip(names, digests):
+        source = stored_blob(directory, digest, os.path.splitext(name)[1].lower())
+
+        if source is None:
+            continue
+
+        target = os.path.join(incoming, name)
+
+        try:
+            os.link(source, target)
+        except OSError:
+            continue
+
+        placed[target] = digest
+
+    return placed
+
+
+def place(incoming: str, directory: str, digest: str) -> tuple[str, bool]:
+    extension = os.path.splitext(incoming)[1].lower()
+    target = os.path.join(directory, f"{digest}{extension}")
+    shared = shared_path(digest, extension)
+
+    if os.path.exists(target):
+        os.remove(incoming)
+        return target, True
+
+    if os.path.exists(shared):
+        try:
+            os.link(shared, target)
+            os.remove(incoming)
+            return target, True
+        except OSError:
+            # another filesystem, the copy written by the importer is kept instead
+            pass
+
+    # the incoming directory is inside the target directory, so this is a rename
+    os.replace(incoming, target)
+
+    try:
+        os.makedirs(os.path.dirname(shared), exist_ok=True)
+
+        if not os.path.exists(shared):
+            os.link(target, shared)
+    except OSError:
+        pass
+
+    return target, False
+
+
+@contextlib.contextmanager
+def incoming_directory(directory: str | None) -> typing.Iterator[str | None]:
+    if directory is None:
+        yield None
+        return
+
+    os.makedirs(directory, exist_ok=True)
+    incoming = tempfile.mkdtemp(prefix=INCOMING_PREFIX, dir=directory)
+
+    try:
+        yield incoming
+    finally:
+        shutil.rmtree(incoming, ignore_errors=True)
+
+
+def store_images(
+    images: list[bpy.types.Image],
+    incoming: str,
+    directory: str,
+    relative: bool,
+    placed: dict[str, str],
+) -> StoreResult:
+    users: dict[str, list[bpy.types.Image]] = {}
+
+    for image in images:
+        path = os.path.normpath(bpy.path.abspath(image.filepath))
+
+        if image.source == "FILE" and path.startswith(incoming + os.sep):
+            users.setdefault(path, []).append(image)
+
+    paths = list(users)
+    unknown = [p for p in paths if p not in placed]
+
+    with ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="hash") as pool:
+        hashed = dict(zip(unknown, pool.map(hash_file, unknown)))
+
+    digests = [placed.get(p) or hashed.get(p) for p in paths]
+
+    stored = 0
+    reused = 0
+    saved = 0
+
+    for path, digest in zip(paths, digests):
+        if digest is None:
+            continue
+
+        if path in placed:
+            saved += os.path.getsize(path)
+
+        target, existing = place(path, directory, digest)
+
+        if existing:
+            reused += 1
+        else:
+            stored += 1
+
+        if relative and bpy.data.is_saved:
+            target = bpy.path.relpath(target)
+
+        for image in users[path]:
+            image.filepath = target
+
+    return StoreResult(stored, reused, saved)
@@ -0,0 +1,140 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import shutil
+import typing
+import zlib
+
+from ..readers.usd import ZIP_STORED, PackageEntry, open_usd, package_entries
+from .history import storage_dir
+from .texture_index import IMAGE_EXTENSIONS
+
+CACHE_DIRECTORY = "usdz_cache"
+CACHE_LIMIT = 2 * 1024 * 1024 * 1024
+BLOCK_SIZE = 4 * 1024 * 1024
+
+# deflate streams in zip files have no zlib header
+ZIP_DEFLATED = 8
+RAW_DEFLATE = -15
+
+
+def cache_key(path: str) -> str:
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}:{stat.st_mtime}:{stat.st_size}"
+
+    return hashlib.sha1(key.encode("utf-8", errors="replace")).hexdigest()[:16]
+
+
+def directory_size(path: str) -> int:
+    size = 0
+
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+
+    return size
+
+
+def evict(root: str, keep: typing.Collection[str], limit: int):
+    # packages used least recently go first, the one being imported and the ones whose
+    # textures images still point to stay
+    directories = [
+        os.path.join(root, name)
+        for name in os.listdir(root)
+        if os.path.join(root, name) not in keep
+    ]
+    directories.sort(key=os.path.getmtime)
+
+    total = directory_size(root)
+
+    for directory in directories:
+        if total <= limit:
+            break
+
+        size = directory_size(directory)
+        shutil.rmtree(directory, ignore_errors=True)
+        total -= size
+
+
+def read_blocks(data: mmap.mmap, entry: PackageEntry) -> typing.Iterator[bytes]:
+    if entry.compression == ZIP_STORED:
+        for offset in range(0, entry.size, BLOCK_SIZE):
+            start = entry.offset + offset
+            yield data[start : start + min(BLOCK_SIZE, entry.size - offset)]
+        return
+
+    decompressor = zlib.decompressobj(RAW_DEFLATE)
+
+    for offset in range(0, entry.size, BLOCK_SIZE):
+        start = entry.offset + offset
+        end = start + min(BLOCK_SIZE, entry.size - offset)
+        yield decompressor.decompress(data[start:end])
+
+    yield decompressor.flush()
+
+
+def extract(data: mmap.mmap, entry: PackageEntry, path: str):
+    with open(path + ".tmp", "wb") as f:
+        for block in read_blocks(data, entry):
+            f.write(block)
+
+    os.replace(path + ".tmp", path)
+
+
+def hash_entry(data: mmap.mmap, entry: PackageEntry) -> str:
+    # the same digest as images.hash_file gives for the extracted file
+    digest = hashlib.blake2b(digest_size=16)
+
+    for block in read_blocks(data, entry):
+        digest.update(block)
+
+    return digest.hexdigest()
+
+
+def cache_root() -> str:
+    return os.path.join(storage_dir(), CACHE_DIRECTORY)
+
+
+def extract_textures(
+    path: str, in_use: typing.Collection[str] = (), limit: int = CACHE_LIMIT
+) -> str:
+    root = cache_root()
+    directory = os.path.join(root, cache_key(path))
+    os.makedirs(directory, exist_ok=True)
+
+    extracted = 0
+
+    with open_usd(path) as data:
+        for entry in package_entries(data):
+            if os.path.splitext(entry.name)[1].lower() not in IMAGE_EXTENSIONS:
+                continue
+
+            if entry.compression not in (ZIP_STORED, ZIP_DEFLATED):
+                print(f"{path}: {entry.name} is compressed with an unknown method")
+                continue
+
+            # the importer copies package textures by their file name only
+            target = os.path.join(directory, os.path.basename(entry.name))
+
+            if os.path.exists(target) and os.path.getsize(target) == entry.length:
+                continue
+
+            extract(data, entry, target)
+            extracted += 1
+
+    os.utime(directory)
+    evict(root, {directory, *in_use}, limit)
+
+    print(f"{path}: extracted {extracted} textures to {directory}")
+
+    return directory
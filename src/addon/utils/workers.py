@@ -0,0 +1,233 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# pyright: reportGeneralTypeIssues=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import typing
+
+import bpy
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.dirname(__file__)), "workers")
+
+# beyond this the workers mostly contend for disk bandwidth
+MAX_WORKERS = 8
+
+# exit codes of processes that crashed on Windows, e.g. 0xC0000005 for access violations
+NTSTATUS_ERROR = 0xC0000000
+
+JOB_OBJECT_LIMIT_PROCESS_MEMORY = 0x100
+JOB_OBJECT_EXTENDED_LIMIT_INFORMATION = 9
+
+
+def default_workers() -> int:
+    # one core is left to the Blender instance that merges the results
+    return max(1, min((os.cpu_count() or 2) - 1, MAX_WORKERS))
+
+
+class Job(typing.NamedTuple):
+    key: str
+    script: str  # file name in the workers directory
+    argument: dict[str, typing.Any]
+    log: str
+
+
+class Result(typing.NamedTuple):
+    job: Job
+    returncode: int
+
+    def out_of_memory(self) -> bool:
+        # the limit surfaces as a MemoryError in Python or as a crash in an allocation,
+        # a signal on Linux and macOS or an NTSTATUS error code on Windows
+        if self.returncode < 0 or self.returncode >= NTSTATUS_ERROR:
+            return True
+
+        try:
+            with open(self.job.log, "r", errors="replace") as f:
+                return "MemoryError" in f.read()
+        except OSError:
+            return False
+
+
+def memory_limit(limit_mb: int) -> typing.Callable[[], None] | None:
+    # Windows has no rlimit, workers are bound by a job object there, see memory_job
+    if limit_mb <= 0 or sys.platform == "win32":
+        return None
+
+    def apply():
+        import resource
+
+        limit = limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_DATA, (limit, limit))
+
+    return apply
+
+
+def memory_job(limit_mb: int) -> int | None:
+    # allocations beyond the committed memory limit of the job fail in every process
+    # assigned to it, as they do with RLIMIT_DATA
+    if limit_mb <= 0 or sys.platform != "win32":
+        return None
+
+    import ctypes
+    import ctypes.wintypes
+
+    class IO_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("ReadOperationCount", ctypes.c_ulonglong),
+            ("WriteOperationCount", ctypes.c_ulonglong),
+            ("OtherOperationCount", ctypes.c_ulonglong),
+            ("ReadTransferCount", ctypes.c_ulonglong),
+            ("WriteTransferCount", ctypes.c_ulonglong),
+            ("OtherTransferCount", ctypes.c_ulonglong),
+        ]
+
+    class JOBOBJECT_BASIC_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("PerProcessUserTimeLimit", ctypes.c_int64),
+            ("PerJobUserTimeLimit", ctypes.c_int64),
+            ("LimitFlags", ctypes.wintypes.DWORD),
+            ("MinimumWorkingSetSize", ctypes.c_size_t),
+            ("MaximumWorkingSetSize", ctypes.c_size_t),
+            ("ActiveProcessLimit", ctypes.wintypes.DWORD),
+            ("Affinity", ctypes.c_size_t),
+            ("PriorityClass", ctypes.wintypes.DWORD),
+            ("SchedulingClass", ctypes.wintypes.DWORD),
+        ]
+
+    class JOBOBJECT_EXTENDED_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("BasicLimitInformation", JOBOBJECT_BASIC_LIMIT_INFORMATION),
+            ("IoInfo", IO_COUNTERS),
+            ("ProcessMemoryLimit", ctypes.c_size_t),
+            ("JobMemoryLimit", ctypes.c_size_t),
+            ("PeakProcessMemoryUsed", ctypes.c_size_t),
+            ("PeakJobMemoryUsed", ctypes.c_size_t),
+        ]
+
+    kernel32 = ctypes.WinDLL("kernel32")
+    kernel32.CreateJobObjectW.restype = ctypes.wintypes.HANDLE
+
+    job = kernel32.CreateJobObjectW(None, None)
+
+    if not job:
+        return None
+
+    info = JOBOBJECT_EXTENDED_LIMIT_INFORMATION()
+    info.BasicLimitInformation.LimitFlags = JOB_OBJECT_LIMIT_PROCESS_MEMORY
+    info.ProcessMemoryLimit = limit_mb * 1024 * 1024
+
+    if not kernel32.SetInformationJobObject(
+        ctypes.wintypes.HANDLE(job),
+        JOB_OBJECT_EXTENDED_LIMIT_INFORMATION,
+        ctypes.byref(info),
+        ctypes.sizeof(info),
+    ):
+        kernel32.CloseHandle(ctypes.wintypes.HANDLE(job))
+        return None
+
+    return job
+
+
+def assign_to_job(job: int, process: subprocess.Popen[bytes]):
+    import ctypes
+    import ctypes.wintypes
+
+    ctypes.WinDLL("kernel32").AssignProcessToJobObject(
+        ctypes.wintypes.HANDLE(job),
+        ctypes.wintypes.HANDLE(int(process._handle)),  # type: ignore
+    )
+
+
+def close_job(job: int):
+    import ctypes
+    import ctypes.wintypes
+
+    # processes still running stay in the job, closing the handle only releases it
+    ctypes.WinDLL("kernel32").CloseHandle(ctypes.wintypes.HANDLE(job))
+
+
+class WorkerPool:
+    def __init__(self, jobs: list[Job], workers: int, limit_mb: int):
+        self.pending = list(jobs)
+        self.running: list[tuple[subprocess.Popen[bytes], Job, typing.IO[bytes]]] = []
+        self.total = len(jobs)
+        self.completed = 0
+        self.workers = max(1, workers)
+        self.limit_mb = limit_mb
+        self.job = memory_job(limit_mb)
+
+    def start(self, job: Job):
+        command = [
+            bpy.app.binary_path,
+            "--background",
+            "--factory-startup",
+            "--python-exit-code",
+            "1",
+            "--python",
+            os.path.join(SCRIPTS, job.script),
+            "--",
+            json.dumps(job.argument),
+        ]
+        log = open(job.log, "wb")
+        process = subprocess.Popen(
+            command,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            preexec_fn=memory_limit(self.limit_mb),
+        )
+
+        if self.job is not None:
+            assign_to_job(self.job, process)
+
+        self.running.append((process, job, log))
+
+    def poll(self) -> list[Result]:
+        results: list[Result] = []
+
+        for entry in list(self.running):
+            process, job, log = entry
+
+            if process.poll() is None:
+                continue
+
+            log.close()
+            self.running.remove(entry)
+            self.completed += 1
+            results.append(Result(job, process.returncode))
+
+        while self.pending and len(self.running) < self.workers:
+            self.start(self.pending.pop(0))
+
+        if self.done():
+            self.release()
+
+        return results
+
+    def release(self):
+        if self.job is not None:
+            close_job(self.job)
+            self.job = None
+
+    def done(self) -> bool:
+        return not self.pending and not self.running
+
+    def cancel(self):
+        self.pending.clear()
+
+        for process, _, log in self.running:
+            process.kill()
+            process.wait()
+            log.close()
+
+        self.running.clear()
+        self.release()
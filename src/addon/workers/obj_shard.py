@@ -0,0 +1,167 @@
+# ------------------------------------------------------------------------------------------
+#  Copyright (c) Natsuneko. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# ------------------------------------------------------------------------------------------
+
+# pyright: reportGeneralTypeIssues=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+
+# Worker of the parallel OBJ importer, run by a background Blender process:
+#
+#   blender --background --factory-startup --python obj_shard.py -- <job json>
+#
+# it builds one shard written by readers/obj_split.py into a mesh object and writes it to
+# a .blend file that the main process appends. The add-on is not registered in the
+# worker, so the readers are loaded by their file path.
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import sys
+import types
+import typing
+
+import bpy
+import numpy as np
+
+ADDON = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load(*relative: str) -> types.ModuleType:
+    name = "_".join(relative).removesuffix(".py")
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ADDON, *relative))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+obj = load("readers", "obj.py")
+mesh_utils = load("utils", "mesh.py")
+
+
+def pool(job: dict[str, typing.Any], key: str) -> np.ndarray:
+    path, count, width = job["pools"][key]
+
+    if count == 0:
+        return np.empty((0, width), dtype=np.float32)
+
+    return np.memmap(path, dtype=np.float32, mode="r", shape=(count, width))
+
+
+def gather(values: np.ndarray, indices: np.ndarray, name: str) -> np.ndarray:
+    if indices.size > 0 and indices.max() >= len(values):
+        raise obj.UnsupportedOBJ(f"{name} indices out of range")
+
+    return np.ascontiguousarray(values[indices])
+
+
+def read_shard(path: str):
+    with open(path, "rb") as f:
+        text = f.read()
+
+    materials: list[str] = []
+    segments: list[tuple[int, bytes]] = []
+    material = 0
+    start = 0
+
+    for match in obj.MATERIAL.finditer(text):
+        segments.append((material, text[start : match.start()]))
+        name = match.group(1).strip().decode("utf-8", errors="replace")
+
+        if name not in materials:
+            materials.append(name)
+
+        material = materials.index(name)
+        start = match.end()
+
+    segments.append((material, text[start:]))
+
+    corner_verts: list[np.ndarray] = []
+    face_sizes: list[np.ndarray] = []
+    face_materials: list[np.ndarray] = []
+    corner_uvs: list[np.ndarray] = []
+    corner_normals: list[np.ndarray] = []
+    layout: tuple[bool, bool] | None = None
+
+    for material, segment in segments:
+        verts, sizes, uvs, norms = obj.parse_faces(obj.FACE.findall(segment))
+
+        if len(sizes) == 0:
+            continue
+
+        if layout is not None and layout != (uvs is not None, norms is not None):
+            raise obj.UnsupportedOBJ("faces with mixed index layouts")
+
+        layout = (uvs is not None, norms is not None)
+        corner_verts.append(verts)
+        face_sizes.append(sizes)
+        face_materials.append(np.full(len(sizes), material, dtype=np.int32))
+
+        if uvs is not None:
+            corner_uvs.append(uvs)
+        if norms is not None:
+            corner_normals.append(norms)
+
+    return (
+        np.concatenate(corner_verts),
+        np.concatenate(face_sizes),
+        np.concatenate(face_materials),
+        np.concatenate(corner_uvs) if corner_uvs else None,
+        np.concatenate(corner_normals) if corner_normals else None,
+        materials,
+    )
+
+
+def build(job: dict[str, typing.Any]):
+    corners, sizes, face_materials, uvs, normals, materials = read_shard(job["shard"])
+
+    if np.any(sizes < 3):
+        raise obj.UnsupportedOBJ("faces with less than three corners")
+
+    # only the vertices referenced by this shard are taken from the shared pool
+    used, corner_verts = np.unique(corners, return_inverse=True)
+    matrix = mesh_utils.axis_matrix(
+        job["forward_axis"], job["up_axis"], job["global_scale"]
+    )
+    vertices = mesh_utils.transform_vertices(
+        gather(pool(job, "v"), used, "vertex"), matrix
+    )
+    face_starts = (np.cumsum(sizes) - sizes).astype(np.int32)
+
+    mesh = mesh_utils.create_mesh(
+        job["name"], vertices, corner_verts.astype(np.int32), face_starts
+    )
+
+    if uvs is not None:
+        uv_layer = mesh.uv_layers.new(name="UVMap")
+        uv_layer.data.foreach_set("uv", gather(pool(job, "vt"), uvs, "uv").ravel())
+
+    if job["import_normals"] and normals is not None:
+        scale = np.float32(job["global_scale"])
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
+        mesh.normals_split_custom_set(
+            mesh_utils.transform_vertices(
+                gather(pool(job, "vn"), normals, "normal"), matrix / scale
+            )
+        )
+
+    if materials:
+        # the main process creates the materials once and shares them between shards
+        mesh.polygons.foreach_set("material_index", face_materials)
+        mesh["obj_materials"] = materials
+
+    if job["validate_meshes"]:
+        mesh.validate()
+
+    result = bpy.data.objects.new(job["name"], mesh)
+    bpy.data.libraries.write(job["output"], {result}, compress=False)
+
+    print(f"{job['name']}: {len(sizes)} faces, {len(vertices)} vertices")
+
+
+if __name__ == "__main__":
+    build(json.loads(sys.argv[sys.argv.index("--") + 1]))